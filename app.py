@@ -1,8 +1,13 @@
-from flask import Flask, render_template, request, send_file, jsonify, after_this_request, send_from_directory, redirect
+from flask import Flask, Request, render_template, request, send_file, jsonify, after_this_request, send_from_directory, redirect
 import os
-from find_emails import find_categorized_emails_in_file
-import pandas as pd
-from werkzeug.utils import secure_filename
+from find_emails import DEDUP_KEYS
+from metrics import stage, record_throughput, record_cache_result, start_request, finish_request, render_metrics
+from exports import ExportError, run_export, run_export_in_pool, save_uploads, source_size, CONTACT_MODES, OUTLOOK_SUFFIXES
+from jobs import JobStore, JobRunner
+from result_cache import ResultCache, cache_key, source_version
+from archives import compression_type, is_compressed_upload, ZSTD_AVAILABLE
+from uploads import ParserPool, UploadStore, UploadError
+from writers import OUTPUT_FORMATS, PYARROW_AVAILABLE
 import tempfile
 import logging
 from flask_cors import CORS
@@ -11,9 +16,9 @@ import re
 import csv
 import traceback  # Hata izleme için ekledik
 import time
-from openpyxl.styles import Font
 import sys
 from dotenv import load_dotenv
+from werkzeug.utils import secure_filename
 
 # Load environment variables
 load_dotenv()
@@ -49,6 +54,68 @@ try:
     app.config['JSON_AS_ASCII'] = False
     app.config['JSONIFY_PRETTYPRINT_REGULAR'] = False
     app.config['PROPAGATE_EXCEPTIONS'] = True
+    # Büyük CSV dosyaları için ayrıştırma süreç sayısı (1 = sıralı)
+    app.config['PARSE_WORKERS'] = int(os.environ.get('PARSE_WORKERS', 1))
+    # Ayrıştırma arka ucu: 'python' (satır satır) veya 'pandas' (sütun tabanlı; daha hızlı değildir)
+    app.config['PARSE_BACKEND'] = os.environ.get('PARSE_BACKEND', 'python')
+    # Dosya başına hücre ayrıştırma önbelleği boyutu (0 = kapalı)
+    app.config['CELL_CACHE_SIZE'] = int(os.environ.get('CELL_CACHE_SIZE', 65536))
+    # Bu boyuta kadar olan yüklemeler bellekte tutulur, üzerindekiler diske taşar
+    app.config['UPLOAD_SPOOL_BYTES'] = int(os.environ.get('UPLOAD_SPOOL_BYTES', 8 * 1024 * 1024))
+
+    class SpooledRequest(Request):
+        """Yüklenen dosyaları boyut eşiğine kadar bellekte, üzerindeyse geçici dosyada tutar"""
+
+        def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+            return tempfile.SpooledTemporaryFile(max_size=app.config['UPLOAD_SPOOL_BYTES'])
+
+    app.request_class = SpooledRequest
+
+    # Ayrıştırma ve çıktı yazma işçi başına bu kadar süreçte çalışır (0 = istek içinde)
+    app.config['EXPORT_PROCESSES'] = int(os.environ.get('EXPORT_PROCESSES', 2))
+    # Bundan küçük yüklemeler süreç havuzuna gönderilmeden istek içinde işlenir
+    app.config['OFFLOAD_MIN_BYTES'] = int(os.environ.get('OFFLOAD_MIN_BYTES', 1024 * 1024))
+
+    # Arka plan işleri: durum ve sonuçlar tüm işçilerin paylaştığı dizinde tutulur
+    app.config['JOBS_DIR'] = os.environ.get('JOBS_DIR', os.path.join(tempfile.gettempdir(), 'outlook_jobs'))
+    # İşçi süreci başına aynı anda çalışan iş sayısı
+    app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', 2))
+    # Biten işlerin sonuçlarının saklanma süresi (saniye)
+    app.config['JOB_RESULT_TTL'] = int(os.environ.get('JOB_RESULT_TTL', 3600))
+    job_store = JobStore(app.config['JOBS_DIR'], result_ttl=app.config['JOB_RESULT_TTL'])
+    job_runner = JobRunner(job_store, max_workers=app.config['JOB_WORKERS'])
+    last_job_cleanup = 0
+
+    # /process kişi dizini kiplerinin SQLite dosyaları (kalıcı bir dizinde olmalıdır)
+    app.config['CONTACT_STORE_DIR'] = os.environ.get('CONTACT_STORE_DIR', os.path.join(BASE_DIR, 'contact_store'))
+
+    # Tekrar yüklenen girdilerin sonuçları için disk önbelleği (tüm işçiler paylaşır; 0 = kapalı)
+    app.config['RESULT_CACHE_DIR'] = os.environ.get('RESULT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'outlook_cache'))
+    app.config['RESULT_CACHE_BYTES'] = int(os.environ.get('RESULT_CACHE_BYTES', 1024 * 1024 * 1024))
+    # Önbellek anahtarındaki uygulama sürümü; verilmezse çıktı üreten kaynak dosyalardan türetilir
+    app.config['APP_VERSION'] = os.environ.get('APP_VERSION') or source_version(BASE_DIR)
+    result_cache = None
+    if app.config['RESULT_CACHE_BYTES'] > 0:
+        result_cache = ResultCache(app.config['RESULT_CACHE_DIR'], app.config['RESULT_CACHE_BYTES'])
+
+    # Birden çok dosyalı /process isteklerinde aynı anda ayrıştırılan dosya sayısı
+    app.config['BATCH_WORKERS'] = int(os.environ.get('BATCH_WORKERS', os.cpu_count() or 1))
+
+    # Sıkıştırılmış yüklemelerde (.csv.gz, .zip, .csv.zst) en büyük açılma oranı ve açılmış boyut
+    app.config['MAX_INFLATE_RATIO'] = int(os.environ.get('MAX_INFLATE_RATIO', 100))
+    app.config['MAX_INFLATE_BYTES'] = int(os.environ.get('MAX_INFLATE_BYTES', 2 * 1024 * 1024 * 1024))
+
+    # Parçalı yüklemeler (tüm işçilerin paylaştığı dizin), parça boyutu ve tek yüklemenin en büyük boyutu
+    app.config['UPLOADS_DIR'] = os.environ.get('UPLOADS_DIR', os.path.join(tempfile.gettempdir(), 'outlook_uploads'))
+    app.config['UPLOAD_CHUNK_BYTES'] = int(os.environ.get('UPLOAD_CHUNK_BYTES', 5 * 1024 * 1024))
+    app.config['UPLOAD_MAX_BYTES'] = int(os.environ.get('UPLOAD_MAX_BYTES', 2 * 1024 * 1024 * 1024))
+    upload_store = UploadStore(app.config['UPLOADS_DIR'], chunk_size=app.config['UPLOAD_CHUNK_BYTES'],
+                               max_bytes=app.config['UPLOAD_MAX_BYTES'])
+    # İşçi süreci başına aynı anda çalışan yükleme ayrıştırıcısı sayısı ve boşta bekleme süresi (saniye)
+    app.config['UPLOAD_PARSERS'] = int(os.environ.get('UPLOAD_PARSERS', 2))
+    app.config['UPLOAD_PARSER_IDLE_TIMEOUT'] = int(os.environ.get('UPLOAD_PARSER_IDLE_TIMEOUT', 300))
+    parser_pool = ParserPool(max_parsers=app.config['UPLOAD_PARSERS'],
+                             idle_timeout=app.config['UPLOAD_PARSER_IDLE_TIMEOUT'])
 
     # Railway specific configurations
     app.config['SERVER_NAME'] = os.environ.get('SERVER_NAME')
@@ -70,6 +137,7 @@ try:
 
     @app.before_request
     def before_request():
+        start_request()
         if not request.is_secure and app.env != 'development':
             url = request.url.replace('http://', 'https://', 1)
             return redirect(url, code=301)
@@ -78,16 +146,54 @@ try:
     def after_request(response):
         response.headers.add('Access-Control-Allow-Origin', '*')
         response.headers.add('Access-Control-Allow-Headers', 'Content-Type')
-        response.headers.add('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        response.headers['Cache-Control'] = 'public, max-age=300'
+        response.headers.add('Access-Control-Allow-Methods', 'GET, POST, PUT, OPTIONS')
+        if 'Cache-Control' not in response.headers:
+            response.headers['Cache-Control'] = 'public, max-age=300'
         response.headers['X-Content-Type-Options'] = 'nosniff'
         response.headers['X-Frame-Options'] = 'SAMEORIGIN'
         response.headers['X-XSS-Protection'] = '1; mode=block'
-        return response
+        # Aşama süreleri (Server-Timing) ve metrikler
+        return finish_request(response, request.endpoint)
+
+    def get_output_format():
+        # Çıktı biçimi 'output_format' form alanından, yoksa Accept başlığından seçilir (varsayılan xlsx)
+        output_format = request.form.get('output_format', '').strip().lower()
+        if not output_format:
+            formats_by_mimetype = {info['mimetype']: name for name, info in OUTPUT_FORMATS.items()}
+            best = request.accept_mimetypes.best_match(list(formats_by_mimetype), default=OUTPUT_FORMATS['xlsx']['mimetype'])
+            output_format = formats_by_mimetype[best]
+        if output_format not in OUTPUT_FORMATS:
+            raise ExportError(f'Geçersiz çıktı biçimi: {output_format}')
+        if output_format == 'parquet' and not PYARROW_AVAILABLE:
+            raise ExportError('Parquet çıktısı için sunucuda pyarrow kurulu değil')
+        return output_format
+
+    def send_output(path, name, output_format):
+        # Oluşturulan çıktı dosyasını (yol ya da açık dosya) biçimine uygun ad ve MIME türüyle gönder
+        info = OUTPUT_FORMATS[output_format]
+        return send_file(
+            path,
+            as_attachment=True,
+            download_name=f"{name}.{info['extension']}",
+            mimetype=info['mimetype']
+        )
 
     def is_csv_file(filename):
         return filename.lower().endswith(('.csv', '.CSV'))
 
+    def check_upload(filename, suffixes=('.csv',)):
+        # Uzantılar düz ya da sıkıştırılmış (.gz, .zst; zip arşivinin içinde) kabul edilir
+        if not filename.lower().endswith(suffixes) and not is_compressed_upload(filename, suffixes):
+            raise ExportError(f'Lütfen {", ".join(suffixes)} dosyası (ya da .gz, .zip, .zst arşivi) yükleyin')
+        if compression_type(filename) == 'zstd' and not ZSTD_AVAILABLE:
+            raise ExportError('zstd dosyaları için sunucuda zstandard kurulu değil')
+
+    def inflate_options():
+        return {
+            'max_inflate_ratio': app.config['MAX_INFLATE_RATIO'],
+            'max_inflate_bytes': app.config['MAX_INFLATE_BYTES']
+        }
+
     def sanitize_filename(filename):
         # Dosya adından geçersiz karakterleri temizle
         filename = re.sub(r'[<>:"/\\|?*]', '', filename)
@@ -95,46 +201,204 @@ try:
         filename = filename.replace(' ', '_')
         return filename
 
-    def extract_company_name(email):
-        # E-posta adresinden firma adını çıkar (@'den sonra, ilk nokta'ya kadar)
-        try:
-            domain = email.split('@')[1]  # @'den sonraki kısmı al
-            company = domain.split('.')[0]  # ilk noktaya kadar olan kısmı al
-            return company
-        except:
-            return ''
-
-    def extract_name_from_text(text):
-        # "Ad Soyad <email@domain.com>" formatından ismi çıkar
+    def export_options(default_name):
+        # Tüm dışa aktarmalarda ortak form alanları: çıktı adı ve biçimi
+        excel_name = sanitize_filename(request.form.get('excel_name', default_name))
+        return {'excel_name': excel_name, 'output_format': get_output_format()}
+
+    def parse_process_request():
+        # /process formunu doğrular; (alan -> dosyalar, seçenekler) döndürür
+        if 'file' not in request.files:
+            raise ExportError('Dosya seçilmedi')
+        # Birden çok posta kutusunun dışa aktarımları tek istekte yüklenebilir
+        files = [file for file in request.files.getlist('file') if file.filename != '']
+        options = export_options('email_listesi')
+        if not files:
+            raise ExportError('Dosya seçilmedi')
+        for file in files:
+            # Outlook CSV'si yerine mbox ya da .eml dosyası da yüklenebilir
+            check_upload(file.filename, OUTLOOK_SUFFIXES)
+        dedup_key = request.form.get('dedup_key', 'exact')
+        if dedup_key not in DEDUP_KEYS:
+            raise ExportError(f'Geçersiz tekrar anahtarı: {dedup_key}')
+        options.update(
+            dedup_key=dedup_key,
+            workers=app.config['PARSE_WORKERS'],
+            batch_workers=app.config['BATCH_WORKERS'],
+            backend=app.config['PARSE_BACKEND'],
+            cache_size=app.config['CELL_CACHE_SIZE'],
+            **inflate_options()
+        )
+        # contact_mode verilirse dosya kalıcı kişi dizinine eklenir ve dizinin tamamı
+        # ('full') ya da yalnızca ilk kez görülen kişiler ('delta') döner
+        contact_mode = request.form.get('contact_mode', '')
+        if contact_mode:
+            if contact_mode not in CONTACT_MODES:
+                raise ExportError(f'Geçersiz kişi dizini kipi: {contact_mode}')
+            if len(files) > 1:
+                raise ExportError('Kişi dizinine tek seferde bir dosya eklenebilir')
+            store_name = secure_filename(request.form.get('contact_store', '')) or 'varsayilan'
+            options.update(
+                contact_mode=contact_mode,
+                contact_store=os.path.join(app.config['CONTACT_STORE_DIR'], f'{store_name}.sqlite')
+            )
+        return {'file': files}, options
+
+    def parse_merge_excel_request():
+        # /merge_excel formunu doğrular; boş dosya alanları atlanır
+        if 'files' not in request.files:
+            raise ExportError('Dosya seçilmedi')
+        files = request.files.getlist('files')
+        options = export_options('birlesik_liste')
+        if not files:
+            raise ExportError('Lütfen en az bir Excel dosyası seçin')
+        files = [file for file in files if file.filename != '']
+        for file in files:
+            if not file.filename.lower().endswith('.xlsx'):
+                raise ExportError('Lütfen sadece Excel (.xlsx) dosyaları yükleyin')
+        return {'files': files}, options
+
+    def parse_process_airtable_request():
+        # /process_airtable formunu doğrular
+        if 'file' not in request.files:
+            raise ExportError('Dosya seçilmedi')
+        file = request.files['file']
+        options = export_options('airtable_liste')
+        if file.filename == '':
+            raise ExportError('Dosya seçilmedi')
+        check_upload(file.filename)
+        options.update(inflate_options())
+        return {'file': [file]}, options
+
+    def parse_compare_merge_request():
+        # /compare_merge formunu doğrular
+        if 'file1' not in request.files or 'file2' not in request.files:
+            raise ExportError('Lütfen iki Excel dosyası yükleyin')
+        file1 = request.files['file1']
+        file2 = request.files['file2']
+        options = export_options('tum_kisiler')
+        if file1.filename == '' or file2.filename == '':
+            raise ExportError('Lütfen iki Excel dosyası yükleyin')
+        if not file1.filename.lower().endswith('.xlsx') or not file2.filename.lower().endswith('.xlsx'):
+            raise ExportError('Lütfen sadece .xlsx dosyaları yükleyin')
+        return {'file1': [file1], 'file2': [file2]}, options
+
+    # Dışa aktarma türü -> form doğrulama fonksiyonu (türler uç nokta yollarıyla aynıdır)
+    EXPORT_REQUESTS = {
+        'process': parse_process_request,
+        'merge_excel': parse_merge_excel_request,
+        'process_airtable': parse_process_airtable_request,
+        'compare_merge': parse_compare_merge_request
+    }
+
+    def handle_export(export_type):
+        # Formu doğrular, dışa aktarmayı istek içinde çalıştırır ve çıktı dosyasını gönderir
+        temp_dir = None
+        start_time = time.time()
+
         try:
-            # İsim kısmını bul (< işaretinden önceki kısım)
-            name = text.split('<')[0].strip()
-            
-            # Gereksiz ön ekleri temizle
-            unwanted_prefixes = [
-                'To:', 'Cc:', 'From:', 'Gönderen:', 'Gönderen :', 
-                'To :', 'Cc :', 'From :', ';', 'Bilgi:', 'Bilgi :'
-            ]
-            
-            for prefix in unwanted_prefixes:
-                if name.startswith(prefix):
-                    name = name[len(prefix):].strip()
-            
-            return name
-        except:
-            return ''
+            logger.debug(f'Dışa aktarma isteği alındı: {export_type}')
+            logger.debug(f'Request Files: {request.files}')
+            logger.debug(f'Request Form: {request.form}')
+
+            files, options = EXPORT_REQUESTS[export_type]()
+            streams = {field: [(file.filename, file.stream) for file in field_files]
+                       for field, field_files in files.items()}
+
+            # Aynı girdiler aynı seçeneklerle daha önce işlendiyse önbellekteki çıktı gönderilir
+            key = None
+            # Kişi dizini kiplerinin çıktısı dizinin o anki durumuna bağlıdır, önbelleğe alınmaz
+            if result_cache and 'contact_store' not in options:
+                with stage('cache'):
+                    key = cache_key(export_type, streams, options, app.config['APP_VERSION'])
+                    cached = result_cache.get(key)
+                record_cache_result(request.endpoint, cached is not None)
+                if cached:
+                    logger.info(f'Sonuç önbellekten gönderildi: {export_type}')
+                    response = send_output(cached, options['excel_name'], options['output_format'])
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+            # Geçici dosyalar için dizin oluştur
+            temp_dir = tempfile.mkdtemp()
+            output_format = options['output_format']
+            output_path = os.path.join(temp_dir, f"output.{OUTPUT_FORMATS[output_format]['extension']}")
+            logger.debug(f'Geçici dizin oluşturuldu: {temp_dir}')
+
+            # Büyük yüklemeler süreç havuzunda işlenir; gevent işçisi bu sırada diğer
+            # istekleri yanıtlar. Küçükler istek içinde, diske yazılmadan akış olarak işlenir.
+            upload_bytes = sum(source_size(file.stream) for field_files in files.values() for file in field_files)
+            if app.config['EXPORT_PROCESSES'] and upload_bytes >= app.config['OFFLOAD_MIN_BYTES']:
+                with stage('upload'):
+                    inputs = save_uploads(files, temp_dir)
+                summary = run_export_in_pool(export_type, inputs, output_path, options,
+                                             max_workers=app.config['EXPORT_PROCESSES'])
+            else:
+                summary = run_export(export_type, streams, output_path, options)
+            record_throughput(summary['rows'], summary['bytes'])
+
+            if key:
+                try:
+                    result_cache.put(key, output_path)
+                except Exception as e:
+                    logger.error(f'Sonuç önbelleğe yazılamadı: {str(e)}')
+
+            # İşlem süresini hesapla
+            process_time = time.time() - start_time
+            logger.info(f'Toplam işlem süresi: {process_time:.2f} saniye')
+
+            @after_this_request
+            def cleanup(response):
+                try:
+                    shutil.rmtree(temp_dir, ignore_errors=True)
+                    logger.debug('Geçici dizin silindi')
+                except Exception as e:
+                    logger.error(f'Temizleme hatası: {str(e)}')
+                return response
 
-    def is_airtable_csv(file_path):
-        """Airtable CSV dosyası olup olmadığını kontrol et (daha esnek)"""
+            response = send_output(output_path, options['excel_name'], output_format)
+            if key:
+                response.headers['X-Cache'] = 'MISS'
+            return response
+
+        except ExportError as e:
+            logger.error(e.message)
+            if temp_dir and os.path.exists(temp_dir):
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            return jsonify({'error': e.message}), e.status_code
+        except Exception as e:
+            logger.error(f'Genel hata: {str(e)}')
+            logger.error(traceback.format_exc())
+            if temp_dir and os.path.exists(temp_dir):
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            return jsonify({'error': f'Hata oluştu: {str(e)}'}), 500
+
+    def cleanup_expired_jobs():
+        # Süresi dolan işleri ve yarım kalan yüklemeleri en fazla dakikada bir temizle
+        global last_job_cleanup
+        if time.time() - last_job_cleanup < 60:
+            return
+        last_job_cleanup = time.time()
         try:
-            with open(file_path, 'r', encoding='utf-8-sig') as f:
-                first_line = f.readline().strip().lower()
-                # Farklı başlık varyasyonlarını kontrol et
-                name_headers = ['name', 'ad', 'ad soyad']
-                email_headers = ['email', 'mail', 'e-posta', 'e posta']
-                return any(h in first_line for h in name_headers) and any(h in first_line for h in email_headers)
-        except:
-            return False
+            job_store.cleanup_expired()
+            upload_store.cleanup_expired()
+        except Exception as e:
+            logger.error(f'İş temizleme hatası: {str(e)}')
+
+    def public_job_status(status):
+        # Durum yanıtında iç dosya adları gösterilmez
+        status = {key: value for key, value in status.items() if key != 'result_file'}
+        status['status_url'] = f"/jobs/{status['id']}"
+        status['result_url'] = f"/jobs/{status['id']}/result"
+        return status
+
+    def public_upload_status(state):
+        # Yükleme durumu; iç seçenekler gösterilmez
+        state = {key: value for key, value in state.items() if key != 'options'}
+        state['status_url'] = f"/uploads/{state['id']}"
+        state['chunk_url'] = f"/uploads/{state['id']}/chunks/{{index}}"
+        state['finalize_url'] = f"/uploads/{state['id']}/finalize"
+        return state
 
     @app.route('/health')
     def health_check():
@@ -164,6 +428,11 @@ try:
             logger.error(traceback.format_exc())
             return jsonify({"status": "error", "message": error_msg}), 500
 
+    @app.route('/metrics')
+    def metrics():
+        # Prometheus biçiminde aşama süresi ve verim histogramları
+        return render_metrics(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
     @app.route('/favicon.ico')
     def favicon():
         try:
@@ -204,461 +473,197 @@ try:
     def process_file():
         if request.method == 'OPTIONS':
             return '', 204
-        
-        temp_csv_path = None
-        temp_excel_path = None
-        start_time = time.time()
-        
-        try:
-            logger.debug('Dosya yükleme isteği alındı')
-            logger.debug(f'Request Files: {request.files}')
-            logger.debug(f'Request Form: {request.form}')
-            
-            if 'file' not in request.files:
-                logger.error('Dosya bulunamadı')
-                return jsonify({'error': 'Dosya seçilmedi'}), 400
-            
-            file = request.files['file']
-            excel_name = request.form.get('excel_name', 'email_listesi')
-            excel_name = sanitize_filename(excel_name)
-            
-            if file.filename == '':
-                logger.error('Dosya adı boş')
-                return jsonify({'error': 'Dosya seçilmedi'}), 400
-            
-            if not is_csv_file(file.filename):
-                logger.error(f'Geçersiz dosya formatı: {file.filename}')
-                return jsonify({'error': 'Lütfen CSV dosyası yükleyin'}), 400
-            
-            # Geçici dosyalar için dizin oluştur
-            temp_dir = tempfile.mkdtemp()
-            temp_csv_path = os.path.join(temp_dir, 'input.csv')
-            temp_excel_path = os.path.join(temp_dir, 'output.xlsx')
-            
-            logger.debug(f'Geçici dizin oluşturuldu: {temp_dir}')
-            
-            try:
-                # CSV dosyasını kaydet
-                file.save(temp_csv_path)
-                file_size = os.path.getsize(temp_csv_path)
-                logger.debug(f'Dosya geçici konuma kaydedildi. Boyut: {file_size} bytes')
-                
-                # Dosya içeriğini kontrol et ve BOM karakterini temizle
-                with open(temp_csv_path, 'r', encoding='utf-8-sig') as f:
-                    content = f.read()
-                
-                with open(temp_csv_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                
-                with open(temp_csv_path, 'r', encoding='utf-8') as f:
-                    first_few_lines = ''.join(f.readline() for _ in range(5))
-                    logger.debug(f'Dosya içeriği (ilk 5 satır):\n{first_few_lines}')
-            except Exception as e:
-                logger.error(f'Dosya kaydetme/okuma hatası: {str(e)}')
-                logger.error(traceback.format_exc())
-                return jsonify({'error': f'Dosya işlenirken hata oluştu: {str(e)}'}), 400
-            
-            # E-posta adreslerini bul
-            logger.debug('E-posta adresleri aranıyor...')
-            try:
-                categorized_data = find_categorized_emails_in_file(temp_csv_path)
-                total_emails = sum(len(data) for data in categorized_data.values())
-                logger.debug(f'Bulunan toplam e-posta sayısı: {total_emails}')
-                if categorized_data:
-                    for category, data in categorized_data.items():
-                        logger.debug(f'{category}: {len(data)} adet e-posta bulundu')
-            except Exception as e:
-                logger.error(f'E-posta arama hatası: {str(e)}')
-                logger.error(traceback.format_exc())
-                return jsonify({'error': f'E-posta adresleri işlenirken hata oluştu: {str(e)}'}), 400
-            
-            if not categorized_data:
-                logger.warning('Hiç e-posta adresi bulunamadı')
-                return jsonify({'error': 'Hiç e-posta adresi bulunamadı'}), 400
-            
-            # Excel dosyası oluştur
-            logger.debug('Excel dosyası oluşturuluyor...')
-            
-            try:
-                # Tüm kategorilerdeki e-postaları ve ilgili bilgileri topla
-                all_data = []
-                seen_emails = set()  # Daha önce görülen e-postaları takip etmek için
-
-                # Kategorileri sırayla işle (Kimden, Kime, Bilgi, Gizli sırasında)
-                for category in ['Kimden', 'Kime', 'Bilgi', 'Gizli']:
-                    if category in categorized_data:
-                        for data in categorized_data[category]:
-                            email = data['email']
-                            # Eğer bu e-posta daha önce görülmediyse ekle
-                            if email not in seen_emails:
-                                seen_emails.add(email)
-                                original_text = data['original_text']
-                                all_data.append({
-                                    'Kategori': category,
-                                    'E-posta Adresi': email,
-                                    'Firma Adı': extract_company_name(email),
-                                    'Ad Soyad': extract_name_from_text(original_text)
-                                })
-                
-                # DataFrame oluştur
-                df = pd.DataFrame(all_data)
-                
-                # Excel'e kaydet
-                with pd.ExcelWriter(temp_excel_path, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=False, sheet_name='E-posta Listesi')
-                    workbook = writer.book
-                    worksheet = writer.sheets['E-posta Listesi']
-                    
-                    # Türkçe karakter desteği için font ayarı
-                    for row in worksheet.iter_rows():
-                        for cell in row:
-                            cell.font = Font(name='Calibri')
-                    
-                    # Sütun genişliklerini ayarla
-                    worksheet.column_dimensions['A'].width = 20  # Kategori sütunu
-                    worksheet.column_dimensions['B'].width = 40  # E-posta Adresi sütunu
-                    worksheet.column_dimensions['C'].width = 30  # Firma Adı sütunu
-                    worksheet.column_dimensions['D'].width = 30  # Ad Soyad sütunu
-                
-                logger.debug(f'Excel dosyası oluşturuldu: {temp_excel_path}')
-            except Exception as e:
-                logger.error(f'Excel oluşturma hatası: {str(e)}')
-                logger.error(traceback.format_exc())
-                return jsonify({'error': f'Excel dosyası oluşturulurken hata oluştu: {str(e)}'}), 400
-            
-            # İşlem süresini hesapla
-            process_time = time.time() - start_time
-            logger.info(f'Toplam işlem süresi: {process_time:.2f} saniye')
-            
-            # Excel dosyasını gönder
-            logger.debug('Excel dosyası gönderiliyor...')
-            
-            @after_this_request
-            def cleanup(response):
-                try:
-                    shutil.rmtree(temp_dir, ignore_errors=True)
-                    logger.debug('Geçici dizin silindi')
-                except Exception as e:
-                    logger.error(f'Temizleme hatası: {str(e)}')
-                return response
-            
-            return send_file(
-                temp_excel_path,
-                as_attachment=True,
-                download_name=f'{excel_name}.xlsx',
-                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-            )
-            
-        except Exception as e:
-            logger.error(f'Genel hata: {str(e)}')
-            logger.error(traceback.format_exc())
-            if temp_csv_path and os.path.exists(os.path.dirname(temp_csv_path)):
-                shutil.rmtree(os.path.dirname(temp_csv_path), ignore_errors=True)
-            return jsonify({'error': f'Hata oluştu: {str(e)}'}), 500
+        return handle_export('process')
 
     @app.route('/merge_excel', methods=['POST', 'OPTIONS'])
     def merge_excel():
         if request.method == 'OPTIONS':
             return '', 204
-        
-        temp_dir = None
-        temp_excel_path = None
-        start_time = time.time()
-        
+        return handle_export('merge_excel')
+
+    @app.route('/process_airtable', methods=['POST', 'OPTIONS'])
+    def process_airtable():
+        if request.method == 'OPTIONS':
+            return '', 204
+        return handle_export('process_airtable')
+
+    @app.route('/compare_merge', methods=['POST', 'OPTIONS'])
+    def compare_merge():
+        if request.method == 'OPTIONS':
+            return '', 204
+        return handle_export('compare_merge')
+
+    @app.route('/jobs', methods=['POST', 'OPTIONS'])
+    def create_job():
+        if request.method == 'OPTIONS':
+            return '', 204
+
         try:
-            logger.debug('Excel birleştirme isteği alındı')
-            
-            if 'files' not in request.files:
-                logger.error('Dosya bulunamadı')
-                return jsonify({'error': 'Dosya seçilmedi'}), 400
-            
-            files = request.files.getlist('files')
-            excel_name = request.form.get('excel_name', 'birlesik_liste')
-            excel_name = sanitize_filename(excel_name)
-            
-            if not files:
-                logger.error('Dosya seçilmedi')
-                return jsonify({'error': 'Lütfen en az bir Excel dosyası seçin'}), 400
-            
-            # Geçici dizin oluştur
-            temp_dir = tempfile.mkdtemp()
-            temp_excel_path = os.path.join(temp_dir, 'merged_output.xlsx')
-            
-            # Tüm e-postaları topla
-            all_emails = set()
-            all_data = []
-            
-            for file in files:
-                if file.filename == '':
-                    continue
-                
-                if not file.filename.lower().endswith('.xlsx'):
-                    logger.error(f'Geçersiz dosya formatı: {file.filename}')
-                    return jsonify({'error': 'Lütfen sadece Excel (.xlsx) dosyaları yükleyin'}), 400
-                
-                # Geçici dosya oluştur
-                temp_file_path = os.path.join(temp_dir, secure_filename(file.filename))
-                file.save(temp_file_path)
-                
-                try:
-                    # Excel dosyasını oku
-                    df = pd.read_excel(temp_file_path)
-                    
-                    # E-posta sütununu bul
-                    email_column = None
-                    for col in df.columns:
-                        if 'e-posta' in col.lower() or 'mail' in col.lower() or 'email' in col.lower():
-                            email_column = col
-                            break
-                    
-                    if email_column is None:
-                        logger.warning(f'{file.filename} dosyasında e-posta sütunu bulunamadı')
-                        continue
-                    
-                    # Her satırı işle
-                    for _, row in df.iterrows():
-                        email = str(row[email_column]).strip().lower()
-                        if '@' in email and email not in all_emails:
-                            all_emails.add(email)
-                            # Diğer sütunları da ekle
-                            data = {'E-posta Adresi': email}
-                            for col in df.columns:
-                                if col != email_column:
-                                    data[col] = row[col]
-                            all_data.append(data)
-                
-                except Exception as e:
-                    logger.error(f'Excel okuma hatası ({file.filename}): {str(e)}')
-                    logger.error(traceback.format_exc())
-                    continue
-            
-            if not all_data:
-                logger.warning('Hiç e-posta adresi bulunamadı')
-                return jsonify({'error': 'Hiç e-posta adresi bulunamadı'}), 400
-            
-            # Yeni Excel dosyası oluştur
-            df = pd.DataFrame(all_data)
-            
-            with pd.ExcelWriter(temp_excel_path, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name='E-posta Listesi')
-                workbook = writer.book
-                worksheet = writer.sheets['E-posta Listesi']
-                
-                # Türkçe karakter desteği için font ayarı
-                for row in worksheet.iter_rows():
-                    for cell in row:
-                        cell.font = Font(name='Calibri')
-                
-                # Sütun genişliklerini ayarla
-                for idx, col in enumerate(df.columns):
-                    worksheet.column_dimensions[chr(65 + idx)].width = 30
-            
-            # İşlem süresini hesapla
-            process_time = time.time() - start_time
-            logger.info(f'Toplam işlem süresi: {process_time:.2f} saniye')
-            
-            @after_this_request
-            def cleanup(response):
-                try:
-                    if temp_dir and os.path.exists(temp_dir):
-                        shutil.rmtree(temp_dir, ignore_errors=True)
-                        logger.debug('Geçici dizin silindi')
-                except Exception as e:
-                    logger.error(f'Temizleme hatası: {str(e)}')
-                return response
-            
-            return send_file(
-                temp_excel_path,
-                as_attachment=True,
-                download_name=f'{excel_name}.xlsx',
-                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-            )
-            
+            # 'type' alanı işlem türünü seçer; diğer alanlar ilgili uç noktanınkiyle aynıdır
+            export_type = request.form.get('type', '')
+            if export_type not in EXPORT_REQUESTS:
+                raise ExportError(f'Geçersiz işlem türü: {export_type}')
+            files, options = EXPORT_REQUESTS[export_type]()
+
+            cleanup_expired_jobs()
+            status = job_store.create(export_type, files, options)
+            job_runner.submit(status['id'])
+            logger.info(f"İş oluşturuldu: {status['id']} ({export_type})")
+            return jsonify(public_job_status(status)), 202
+
+        except ExportError as e:
+            logger.error(e.message)
+            return jsonify({'error': e.message}), e.status_code
         except Exception as e:
-            logger.error(f'Genel hata: {str(e)}')
+            logger.error(f'İş oluşturma hatası: {str(e)}')
             logger.error(traceback.format_exc())
-            if temp_dir and os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir, ignore_errors=True)
             return jsonify({'error': f'Hata oluştu: {str(e)}'}), 500
 
-    @app.route('/process_airtable', methods=['POST', 'OPTIONS'])
-    def process_airtable():
+    @app.route('/jobs/<job_id>')
+    def job_status(job_id):
+        cleanup_expired_jobs()
+        status = job_store.load_status(job_id)
+        if status is None:
+            return jsonify({'error': 'İş bulunamadı'}), 404
+        response = jsonify(public_job_status(status))
+        # İlerleme sorguları önbelleğe alınmamalı
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+
+    @app.route('/jobs/<job_id>/result')
+    def job_result(job_id):
+        status = job_store.load_status(job_id)
+        if status is None:
+            return jsonify({'error': 'İş bulunamadı'}), 404
+        if status['state'] == 'failed':
+            return jsonify({'error': status.get('error') or 'İş başarısız oldu', 'state': 'failed'}), 409
+        if status['state'] != 'done':
+            return jsonify({'error': 'İş henüz tamamlanmadı', 'state': status['state'], 'progress': status['progress']}), 409
+        return send_file(
+            job_store.result_path(job_id),
+            as_attachment=True,
+            download_name=status['download_name'],
+            mimetype=status['mimetype']
+        )
+
+    @app.route('/uploads', methods=['POST', 'OPTIONS'])
+    def create_upload():
         if request.method == 'OPTIONS':
             return '', 204
-        
-        temp_csv_path = None
-        temp_excel_path = None
-        start_time = time.time()
-        
+
         try:
-            logger.debug('Airtable CSV işleme isteği alındı')
-            
-            if 'file' not in request.files:
-                logger.error('Dosya bulunamadı')
-                return jsonify({'error': 'Dosya seçilmedi'}), 400
-            
-            file = request.files['file']
-            excel_name = request.form.get('excel_name', 'airtable_liste')
-            excel_name = sanitize_filename(excel_name)
-            
-            if file.filename == '':
-                logger.error('Dosya adı boş')
-                return jsonify({'error': 'Dosya seçilmedi'}), 400
-            
-            if not is_csv_file(file.filename):
-                logger.error(f'Geçersiz dosya formatı: {file.filename}')
-                return jsonify({'error': 'Lütfen CSV dosyası yükleyin'}), 400
-            
-            # Geçici dosyalar için dizin oluştur
-            temp_dir = tempfile.mkdtemp()
-            temp_csv_path = os.path.join(temp_dir, 'input.csv')
-            temp_excel_path = os.path.join(temp_dir, 'output.xlsx')
-            
-            logger.debug(f'Geçici dizin oluşturuldu: {temp_dir}')
-            
+            # Dosya içeriği gönderilmez; yalnızca adı ve toplam boyutu
+            filename = request.form.get('filename', '')
+            if not filename:
+                raise ExportError('Dosya seçilmedi')
+            if not is_csv_file(filename):
+                raise ExportError('Lütfen CSV dosyası yükleyin')
             try:
-                # CSV dosyasını kaydet
-                file.save(temp_csv_path)
-                file_size = os.path.getsize(temp_csv_path)
-                logger.debug(f'Dosya geçici konuma kaydedildi. Boyut: {file_size} bytes')
-                
-                # Airtable CSV kontrolü
-                if not is_airtable_csv(temp_csv_path):
-                    logger.error('Geçersiz Airtable CSV formatı')
-                    return jsonify({'error': 'Lütfen Airtable\'dan export edilmiş bir CSV dosyası yükleyin'}), 400
-                
-                # CSV'yi oku
-                df = pd.read_csv(temp_csv_path, encoding='utf-8-sig')
-                
-                # Excel'e kaydet
-                with pd.ExcelWriter(temp_excel_path, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=False, sheet_name='Airtable Verileri')
-                    workbook = writer.book
-                    worksheet = writer.sheets['Airtable Verileri']
-                    
-                    # Türkçe karakter desteği için font ayarı
-                    for row in worksheet.iter_rows():
-                        for cell in row:
-                            cell.font = Font(name='Calibri')
-                    
-                    # Sütun genişliklerini ayarla
-                    for idx, col in enumerate(df.columns):
-                        worksheet.column_dimensions[chr(65 + idx)].width = 30
-                
-                logger.debug(f'Excel dosyası oluşturuldu: {temp_excel_path}')
-                
-            except Exception as e:
-                logger.error(f'Dosya işleme hatası: {str(e)}')
-                logger.error(traceback.format_exc())
-                return jsonify({'error': f'Dosya işlenirken hata oluştu: {str(e)}'}), 400
-            
-            # İşlem süresini hesapla
-            process_time = time.time() - start_time
-            logger.info(f'Toplam işlem süresi: {process_time:.2f} saniye')
-            
-            @after_this_request
-            def cleanup(response):
-                try:
-                    if temp_dir and os.path.exists(temp_dir):
-                        shutil.rmtree(temp_dir, ignore_errors=True)
-                        logger.debug('Geçici dizin silindi')
-                except Exception as e:
-                    logger.error(f'Temizleme hatası: {str(e)}')
-                return response
-            
-            return send_file(
-                temp_excel_path,
-                as_attachment=True,
-                download_name=f'{excel_name}.xlsx',
-                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-            )
-            
+                size = int(request.form.get('size', ''))
+            except ValueError:
+                raise ExportError('Dosya boyutu geçersiz')
+            dedup_key = request.form.get('dedup_key', 'exact')
+            if dedup_key not in DEDUP_KEYS:
+                raise ExportError(f'Geçersiz tekrar anahtarı: {dedup_key}')
+
+            cleanup_expired_jobs()
+            state = upload_store.create(filename, size, {
+                'dedup_key': dedup_key,
+                'cache_size': app.config['CELL_CACHE_SIZE']
+            })
+            logger.info(f"Yükleme başlatıldı: {state['id']} ({filename}, {size} bytes)")
+            return jsonify(public_upload_status(upload_store.load_state(state['id']))), 201
+
+        except (ExportError, UploadError) as e:
+            logger.error(e.message)
+            return jsonify({'error': e.message}), e.status_code
         except Exception as e:
-            logger.error(f'Genel hata: {str(e)}')
+            logger.error(f'Yükleme başlatma hatası: {str(e)}')
             logger.error(traceback.format_exc())
-            if temp_dir and os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir, ignore_errors=True)
             return jsonify({'error': f'Hata oluştu: {str(e)}'}), 500
 
-    @app.route('/compare_merge', methods=['POST', 'OPTIONS'])
-    def compare_merge():
+    @app.route('/uploads/<upload_id>/chunks/<int:index>', methods=['PUT', 'OPTIONS'])
+    def upload_chunk(upload_id, index):
         if request.method == 'OPTIONS':
             return '', 204
 
-        temp_dir = None
-        temp_excel_path = None
-        start_time = time.time()
-
         try:
-            logger.debug('Karşılaştır ve Birleştir isteği alındı')
-
-            if 'file1' not in request.files or 'file2' not in request.files:
-                logger.error('Dosya(lar) bulunamadı')
-                return jsonify({'error': 'Lütfen iki Excel dosyası yükleyin'}), 400
+            state = upload_store.load_state(upload_id)
+            if state is None:
+                raise UploadError('Yükleme bulunamadı', 404)
+            if not 0 <= index < state['total_chunks']:
+                raise UploadError(f'Geçersiz parça numarası: {index}')
+            # Ayrıştırıcı ilk parça gelince başlar ve parçalar geldikçe çalışır
+            parser_pool.ensure_parser(upload_store.upload_dir(upload_id))
+            with stage('upload'):
+                upload_store.write_chunk(upload_id, index, request.stream)
+            state = upload_store.load_state(upload_id)
+            return jsonify({'index': index, 'received': len(state['received']), 'missing': state['missing']})
+
+        except UploadError as e:
+            logger.error(e.message)
+            return jsonify({'error': e.message}), e.status_code
+        except Exception as e:
+            logger.error(f'Parça yükleme hatası: {str(e)}')
+            logger.error(traceback.format_exc())
+            return jsonify({'error': f'Hata oluştu: {str(e)}'}), 500
 
-            file1 = request.files['file1']
-            file2 = request.files['file2']
-            excel_name = request.form.get('excel_name', 'tum_kisiler')
-            excel_name = sanitize_filename(excel_name)
+    @app.route('/uploads/<upload_id>')
+    def upload_status(upload_id):
+        state = upload_store.load_state(upload_id)
+        if state is None:
+            return jsonify({'error': 'Yükleme bulunamadı'}), 404
+        response = jsonify(public_upload_status(state))
+        # Eksik parça sorguları önbelleğe alınmamalı
+        response.headers['Cache-Control'] = 'no-store'
+        return response
 
-            if file1.filename == '' or file2.filename == '':
-                logger.error('Dosya adı boş')
-                return jsonify({'error': 'Lütfen iki Excel dosyası yükleyin'}), 400
+    @app.route('/uploads/<upload_id>/finalize', methods=['POST', 'OPTIONS'])
+    def finalize_upload(upload_id):
+        if request.method == 'OPTIONS':
+            return '', 204
 
-            if not file1.filename.lower().endswith('.xlsx') or not file2.filename.lower().endswith('.xlsx'):
-                logger.error('Geçersiz dosya formatı')
-                return jsonify({'error': 'Lütfen sadece .xlsx dosyaları yükleyin'}), 400
+        temp_dir = None
+        start_time = time.time()
+        try:
+            state = upload_store.load_state(upload_id)
+            if state is None:
+                return jsonify({'error': 'Yükleme bulunamadı'}), 404
+            if state['missing']:
+                return jsonify({'error': 'Yükleme henüz tamamlanmadı', 'missing': state['missing']}), 409
+            options = export_options('email_listesi')
+            options.update(state['options'])
+            inputs = {'upload': [(state['filename'], upload_store.upload_dir(upload_id))]}
 
-            # Geçici dizin oluştur
             temp_dir = tempfile.mkdtemp()
-            temp_file1 = os.path.join(temp_dir, secure_filename(file1.filename))
-            temp_file2 = os.path.join(temp_dir, secure_filename(file2.filename))
-            temp_excel_path = os.path.join(temp_dir, 'output.xlsx')
-
-            file1.save(temp_file1)
-            file2.save(temp_file2)
-
-            # Dosyaları oku
-            df1 = pd.read_excel(temp_file1)
-            df2 = pd.read_excel(temp_file2)
-
-            # Excel'e iki ayrı sheet olarak kaydet
-            with pd.ExcelWriter(temp_excel_path, engine='openpyxl') as writer:
-                df1.to_excel(writer, index=False, sheet_name='Birleştirilmiş')
-                df2.to_excel(writer, index=False, sheet_name='Airtable')
-                workbook = writer.book
-                for sheet in writer.sheets.values():
-                    for row in sheet.iter_rows():
-                        for cell in row:
-                            cell.font = Font(name='Calibri')
-                    # Sütun genişliklerini ayarla
-                    for idx, col in enumerate(sheet.iter_cols(1, sheet.max_column)):
-                        sheet.column_dimensions[chr(65 + idx)].width = 30
-
-            process_time = time.time() - start_time
-            logger.info(f'Toplam işlem süresi: {process_time:.2f} saniye')
+            output_format = options['output_format']
+            output_path = os.path.join(temp_dir, f"output.{OUTPUT_FORMATS[output_format]['extension']}")
+            # Ayrıştırma çoğunlukla bitmiştir; büyük listelerin yazımı süreç havuzunda yapılır
+            if app.config['EXPORT_PROCESSES'] and state['size'] >= app.config['OFFLOAD_MIN_BYTES']:
+                summary = run_export_in_pool('upload', inputs, output_path, options,
+                                             max_workers=app.config['EXPORT_PROCESSES'])
+            else:
+                summary = run_export('upload', inputs, output_path, options)
+            record_throughput(summary['rows'], summary['bytes'])
+            logger.info(f'Toplam işlem süresi: {time.time() - start_time:.2f} saniye')
 
             @after_this_request
             def cleanup(response):
-                try:
-                    if temp_dir and os.path.exists(temp_dir):
-                        shutil.rmtree(temp_dir, ignore_errors=True)
-                        logger.debug('Geçici dizin silindi')
-                except Exception as e:
-                    logger.error(f'Temizleme hatası: {str(e)}')
+                shutil.rmtree(temp_dir, ignore_errors=True)
+                upload_store.remove(upload_id)
                 return response
 
-            return send_file(
-                temp_excel_path,
-                as_attachment=True,
-                download_name=f'{excel_name}.xlsx',
-                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-            )
+            return send_output(output_path, options['excel_name'], output_format)
 
+        except ExportError as e:
+            logger.error(e.message)
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            return jsonify({'error': e.message}), e.status_code
         except Exception as e:
             logger.error(f'Genel hata: {str(e)}')
             logger.error(traceback.format_exc())
-            if temp_dir and os.path.exists(temp_dir):
+            if temp_dir:
                 shutil.rmtree(temp_dir, ignore_errors=True)
             return jsonify({'error': f'Hata oluştu: {str(e)}'}), 500
 
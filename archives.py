@@ -0,0 +1,175 @@
+"""Sıkıştırılmış yüklemeleri (.csv.gz, .zip, .csv.zst) akış halinde açan yardımcılar
+
+Açılan veri diske yazılmaz; ayrıştırıcı sıkıştırılmış kaynaktan okudukça
+açılır. zip arşivindeki istenen uzantılı tüm dosyalar (arşivdeki sırayla)
+kullanılır; varsayılan uzantı .csv'dir.
+zstd desteği isteğe bağlı zstandard paketi kuruluysa vardır.
+
+Sıkıştırma bombalarına karşı açılan toplam bayt sayısı sınırlıdır: en fazla
+sıkıştırılmış boyutun max_ratio katı (küçük dosyalar için en az
+MIN_INFLATE_BYTES) ve en fazla max_bytes. Aynı dosyanın yeniden açılıp
+okunması (örn. önce başlık, sonra tamamı) sınırdan yeniden düşülmez; her
+dosya için en uzun okuma sayılır. Sınır aşılınca okuma InflateLimitError
+(DecompressionError) ile kesilir.
+"""
+import gzip
+import io
+import os
+import zipfile
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Dosya uzantısı -> sıkıştırma türü
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.zip': 'zip', '.zst': 'zstd'}
+# Outlook CSV'leri yaklaşık 10 kat sıkışır; 100 katın üstü bomba sayılır
+DEFAULT_MAX_RATIO = 100
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+# Oran sınırı bu boyutun altındaki açılmış veriye uygulanmaz
+MIN_INFLATE_BYTES = 16 * 1024 * 1024
+READ_BUFFER_BYTES = 1024 * 1024
+
+class DecompressionError(ValueError):
+    """Arşiv açılamadı ya da açılan veri sınırı aştı"""
+    status_code = 400
+
+class InflateLimitError(DecompressionError):
+    """Açılan veri sınırı aşıldı"""
+    status_code = 413
+
+def compression_type(filename):
+    """Dosya adının sıkıştırma türünü ('gzip', 'zip', 'zstd') döndürür; sıkıştırılmamışsa None"""
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(filename.lower())[1])
+
+def is_compressed_upload(filename, suffixes=('.csv',)):
+    """Dosya adı .zip ya da sıkıştırılmış bir .csv (veya suffixes'teki başka bir uzantı) mı"""
+    compression = compression_type(filename)
+    if compression == 'zip':
+        return True
+    return compression is not None and os.path.splitext(filename)[0].lower().endswith(suffixes)
+
+class _InflateBudget:
+    """Bir kaynaktan açılan tüm akışların paylaştığı bayt sınırı
+
+    Her arşiv dosyası için o dosyanın en uzun okumasında açılan bayt sayısı
+    sayılır; aynı dosyanın tekrar açılması toplamı artırmaz.
+    """
+
+    def __init__(self, compressed_bytes, max_ratio, max_bytes):
+        self.limit = min(max_bytes, max(compressed_bytes * max_ratio, MIN_INFLATE_BYTES))
+        self.compressed_bytes = compressed_bytes
+        self.used = 0
+        self._member_bytes = {}
+
+    def consume(self, member, position):
+        """member dosyasının bir okumasında position bayta ulaşıldı"""
+        extra = position - self._member_bytes.get(member, 0)
+        if extra <= 0:
+            return
+        self._member_bytes[member] = position
+        self.used += extra
+        if self.used > self.limit:
+            raise InflateLimitError(
+                f'Açılan veri sınırı aşıldı ({self.compressed_bytes} bayt arşivden {self.limit} bayttan fazla)'
+            )
+
+class _LimitedStream(io.RawIOBase):
+    """Açılmış akıştan okurken okunan baytları ortak sınırdan düşer"""
+
+    def __init__(self, stream, budget, member):
+        self._stream = stream
+        self._budget = budget
+        self._member = member
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._stream.read(len(buffer))
+        count = len(data)
+        self._position += count
+        self._budget.consume(self._member, self._position)
+        buffer[:count] = data
+        return count
+
+    def close(self):
+        if not self.closed:
+            self._stream.close()
+        super().close()
+
+def _source_size(source):
+    if isinstance(source, str):
+        return os.path.getsize(source)
+    return source.seek(0, os.SEEK_END)
+
+def _rewind(source):
+    if not isinstance(source, str):
+        source.seek(0)
+    return source
+
+def _zip_members(source, suffixes):
+    try:
+        with zipfile.ZipFile(_rewind(source)) as archive:
+            members = [
+                info for info in archive.infolist()
+                if not info.is_dir() and info.filename.lower().endswith(suffixes)
+                and not info.filename.startswith('__MACOSX/')
+            ]
+    except zipfile.BadZipFile as e:
+        raise DecompressionError(f'Geçersiz zip arşivi: {str(e)}')
+    if not members:
+        raise DecompressionError(f'Arşivde {", ".join(suffixes)} dosyası bulunamadı')
+    return members
+
+def _open_zip_member(source, info):
+    # Arşiv kapatılsa da açık üye kendi dosya tanıtıcısını kapanana kadar tutar
+    with zipfile.ZipFile(_rewind(source)) as archive:
+        try:
+            return archive.open(info)
+        except RuntimeError as e:
+            # Şifreli üyeler
+            raise DecompressionError(str(e))
+
+def _open_single(source, compression):
+    if compression == 'gzip':
+        # Yükleme akışlarının kipi (w+b) GzipFile'a yazma kipi gibi görünür
+        if isinstance(source, str):
+            return gzip.GzipFile(source, 'rb')
+        return gzip.GzipFile(fileobj=_rewind(source), mode='rb')
+    file = open(source, 'rb') if isinstance(source, str) else _rewind(source)
+    return zstandard.ZstdDecompressor().stream_reader(file, read_across_frames=True,
+                                                      closefd=isinstance(source, str))
+
+def open_archive_members(filename, source, suffixes=('.csv',), max_ratio=DEFAULT_MAX_RATIO,
+                         max_bytes=DEFAULT_MAX_BYTES):
+    """Sıkıştırılmış kaynaktaki dosyaları [(ad, açıcı)] olarak döndürür
+
+    zip arşivlerinden yalnızca suffixes uzantılı dosyalar alınır. Kaynak
+    dosya yolu ya da konumlanabilir ikili akış olabilir. Açıcı her
+    çağrıldığında dosyayı baştan okuyan yeni bir ikili akış döndürür (aynı
+    anda yalnızca biri okunmalıdır). Sınır aşımı okuma sırasında
+    InflateLimitError verir.
+    """
+    compression = compression_type(filename)
+    if compression is None:
+        raise DecompressionError(f'Sıkıştırılmış dosya değil: {filename}')
+    if compression == 'zstd' and not ZSTD_AVAILABLE:
+        raise DecompressionError('zstd dosyaları için sunucuda zstandard kurulu değil')
+    budget = _InflateBudget(_source_size(source), max_ratio, max_bytes)
+
+    def opener(member, open_stream):
+        def open_member():
+            return io.BufferedReader(_LimitedStream(open_stream(), budget, member), READ_BUFFER_BYTES)
+        return open_member
+
+    if compression == 'zip':
+        return [
+            (info.filename, opener(index, lambda info=info: _open_zip_member(source, info)))
+            for index, info in enumerate(_zip_members(source, suffixes))
+        ]
+    # .csv.gz -> .csv
+    return [(os.path.splitext(os.path.basename(filename))[0], opener(0, lambda: _open_single(source, compression)))]
@@ -0,0 +1,52 @@
+"""Public Suffix List tabanlı firma adı çıkarmayı eski ilk-etiket yöntemiyle karşılaştırır
+
+Kullanım: python benchmarks/bench_domains.py [adres_sayısı] [benzersiz_alan_adı]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from domains import company_name, load_public_suffixes, registrable_domains
+
+SUFFIXES = ['com.tr', 'com', 'net', 'org.tr', 'co.uk', 'gen.tr', 'de', 'io']
+SUBDOMAINS = ['', '', 'mail.', 'mx.', 'bounces.', 'eu.mail.']
+
+def make_emails(count, unique_domains, seed=0):
+    rnd = random.Random(seed)
+    domains = [f'{rnd.choice(SUBDOMAINS)}firma{n}.{rnd.choice(SUFFIXES)}' for n in range(unique_domains)]
+    return pd.Series([f'kisi{n}@{rnd.choice(domains)}' for n in range(count)])
+
+def first_label(email):
+    """Eski yöntem: @'den sonraki ilk etiket"""
+    try:
+        return email.split('@')[1].split('.')[0]
+    except IndexError:
+        return ''
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    unique_domains = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    emails = make_emails(count, unique_domains)
+
+    elapsed, _ = timed(load_public_suffixes)
+    print(f'Kural ağacı yüklendi: {elapsed:.3f} sn')
+    elapsed, old = timed(lambda: [first_label(email) for email in emails])
+    print(f'İlk etiket          {elapsed:7.2f} sn  {count / elapsed:12.0f} adres/sn')
+    elapsed, scalar = timed(lambda: [company_name(email) for email in emails])
+    print(f'company_name        {elapsed:7.2f} sn  {count / elapsed:12.0f} adres/sn')
+    elapsed, bulk = timed(lambda: registrable_domains(emails))
+    print(f'registrable_domains {elapsed:7.2f} sn  {count / elapsed:12.0f} adres/sn')
+
+    assert list(bulk['Firma Adı']) == scalar
+    changed = sum(1 for before, after in zip(old, scalar) if before != after)
+    print(f'Firma adı değişen adres: {changed} / {count}')
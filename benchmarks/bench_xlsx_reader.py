@@ -0,0 +1,62 @@
+"""Akış tabanlı .xlsx okuyucuyu pd.read_excel ile karşılaştırır
+
+Kullanım: python benchmarks/bench_xlsx_reader.py [satır_sayısı]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from bench_xlsx_writer import COLUMNS, WIDTHS, make_contacts
+from readers import read_sheet, iter_sheet_rows, CALAMINE_AVAILABLE
+from writers import write_xlsx
+
+def read_with_pandas(path):
+    return pd.read_excel(path)
+
+def read_streaming(path):
+    return read_sheet(path, engine='openpyxl')
+
+def read_calamine(path):
+    return read_sheet(path, engine='calamine')
+
+def read_email_column(path):
+    """Yalnızca e-posta sütununu satır satır okur (DataFrame kurulmaz)"""
+    _, rows = iter_sheet_rows(path, columns=['E-posta Adresi'], engine='openpyxl')
+    return sum(1 for _ in rows)
+
+def measure(func, path, repeat=3):
+    """Fonksiyonun en iyi süresini ve (ayrı bir çalıştırmada) tepe bellek kullanımını ölçer"""
+    elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(path)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    readers = [('read_excel', read_with_pandas), ('Akış', read_streaming), ('Akış (e-posta)', read_email_column)]
+    if CALAMINE_AVAILABLE:
+        readers.append(('calamine', read_calamine))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'kisiler.xlsx')
+        write_xlsx(path, [('E-posta Listesi', COLUMNS, iter(make_contacts(rows)), WIDTHS)])
+        print(f'{rows} satırlık çalışma kitabı okunuyor ({os.path.getsize(path) / (1024 * 1024):.1f} MB)')
+
+        for label, func in readers:
+            elapsed, peak = measure(func, path)
+            print(
+                f'{label:<16} {elapsed:7.2f} sn  {rows / elapsed:10.0f} satır/sn  '
+                f'tepe bellek {peak / (1024 * 1024):8.1f} MB'
+            )
@@ -0,0 +1,73 @@
+"""Akış tabanlı .xlsx yazıcıyı eski pd.ExcelWriter + hücre başına yazı tipi yolu ile karşılaştırır
+
+Kullanım: python benchmarks/bench_xlsx_writer.py [satır_sayısı]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from openpyxl.styles import Font
+
+from generate_outlook_csv import make_people
+from writers import write_xlsx
+
+COLUMNS = ['Kategori', 'E-posta Adresi', 'Firma Adı', 'Ad Soyad']
+WIDTHS = {'Kategori': 20, 'E-posta Adresi': 40, 'Firma Adı': 30, 'Ad Soyad': 30}
+CATEGORIES = ['Kimden', 'Kime', 'Bilgi', 'Gizli']
+
+def make_contacts(rows, seed=0):
+    """/process çıktısına benzeyen kişi satırları üretir"""
+    rnd = random.Random(seed)
+    return [
+        [rnd.choice(CATEGORIES), email, email.split('@')[1].split('.')[0], name]
+        for name, email in make_people(rows, rnd)
+    ]
+
+def write_with_excelwriter(path, contacts):
+    """Eski yol: tüm çalışma kitabı bellekte kurulur, ardından her hücreye yazı tipi atanır"""
+    df = pd.DataFrame(contacts, columns=COLUMNS)
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='E-posta Listesi')
+        worksheet = writer.sheets['E-posta Listesi']
+        for row in worksheet.iter_rows():
+            for cell in row:
+                cell.font = Font(name='Calibri')
+        for idx, column in enumerate(COLUMNS):
+            worksheet.column_dimensions[chr(65 + idx)].width = WIDTHS[column]
+
+def write_streaming(path, contacts):
+    """Yeni yol: satırlar yalnızca yazma kipinde üretildikçe yazılır"""
+    write_xlsx(path, [('E-posta Listesi', COLUMNS, iter(contacts), WIDTHS)])
+
+def measure(func, path, contacts, repeat=3):
+    """Fonksiyonun en iyi süresini ve (ayrı bir çalıştırmada) tepe bellek kullanımını ölçer"""
+    elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(path, contacts)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    tracemalloc.start()
+    func(path, contacts)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, os.path.getsize(path)
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    contacts = make_contacts(rows)
+    print(f'{rows} kişi satırı yazılıyor')
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for label, func in (('ExcelWriter', write_with_excelwriter), ('Akış', write_streaming)):
+            path = os.path.join(temp_dir, f'{func.__name__}.xlsx')
+            elapsed, peak, size = measure(func, path, contacts)
+            print(
+                f'{label:<12} {elapsed:7.2f} sn  {rows / elapsed:10.0f} satır/sn  '
+                f'tepe bellek {peak / (1024 * 1024):8.1f} MB  dosya {size / 1024:8.1f} KB'
+            )
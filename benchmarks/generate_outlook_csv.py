@@ -0,0 +1,134 @@
+"""Gerçekçi, Türkçe başlıklı sentetik Outlook CSV dışa aktarımları üretir
+
+Üretilen dosyalarda çok alıcılı hücreler, <mailto:> tekrarları, Exchange
+/O=EXCHANGELABS/ adresleri, geri dönen (bounce) adresler ve büyük ileti
+gövdeleri bulunur. Aynı tohum (seed) her zaman aynı dosyayı üretir.
+
+Kullanım: python benchmarks/generate_outlook_csv.py <10k|100k|1M|satır_sayısı> <çıktı.csv> [tohum]
+"""
+import csv
+import random
+import sys
+
+OUTLOOK_HEADERS = [
+    'Konu', 'Gövde',
+    'Kimden: (Ad)', 'Kimden: (Adres)', 'Kimden: (Tür)',
+    'Kime: (Ad)', 'Kime: (Adres)', 'Kime: (Tür)',
+    'Bilgi: (Ad)', 'Bilgi: (Adres)', 'Bilgi: (Tür)',
+    'Gizli: (Ad)', 'Gizli: (Adres)', 'Gizli: (Tür)',
+    'Faturalama Bilgileri', 'Kategoriler', 'Duyarlılık'
+]
+
+AIRTABLE_HEADERS = ['Name', 'Email', 'Company', 'Notes']
+
+# Hazır boyutlar
+SIZES = {'10k': 10_000, '100k': 100_000, '1M': 1_000_000}
+
+FIRST_NAMES = ['Ahmet', 'Ayşe', 'Mehmet', 'Fatma', 'Mustafa', 'Zeynep', 'Emre', 'Elif', 'Burak', 'Şule',
+               'Can', 'Gökçe', 'Oğuz', 'İrem', 'Çağrı', 'Özge', 'Hakan', 'Merve', 'Kübra', 'Sezer']
+LAST_NAMES = ['Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik', 'Yıldız', 'Öztürk', 'Aydın', 'Arslan', 'Doğan',
+              'Kılıç', 'Aslan', 'Çetin', 'Kara', 'Koç', 'Kurt', 'Özdemir', 'Polat', 'Erdoğan', 'Güneş']
+DOMAINS = ['firma.com.tr', 'ornek.com', 'yzf.com.tr', 'holding.com.tr', 'mail.company.com.tr',
+           'paddle.com', 'gmail.com', 'outlook.com', 'bilisim.net', 'danismanlik.org.tr']
+BOUNCE_ADDRESSES = [
+    'bounce-{n}@io.mta1vrest.cc.prd.sparkpost',
+    'MAILER-DAEMON@{domain}',
+    'postmaster@{domain}',
+    'msprvs1=19{n}=bounces-{n}@bounces.{domain}'
+]
+EXCHANGE_DN = '/O=EXCHANGELABS/OU=EXCHANGE ADMINISTRATIVE GROUP (FYDIBOHF23SPDLT)/CN=RECIPIENTS/CN={n}-{user}'
+ASCII_LETTERS = str.maketrans('ÇĞİÖŞÜçğıöşü', 'CGIOSUcgiosu')
+BODY_LINE = 'Merhaba, ekteki "rapor" ile ilgili görüşlerinizi bekliyorum.\n'
+
+def make_people(count, rnd):
+    """(ad soyad, e-posta) çiftlerinden oluşan bir kişi havuzu üretir"""
+    people = []
+    for i in range(count):
+        first = rnd.choice(FIRST_NAMES)
+        last = rnd.choice(LAST_NAMES)
+        user = f'{first}.{last}{i}'.translate(ASCII_LETTERS).lower()
+        people.append((f'{first} {last}', f'{user}@{rnd.choice(DOMAINS)}'))
+    return people
+
+def address_cell(people, rnd):
+    """Bir Outlook adres hücresi ve karşılık gelen isim hücresini üretir"""
+    names = []
+    addresses = []
+    for name, email in people:
+        roll = rnd.random()
+        if roll < 0.25:
+            # Outlook'un <mailto:> tekrarı
+            addresses.append(f'{name} <{email} <mailto:{email}>>')
+        elif roll < 0.35:
+            addresses.append(f'{email} <mailto:{email}>')
+        else:
+            addresses.append(email)
+        names.append(name)
+    return ';'.join(names), ';'.join(addresses)
+
+def generate_rows(rows, seed=0, people_count=None, body_size=2000):
+    """Outlook CSV satırlarını (başlık hariç) üretir"""
+    rnd = random.Random(seed)
+    # Gerçek posta kutularında yazışılan kişi sayısı satır sayısından çok daha azdır
+    people = make_people(people_count or max(rows // 20, 50), rnd)
+    body = (BODY_LINE * (body_size // len(BODY_LINE) + 1))[:body_size]
+
+    for i in range(rows):
+        roll = rnd.random()
+        if roll < 0.08:
+            # Exchange iç adresi (sistem bilgisi olarak atlanır)
+            sender_name, email = rnd.choice(people)
+            sender = (sender_name, EXCHANGE_DN.format(n=rnd.randint(1000, 9999), user=email.split('@')[0]))
+        elif roll < 0.12:
+            # Geri dönen ileti adresleri
+            template = rnd.choice(BOUNCE_ADDRESSES)
+            sender = ('Mail Delivery System', template.format(n=rnd.randint(1, 10 ** 6), domain=rnd.choice(DOMAINS)))
+        else:
+            sender = address_cell([rnd.choice(people)], rnd)
+
+        to = address_cell(rnd.sample(people, rnd.choice((1, 1, 1, 2, 3, 5))), rnd)
+        cc = address_cell(rnd.sample(people, rnd.choice((0, 0, 0, 1, 2, 4))), rnd)
+        bcc = address_cell(rnd.sample(people, rnd.choice((0, 0, 0, 0, 0, 1))), rnd)
+        # Gövde boyutu satırdan satıra değişir
+        row_body = body[:rnd.randint(body_size // 4, body_size)] if body_size else ''
+
+        yield [
+            f'RE: Proje toplantısı #{i}', row_body,
+            sender[0], sender[1], 'EX' if sender[1].startswith('/O=') else 'SMTP',
+            to[0], to[1], 'SMTP',
+            cc[0], cc[1], 'SMTP' if cc[1] else '',
+            bcc[0], bcc[1], 'SMTP' if bcc[1] else '',
+            '', '', 'Normal'
+        ]
+
+def generate_outlook_csv(path, rows, seed=0, people_count=None, body_size=2000):
+    """Sentetik bir Outlook CSV dosyası yazar (UTF-8, BOM'lu)"""
+    with open(path, 'w', encoding='utf-8-sig', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(OUTLOOK_HEADERS)
+        writer.writerows(generate_rows(rows, seed=seed, people_count=people_count, body_size=body_size))
+    return path
+
+def generate_airtable_csv(path, rows, seed=0):
+    """Sentetik bir Airtable CSV dışa aktarımı yazar"""
+    rnd = random.Random(seed)
+    people = make_people(rows, rnd)
+    with open(path, 'w', encoding='utf-8-sig', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(AIRTABLE_HEADERS)
+        for name, email in people:
+            writer.writerow([name, email, email.split('@')[1], 'Toplantı notu\nİkinci satır' if rnd.random() < 0.2 else ''])
+    return path
+
+def parse_size(value):
+    """'10k', '100k', '1M' veya düz sayıyı satır sayısına çevirir"""
+    return SIZES.get(value) or int(value)
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+    rows = parse_size(sys.argv[1])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    generate_outlook_csv(sys.argv[2], rows, seed=seed)
+    print(f'{rows} satır yazıldı: {sys.argv[2]}')
@@ -0,0 +1,146 @@
+"""Büyük yüklemeler işlenirken /health gecikmesini ölçen yük testi
+
+gunicorn, Procfile'daki gevent ayarlarıyla ve tek işçiyle başlatılır. Aynı
+anda birkaç büyük sentetik Outlook CSV'si /process'e yüklenir ve bu sürede
+/health düzenli aralıklarla sorgulanır. Test önce istek içinde işleme
+(EXPORT_PROCESSES=0), sonra süreç havuzuyla çalıştırılır ve iki durumdaki
+/health gecikmeleri (p50, p99, en yüksek) karşılaştırılır.
+
+Kullanım: python benchmarks/load_test_health.py [--rows 10k] [--uploads 4] [--processes 2]
+"""
+import argparse
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+from generate_outlook_csv import generate_outlook_csv, parse_size
+
+# gunicorn yerel istemciden gelen bu başlıkla isteği HTTPS sayar (uygulama HTTP'yi yönlendirir)
+HEADERS = {'X-Forwarded-Proto': 'https'}
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def request(port, method, path, body=None, headers=None, timeout=600):
+    """İsteği gönderir; (durum kodu, süre) döndürür"""
+    start = time.perf_counter()
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+    try:
+        connection.request(method, path, body=body, headers={**HEADERS, **(headers or {})})
+        response = connection.getresponse()
+        response.read()
+        return response.status, time.perf_counter() - start
+    finally:
+        connection.close()
+
+def multipart_body(csv_path):
+    """Tek dosyalık multipart/form-data gövdesi ve içerik türü"""
+    boundary = uuid.uuid4().hex
+    with open(csv_path, 'rb') as file:
+        content = file.read()
+    body = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="outlook.csv"\r\n'
+        f'Content-Type: text/csv\r\n\r\n'
+    ).encode() + content + f'\r\n--{boundary}--\r\n'.encode()
+    return body, f'multipart/form-data; boundary={boundary}'
+
+def start_server(port, processes):
+    # Sonuç önbelleği kapalı: ikinci aşama ilk aşamanın önbelleğe aldığı çıktıyı sunmamalı
+    env = dict(os.environ, EXPORT_PROCESSES=str(processes), RESULT_CACHE_BYTES='0')
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'app:app', '--bind', f'127.0.0.1:{port}', '--workers', '1',
+         '--worker-class', 'gevent', '--worker-connections', '1000', '--timeout', '300', '--log-level', 'warning'],
+        cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if request(port, 'GET', '/health', timeout=2)[0] == 200:
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError('gunicorn başlatılamadı')
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+def run(csv_path, uploads, processes, interval):
+    """Yüklemeler sürerken /health gecikmelerini ve yükleme sürelerini ölçer"""
+    port = free_port()
+    server = start_server(port, processes)
+    body, content_type = multipart_body(csv_path)
+    health = []
+    upload_results = []
+    done = threading.Event()
+
+    def poll_health():
+        while not done.is_set():
+            health.append(request(port, 'GET', '/health')[1])
+            time.sleep(interval)
+
+    def upload():
+        upload_results.append(request(port, 'POST', '/process', body, {'Content-Type': content_type}))
+
+    try:
+        poller = threading.Thread(target=poll_health)
+        poller.start()
+        threads = [threading.Thread(target=upload) for _ in range(uploads)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        done.set()
+        poller.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    statuses = sorted({status for status, _ in upload_results})
+    return {
+        'health_p50': percentile(health, 0.5),
+        'health_p99': percentile(health, 0.99),
+        'health_max': max(health),
+        'health_count': len(health),
+        'uploads_seconds': elapsed,
+        'statuses': statuses
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', default='10k', help='Yükleme başına satır sayısı: 10k, 100k, 1M veya sayı')
+    parser.add_argument('--uploads', type=int, default=4, help='Eşzamanlı yükleme sayısı')
+    parser.add_argument('--processes', type=int, default=2, help='Süreç havuzu boyutu (EXPORT_PROCESSES)')
+    parser.add_argument('--interval', type=float, default=0.05, help='/health sorguları arası bekleme (sn)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = generate_outlook_csv(os.path.join(work_dir, 'outlook.csv'), parse_size(args.rows))
+        size_mb = os.path.getsize(csv_path) / (1024 * 1024)
+        print(f'{args.uploads} eşzamanlı yükleme, her biri {size_mb:.1f} MB')
+
+        print(f'\n{"Kip":<22} {"p50 (ms)":>9} {"p99 (ms)":>9} {"En yüksek":>10} {"Sorgu":>6} {"Yükleme (sn)":>13}  Durum')
+        for label, processes in (('İstek içinde', 0), (f'Süreç havuzu ({args.processes})', args.processes)):
+            result = run(csv_path, args.uploads, processes, args.interval)
+            print(
+                f'{label:<22} {result["health_p50"] * 1000:9.1f} {result["health_p99"] * 1000:9.1f} '
+                f'{result["health_max"] * 1000:10.1f} {result["health_count"]:6d} {result["uploads_seconds"]:13.1f}  '
+                f'{result["statuses"]}'
+            )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""find_emails aşamalarını ve uygulama uç noktalarını sentetik verilerle ölçer
+
+Her find_emails aşama fonksiyonu dosyadaki tüm adres hücreleri üzerinde,
+/process, /merge_excel, /process_airtable ve /compare_merge uç noktaları da
+Flask test istemcisi üzerinden uçtan uca ölçülür. Sonuçlar kayıtlı temel
+(baseline) sonuçlarla karşılaştırılır; tolerans aşılırsa çıkış kodu 1 olur.
+
+Kullanım:
+    python benchmarks/run_benchmarks.py [--rows 10k] [--repeat 3]
+    python benchmarks/run_benchmarks.py --save-baseline
+"""
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import pandas as pd
+
+import find_emails
+from generate_outlook_csv import generate_airtable_csv, generate_outlook_csv, parse_size
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+
+def best_time(func, repeat):
+    """Fonksiyonu repeat kez çalıştırıp en kısa süreyi döndürür"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def load_cells(csv_path):
+    """Dosyadaki tüm (adres, isim) hücre çiftlerini okur"""
+    cells = []
+    with open(csv_path, 'r', encoding='utf-8-sig') as file:
+        reader = csv.reader(file)
+        projection = find_emails.resolve_outlook_columns(next(reader))
+        for row in reader:
+            for _, email_index, name_index in projection:
+                cells.append((row[email_index].strip(), row[name_index].strip()))
+    return cells
+
+def bench_stages(csv_path, repeat):
+    """find_emails aşama fonksiyonlarını ölçer"""
+    cells = load_cells(csv_path)
+    email_cells = [email for email, _ in cells if email]
+    name_cells = [name for _, name in cells if name]
+    cleaned = [find_emails.clean_email_text(email) for email in email_cells]
+    formatted = [find_emails.format_name(name) for name in name_cells]
+
+    stages = {
+        'stage.is_system_info': lambda: [find_emails.is_system_info(text) for text in email_cells],
+        'stage.clean_email_text': lambda: [find_emails.clean_email_text(text) for text in email_cells],
+        'stage.extract_emails_from_text': lambda: [find_emails.extract_emails_from_text(text) for text in cleaned],
+        'stage.format_name': lambda: [find_emails.format_name(text) for text in name_cells],
+        'stage.split_names': lambda: [find_emails.split_names(text) for text in formatted],
+        'stage.extract_cell_pairs': lambda: [find_emails.extract_cell_pairs(email, name) for email, name in cells],
+    }
+    results = {name: best_time(func, repeat) for name, func in stages.items()}
+    for backend in find_emails.BACKENDS:
+        results[f'file.{backend}'] = best_time(
+            lambda: find_emails.find_categorized_emails_in_file(csv_path, backend=backend), repeat
+        )
+    return results
+
+def post(client, url, files, data=None):
+    """Test istemcisiyle çok parçalı form gönderir ve başarılı yanıtı doğrular"""
+    form = dict(data or {})
+    for field, paths in files.items():
+        form[field] = [(open(path, 'rb'), os.path.basename(path)) for path in paths]
+        if len(paths) == 1:
+            form[field] = form[field][0]
+    response = client.post(url, data=form, base_url='https://localhost')
+    if response.status_code != 200:
+        raise RuntimeError(f'{url} {response.status_code}: {response.get_data(as_text=True)[:200]}')
+    return response.get_data()
+
+def bench_endpoints(csv_path, airtable_path, work_dir, repeat):
+    """Uç noktaları Flask test istemcisi üzerinden uçtan uca ölçer"""
+    # Sonuç önbelleği kapalı: tekrarlanan ölçümler önbellekten sunulmamalı
+    os.environ['RESULT_CACHE_BYTES'] = '0'
+    import app as app_module
+
+    client = app_module.app.test_client()
+    results = {}
+
+    output = {}
+    def process():
+        output['xlsx'] = post(client, '/process', {'file': [csv_path]}, {'excel_name': 'bench'})
+    results['endpoint./process'] = best_time(process, repeat)
+
+    # /process çıktısını ikiye bölerek birleştirme girdileri hazırlanır
+    contacts = pd.read_excel(io.BytesIO(output['xlsx']))
+    half = len(contacts) // 2
+    part1 = os.path.join(work_dir, 'part1.xlsx')
+    part2 = os.path.join(work_dir, 'part2.xlsx')
+    contacts.iloc[:half + half // 2].to_excel(part1, index=False)
+    contacts.iloc[half // 2:].to_excel(part2, index=False)
+
+    results['endpoint./merge_excel'] = best_time(
+        lambda: post(client, '/merge_excel', {'files': [part1, part2]}, {'excel_name': 'bench'}), repeat
+    )
+    results['endpoint./process_airtable'] = best_time(
+        lambda: post(client, '/process_airtable', {'file': [airtable_path]}, {'excel_name': 'bench'}), repeat
+    )
+    results['endpoint./compare_merge'] = best_time(
+        lambda: post(client, '/compare_merge', {'file1': [part1], 'file2': [part2]}, {'excel_name': 'bench'}), repeat
+    )
+    return results
+
+def compare(results, baseline, tolerance):
+    """Sonuçları temel sonuçlarla karşılaştırır; yavaşlayan ölçüm sayısını döndürür"""
+    regressions = 0
+    print(f'\n{"Ölçüm":<34} {"Süre (sn)":>10} {"Temel (sn)":>11} {"Oran":>7}')
+    for name, seconds in results.items():
+        reference = baseline.get('results', {}).get(name)
+        if reference:
+            ratio = seconds / reference
+            flag = ''
+            if ratio > 1 + tolerance:
+                flag = '  YAVAŞLAMA'
+                regressions += 1
+            print(f'{name:<34} {seconds:10.3f} {reference:11.3f} {ratio:7.2f}{flag}')
+        else:
+            print(f'{name:<34} {seconds:10.3f} {"-":>11} {"-":>7}')
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', default='10k', help="Satır sayısı: 10k, 100k, 1M veya sayı")
+    parser.add_argument('--repeat', type=int, default=3, help='Her ölçümün tekrar sayısı (en iyisi alınır)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Temel sonuç dosyası')
+    parser.add_argument('--save-baseline', action='store_true', help='Sonuçları temel sonuç olarak kaydet')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='İzin verilen yavaşlama oranı')
+    parser.add_argument('--skip-endpoints', action='store_true', help='Uç nokta ölçümlerini atla')
+    args = parser.parse_args()
+
+    rows = parse_size(args.rows)
+    # Ölçümlere günlük yazma maliyeti karışmasın
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = generate_outlook_csv(os.path.join(work_dir, 'outlook.csv'), rows)
+        airtable_path = generate_airtable_csv(os.path.join(work_dir, 'airtable.csv'), max(rows // 10, 100))
+        size_mb = os.path.getsize(csv_path) / (1024 * 1024)
+        print(f'Sentetik Outlook dosyası: {rows} satır, {size_mb:.1f} MB')
+
+        results = bench_stages(csv_path, args.repeat)
+        if not args.skip_endpoints:
+            results.update(bench_endpoints(csv_path, airtable_path, work_dir, args.repeat))
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        if baseline.get('rows') != rows:
+            print(f'Uyarı: temel sonuçlar {baseline.get("rows")} satır için kaydedilmiş')
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump({
+                'rows': rows,
+                'repeat': args.repeat,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'cpu_count': os.cpu_count(),
+                'results': {name: round(seconds, 4) for name, seconds in results.items()}
+            }, file, indent=2, ensure_ascii=False)
+            file.write('\n')
+        print(f'\nTemel sonuçlar kaydedildi: {args.baseline}')
+    elif regressions:
+        print(f'\n{regressions} ölçümde yavaşlama var')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""Ardışık posta kutusu dışa aktarımları için kalıcı kişi dizini (SQLite)
+
+Her içe aktarmada CSV satırlarının parmak izleri (tüm hücrelerin 64 bitlik
+BLAKE2b özeti) saklanır. Sonraki dışa aktarımda parmak izi bilinen satırlar
+ayrıştırılmadan atlanır; aylık tam dışa aktarımın maliyeti yalnızca yeni
+satırları kadardır. Gelen satırların izleri gruplar halinde birincil
+anahtardan sorgulanır; saklanan izlerin tamamı belleğe alınmaz. Kişiler normalleştirilmiş (casefold) adrese göre tutulur;
+ilk ve son görüldükleri içe aktarma zamanı, kategori ve isim kaydedilir.
+
+İçe aktarma tek bir yazma işleminde (BEGIN IMMEDIATE) yapılır; aynı dizine
+aynı anda yazmak isteyen işçiler sırayla bekler, okuyucular (WAL) beklemez.
+"""
+import datetime
+import hashlib
+import logging
+import os
+import sqlite3
+from contextlib import closing
+
+from find_emails import iter_categorized_emails, iter_unique_emails, CATEGORIES, DEFAULT_CELL_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Aynı dizine yazan başka bir içe aktarmanın en uzun bekleme süresi (gunicorn zaman aşımı)
+LOCK_TIMEOUT = 300
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS imports (
+    id INTEGER PRIMARY KEY,
+    source_name TEXT,
+    imported_at TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    new_rows INTEGER NOT NULL,
+    new_contacts INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ingested_rows (
+    fingerprint INTEGER PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    email_key TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL,
+    category TEXT NOT NULL,
+    name TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    first_import INTEGER NOT NULL REFERENCES imports(id),
+    last_import INTEGER NOT NULL REFERENCES imports(id)
+);
+CREATE INDEX IF NOT EXISTS contacts_first_import ON contacts(first_import);
+'''
+
+# Kişiler kategori sırasıyla (Kimden, Kime, Bilgi, Gizli), sonra ilk görülme sırasıyla listelenir
+_CATEGORY_ORDER = 'CASE category ' + ' '.join(
+    f"WHEN '{category}' THEN {index}" for index, category in enumerate(CATEGORIES)
+) + ' END'
+
+def row_fingerprint(row):
+    """CSV satırının (hücre listesi) 64 bitlik işaretli tamsayı parmak izi"""
+    digest = hashlib.blake2b('\x1f'.join(row).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+class ContactStore:
+    """Normalleştirilmiş e-posta adresine göre dizinlenmiş kalıcı kişi listesi"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(SCHEMA)
+
+    def _connect(self):
+        # isolation_level=None: işlemler açıkça BEGIN/COMMIT ile yönetilir
+        return closing(sqlite3.connect(self.path, timeout=LOCK_TIMEOUT, isolation_level=None))
+
+    def ingest(self, stream, source_name, dedup_key='exact', cache_size=DEFAULT_CELL_CACHE_SIZE, stats=None):
+        """Outlook CSV akışındaki yeni satırları ayrıştırıp dizine ekler; içe aktarma kimliğini döndürür
+
+        Daha önce içe aktarılmış satırlar atlanır. stats sözlüğü verilirse
+        okunan satır sayısı 'rows', ayrıştırılan yeni satır sayısı 'new_rows'
+        ve ilk kez görülen kişi sayısı 'new_contacts' anahtarlarına yazılır.
+        """
+        if stats is None:
+            stats = {}
+        stats['rows'] = 0
+        now = datetime.datetime.now().isoformat(sep=' ', timespec='seconds')
+
+        with self._connect() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                # Bu içe aktarmadaki yeni izler; aynı dosyadaki tekrarlı satırlar da bununla atlanır
+                new_fingerprints = set()
+
+                def new_rows(rows):
+                    fingerprints = [row_fingerprint(row) for row in rows]
+                    unique = list(set(fingerprints))
+                    placeholders = ', '.join('?' * len(unique))
+                    stored = {fingerprint for fingerprint, in connection.execute(
+                        f'SELECT fingerprint FROM ingested_rows WHERE fingerprint IN ({placeholders})', unique)}
+                    keep = []
+                    for fingerprint in fingerprints:
+                        is_new = fingerprint not in stored and fingerprint not in new_fingerprints
+                        if is_new:
+                            new_fingerprints.add(fingerprint)
+                        keep.append(is_new)
+                    return keep
+
+                categorized_data = {category: [] for category in CATEGORIES}
+                for category, data in iter_categorized_emails(stream, dedup_key=dedup_key, stats=stats,
+                                                              cache_size=cache_size, row_filter=new_rows):
+                    categorized_data[category].append(data)
+
+                import_id = connection.execute(
+                    'INSERT INTO imports (source_name, imported_at, rows, new_rows, new_contacts) VALUES (?, ?, ?, ?, 0)',
+                    (source_name, now, stats['rows'], len(new_fingerprints))
+                ).lastrowid
+                connection.executemany('INSERT INTO ingested_rows (fingerprint) VALUES (?)',
+                                       ((fingerprint,) for fingerprint in new_fingerprints))
+                # Var olan kişilerde yalnızca son görülme güncellenir; kategori ve isim ilk görülmedeki gibi kalır
+                connection.executemany(
+                    '''INSERT INTO contacts (email_key, email, category, name, first_seen, last_seen,
+                                             first_import, last_import)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(email_key) DO UPDATE SET last_seen = excluded.last_seen,
+                                                            last_import = excluded.last_import''',
+                    (
+                        (data['email'].casefold(), data['email'], category, data['name'], now, now,
+                         import_id, import_id)
+                        for category, data in iter_unique_emails(categorized_data, dedup_key=dedup_key)
+                    )
+                )
+                new_contacts, = connection.execute('SELECT COUNT(*) FROM contacts WHERE first_import = ?',
+                                                   (import_id,)).fetchone()
+                connection.execute('UPDATE imports SET new_contacts = ? WHERE id = ?', (new_contacts, import_id))
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+
+        stats['new_rows'] = len(new_fingerprints)
+        stats['new_contacts'] = new_contacts
+        logger.info(
+            f'Kişi dizini: {source_name} içe aktarıldı; {stats["rows"]} satırdan {len(new_fingerprints)} yeni, '
+            f'{new_contacts} yeni kişi'
+        )
+        return import_id
+
+    def iter_contacts(self, import_id=None):
+        """Kişileri (kategori, e-posta, isim, ilk görülme, son görülme) olarak döndürür
+
+        import_id verilirse yalnızca o içe aktarmada ilk kez görülen kişiler döner.
+        """
+        query = 'SELECT category, email, name, first_seen, last_seen FROM contacts'
+        params = ()
+        if import_id is not None:
+            query += ' WHERE first_import = ?'
+            params = (import_id,)
+        with self._connect() as connection:
+            yield from connection.execute(f'{query} ORDER BY {_CATEGORY_ORDER}, id', params)
@@ -0,0 +1,213 @@
+"""Kişi listesi (Excel) tablolarını e-posta adresine göre birleştirme ve karşılaştırma yardımcıları"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Birleştirilmiş listede normalleştirilmiş e-posta sütunu
+EMAIL_COLUMN = 'E-posta Adresi'
+# Satırın geldiği dosya ve o dosyadaki Excel satır numarası
+SOURCE_FILE_COLUMN = 'Kaynak Dosya'
+SOURCE_ROW_COLUMN = 'Kaynak Satır'
+# Başlık adında bu ifadelerden biri geçen ilk sütun e-posta sütunu kabul edilir
+EMAIL_COLUMN_HINTS = ('e-posta', 'mail', 'email')
+
+def find_email_column(columns):
+    """Başlıklar arasından e-posta sütununu bulur, yoksa None döndürür"""
+    for column in columns:
+        name = str(column).lower()
+        if any(hint in name for hint in EMAIL_COLUMN_HINTS):
+            return column
+    return None
+
+def normalize_emails(values):
+    """E-posta sütununu karşılaştırma için boşluklardan arındırıp küçük harfe çevirir"""
+    return values.astype(str).str.strip().str.lower()
+
+def _keep_source(part, df):
+    """Önceki birleştirme çıktısından gelen satırların kaynak dosya ve satır numarasını korur"""
+    files = df[SOURCE_FILE_COLUMN]
+    rows = pd.to_numeric(df[SOURCE_ROW_COLUMN], errors='coerce')
+    known = (files.notna() & (files.astype(str).str.strip() != '') & rows.notna()).to_numpy()
+    if known.any():
+        part.loc[known, SOURCE_FILE_COLUMN] = files.to_numpy()[known]
+        part.loc[known, SOURCE_ROW_COLUMN] = rows.to_numpy()[known].astype('int64')
+
+def merge_contact_frames(frames):
+    """(kaynak adı, DataFrame) çiftlerini e-posta adresine göre tekilleştirerek birleştirir
+
+    Her adresin ilk görüldüğü satır (dosya sırası, sonra satır sırası) tutulur.
+    E-posta sütunu normalleştirilmiş haliyle 'E-posta Adresi' olarak başa,
+    diğer sütunlar ilk görülme sırasıyla arkasına, kaynak dosya adı ve Excel
+    satır numarası en sona yazılır. Girdi önceki bir birleştirmenin çıktısıysa
+    satırların kaynak bilgisi korunur. Yalnızca en az bir satırı kalan
+    dosyaların sütunları sonuca girer. '@' içermeyen adresler atlanır.
+    """
+    parts = []
+    source_columns = []
+    for source_index, (source_name, df) in enumerate(frames):
+        email_column = find_email_column(df.columns)
+        if email_column is None:
+            logger.warning(f'{source_name} dosyasında e-posta sütunu bulunamadı')
+            continue
+
+        emails = normalize_emails(df[email_column])
+        # Aynı adlı başka bir sütun normalleştirilmiş adresin ya da kaynak sütunlarının üzerine yazılmasın
+        other_columns = [column for column in df.columns
+                         if column not in (email_column, EMAIL_COLUMN, SOURCE_FILE_COLUMN, SOURCE_ROW_COLUMN)]
+        part = df[other_columns].copy()
+        part.insert(0, EMAIL_COLUMN, emails)
+        part[SOURCE_FILE_COLUMN] = source_name
+        # Başlık satırı 1. satır olduğundan veri satırları 2'den başlar
+        part[SOURCE_ROW_COLUMN] = range(2, len(df) + 2)
+        if SOURCE_FILE_COLUMN in df.columns and SOURCE_ROW_COLUMN in df.columns:
+            _keep_source(part, df)
+        part['_source_index'] = source_index
+        parts.append(part[emails.str.contains('@', regex=False).to_numpy()])
+        source_columns.append((source_index, other_columns))
+
+    if not parts:
+        return pd.DataFrame(columns=[EMAIL_COLUMN, SOURCE_FILE_COLUMN, SOURCE_ROW_COLUMN])
+
+    merged = pd.concat(parts, ignore_index=True, sort=False)
+    merged = merged.drop_duplicates(subset=EMAIL_COLUMN, keep='first')
+
+    # Sütunlar yalnızca satırı kalan dosyalardan, ilk görülme sırasıyla alınır
+    contributing = set(merged['_source_index'].unique())
+    columns = [EMAIL_COLUMN]
+    for source_index, other_columns in source_columns:
+        if source_index not in contributing:
+            continue
+        for column in other_columns:
+            if column not in columns:
+                columns.append(column)
+    columns += [SOURCE_FILE_COLUMN, SOURCE_ROW_COLUMN]
+    return merged[columns].reset_index(drop=True)
+
+# Karşılaştırma çıktısının sayfa adları
+SUMMARY_SHEET = 'Özet'
+ONLY_IN_FIRST_SHEET = 'Sadece Dosya 1'
+ONLY_IN_SECOND_SHEET = 'Sadece Dosya 2'
+IN_BOTH_SHEET = 'Her İkisinde'
+# Her iki dosyada bulunan kişilerde değeri farklı olan ortak sütunlar
+DIFFERENCES_COLUMN = 'Farklı Alanlar'
+COMPARE_SUFFIXES = (' (Dosya 1)', ' (Dosya 2)')
+
+def _valid_contacts(source_name, df):
+    """E-posta sütunu normalleştirilip başa alınmış, '@' içermeyen adresleri atılmış tablo
+
+    (tablo, geçersiz adres sayısı) döndürür.
+    """
+    email_column = find_email_column(df.columns)
+    if email_column is None:
+        raise ValueError(f'{source_name} dosyasında e-posta sütunu bulunamadı')
+
+    emails = normalize_emails(df[email_column])
+    other_columns = [column for column in df.columns if column not in (email_column, EMAIL_COLUMN)]
+    part = df[other_columns].copy()
+    part.insert(0, EMAIL_COLUMN, emails)
+    valid = np.fromiter(('@' in email for email in emails), dtype=bool, count=len(emails))
+    return part[valid].reset_index(drop=True), int((~valid).sum())
+
+def _first_rows(codes):
+    """Her adres kodunun ilk görüldüğü satırların (sıralı) indeksleri"""
+    _, first = np.unique(codes, return_index=True)
+    first.sort()
+    return first
+
+def _comparable(values):
+    """Alan değerlerini karşılaştırma için metne çevirir (boşlar '', tam sayı değerli ondalıklar tam sayı)"""
+    # Boş hücre içeren tam sayı sütunları Excel'den ondalık olarak okunur (5 ile 5.0 aynı sayılır);
+    # int64 aralığı dışındaki değerleri olan sütunlar ondalık olarak karşılaştırılır
+    if pd.api.types.is_float_dtype(values):
+        present = values.dropna()
+        if ((present % 1 == 0) & (present.abs() < 2 ** 63)).all():
+            values = values.astype('Int64')
+    return values.astype(str).where(values.notna().to_numpy(), '').str.strip()
+
+def _changed_values(first_values, second_values):
+    """İki sütunun satır satır farklı olup olmadığını döndürür"""
+    # Ham değerleri aynı olanlar eşittir; yalnızca kalanlar metne çevrilip karşılaştırılır
+    candidates = np.flatnonzero(~((first_values.to_numpy() == second_values.to_numpy())
+                                  | (first_values.isna().to_numpy() & second_values.isna().to_numpy())))
+    changed = np.zeros(len(first_values), dtype=bool)
+    if candidates.size:
+        changed[candidates] = (_comparable(first_values.iloc[candidates]).to_numpy()
+                               != _comparable(second_values.iloc[candidates]).to_numpy())
+    return changed
+
+def compare_contact_frames(first, second):
+    """İki (kaynak adı, DataFrame) kişi listesini normalleştirilmiş e-posta adresine göre karşılaştırır
+
+    Sayfa adı -> DataFrame sözlüğü döndürür: özet sayıları, yalnızca birinci
+    dosyada, yalnızca ikinci dosyada ve her ikisinde bulunan kişiler. Her
+    ikisinde bulunanlarda ortak sütunlar yan yana '(Dosya 1)' ve '(Dosya 2)'
+    ekleriyle yazılır; değeri farklı olan sütunlar 'Farklı Alanlar' sütununda
+    listelenir. Her dosyada bir adresin ilk satırı kullanılır.
+    """
+    (first_name, first_df), (second_name, second_df) = first, second
+    left, left_invalid = _valid_contacts(first_name, first_df)
+    right, right_invalid = _valid_contacts(second_name, second_df)
+
+    # Adresler iki dosya için birlikte tam sayı kodlara çevrilir; eşleme kodlar üzerinden yapılır
+    codes, uniques = pd.factorize(np.concatenate([left[EMAIL_COLUMN].to_numpy(), right[EMAIL_COLUMN].to_numpy()]))
+    left_codes, right_codes = codes[:len(left)], codes[len(left):]
+    left_rows, right_rows = _first_rows(left_codes), _first_rows(right_codes)
+    left_duplicates, right_duplicates = len(left) - len(left_rows), len(right) - len(right_rows)
+    left, left_codes = left.iloc[left_rows].reset_index(drop=True), left_codes[left_rows]
+    right, right_codes = right.iloc[right_rows].reset_index(drop=True), right_codes[right_rows]
+
+    right_position = np.full(len(uniques), -1)
+    right_position[right_codes] = np.arange(len(right))
+    matches = right_position[left_codes]
+    in_right = matches >= 0
+    in_left = np.zeros(len(uniques), dtype=bool)
+    in_left[left_codes] = True
+    in_left = in_left[right_codes]
+
+    # Ortak adresler birinci dosyadaki sırayla yan yana getirilir
+    both_left = left[in_right].reset_index(drop=True)
+    both_right = right.iloc[matches[in_right]].reset_index(drop=True)
+    common_columns = [column for column in left.columns[1:] if column in right.columns]
+    differences = np.full(len(both_left), '', dtype=object)
+    columns = {EMAIL_COLUMN: both_left[EMAIL_COLUMN], DIFFERENCES_COLUMN: None}
+    for column in common_columns:
+        # Başlıklar metin olmayabilir (sayı ya da boş hücre)
+        columns[f'{column}{COMPARE_SUFFIXES[0]}'] = both_left[column]
+        columns[f'{column}{COMPARE_SUFFIXES[1]}'] = both_right[column]
+        differences = differences + np.where(_changed_values(both_left[column], both_right[column]), f'{column}, ', '')
+    for table in (both_left, both_right):
+        for column in table.columns[1:]:
+            if column not in common_columns:
+                columns[column] = table[column]
+    columns[DIFFERENCES_COLUMN] = pd.Series(differences, dtype=object).str.slice(stop=-2)
+    both = pd.DataFrame(columns)
+
+    changed = int((both[DIFFERENCES_COLUMN] != '').sum())
+    only_left, only_right = int((~in_right).sum()), int((~in_left).sum())
+    summary = pd.DataFrame([
+        ('Dosya 1', first_name),
+        ('Dosya 2', second_name),
+        ('Dosya 1 satır sayısı', len(first_df)),
+        ('Dosya 2 satır sayısı', len(second_df)),
+        ('Dosya 1 geçersiz adres', left_invalid),
+        ('Dosya 2 geçersiz adres', right_invalid),
+        ('Dosya 1 tekrar eden adres', left_duplicates),
+        ('Dosya 2 tekrar eden adres', right_duplicates),
+        ('Sadece Dosya 1', only_left),
+        ('Sadece Dosya 2', only_right),
+        ('Her İkisinde', len(both)),
+        ('Her İkisinde (alanları farklı)', changed),
+        ('Her İkisinde (alanları aynı)', len(both) - changed)
+    ], columns=['Ölçüt', 'Değer'])
+
+    logger.info(f'Karşılaştırma: {only_left} sadece dosya 1, {only_right} sadece dosya 2, '
+                f'{len(both)} her ikisinde ({changed} farklı)')
+    return {
+        SUMMARY_SHEET: summary,
+        ONLY_IN_FIRST_SHEET: left[~in_right].reset_index(drop=True),
+        ONLY_IN_SECOND_SHEET: right[~in_left].reset_index(drop=True),
+        IN_BOTH_SHEET: both
+    }
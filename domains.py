@@ -0,0 +1,184 @@
+"""Public Suffix List ile e-posta adreslerinden kayıt edilebilir alan adı ve firma adı çıkarma
+
+Firma adı, adresin kayıt edilebilir alan adının (public suffix + bir etiket)
+ilk etiketidir: mail.firma.com.tr -> firma.com.tr -> firma. Kurallar
+depoyla birlikte gelen public_suffix_list.dat dosyasından (MPL-2.0,
+https://publicsuffix.org) süreç başına bir kez okunur ve ters etiket
+ağacına (trie) yerleştirilir; ağ erişimi gerekmez. Dosya yolu
+PUBLIC_SUFFIX_LIST ortam değişkeniyle değiştirilebilir.
+
+Varsayılan olarak yalnızca ICANN bölümü kullanılır; özel bölümdeki
+(blogspot.com, github.io gibi) barındırma alanları e-posta adreslerinde
+firma adı vermediği için atlanır.
+
+Toplu kullanımda (registrable_domains) alan adları tek bir Python geçişiyle
+ayrılır, benzersiz alan adları pd.factorize ile bulunur ve yalnızca bunlar
+ağaçta aranır; sonuçlar satırlara numpy dizin işlemiyle dağıtılır. Adres
+listelerinde alan adları yoğun tekrarlandığı için 1M adres yaklaşık bir
+saniyede işlenir. /process çıktıları firma adlarını bu yolla hesaplar.
+"""
+import logging
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_SUFFIX_LIST = os.environ.get(
+    'PUBLIC_SUFFIX_LIST', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'public_suffix_list.dat')
+)
+# Liste dosyası bulunamazsa kullanılan kısa kural listesi
+FALLBACK_RULES = (
+    'com', 'net', 'org', 'edu', 'gov', 'info', 'biz', 'io', 'co', 'tr', 'uk', 'de', 'fr', 'nl', 'eu', 'us',
+    'com.tr', 'net.tr', 'org.tr', 'gov.tr', 'edu.tr', 'k12.tr', 'bel.tr', 'gen.tr', 'av.tr', 'biz.tr',
+    'info.tr', 'web.tr', 'tv.tr', 'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'com.au', 'net.au', 'co.jp'
+)
+DOMAIN_CACHE_SIZE = 65536
+
+# Ağaç düğümlerindeki işaret anahtarları; alan adı etiketi olamazlar
+_RULE = '\x00kural'
+_EXCEPTION = '\x00istisna'
+
+class PublicSuffixTrie:
+    """Public suffix kurallarının sağdan sola etiket ağacı
+
+    Kural türleri: normal (com.tr), joker (*.bd) ve istisna (!www.ck).
+    Hiçbir kurala uymayan alan adlarında son etiket public suffix sayılır.
+    """
+
+    def __init__(self, rules):
+        self._root = {}
+        for rule in rules:
+            self.add_rule(rule)
+
+    def add_rule(self, rule):
+        rule = rule.strip().lower()
+        if not rule:
+            return
+        flag = _RULE
+        if rule.startswith('!'):
+            flag = _EXCEPTION
+            rule = rule[1:]
+        for form in _rule_forms(rule):
+            node = self._root
+            for label in reversed(form.split('.')):
+                node = node.setdefault(label, {})
+            node[flag] = True
+
+    @classmethod
+    def from_file(cls, path, include_private=False):
+        """public_suffix_list.dat biçimindeki dosyadan ağacı kurar"""
+        rules = []
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                line = line.strip()
+                if line.startswith('// ===BEGIN PRIVATE DOMAINS===') and not include_private:
+                    break
+                if line and not line.startswith('//'):
+                    # Satırdaki ilk boşluktan sonrası yok sayılır
+                    rules.append(line.split()[0])
+        return cls(rules)
+
+    def suffix_length(self, labels):
+        """Küçük harfli etiket listesinin sonundaki public suffix'in etiket sayısı"""
+        # Varsayılan kural '*': en az son etiket
+        length = 1
+        node = self._root
+        for depth, label in enumerate(reversed(labels), 1):
+            wildcard = node.get('*')
+            if wildcard is not None and _RULE in wildcard:
+                length = depth
+            child = node.get(label)
+            if child is None:
+                break
+            if _EXCEPTION in child:
+                # İstisna kuralı: suffix bir üst etikettir
+                return depth - 1
+            if _RULE in child:
+                length = depth
+            node = child
+        return length
+
+    def split_domain(self, domain):
+        """Alan adını (kayıt edilebilir alan adı, firma etiketi) olarak döndürür
+
+        Alan adı kendisi bir public suffix ise (örn. com.tr) kayıt edilebilir
+        alan adı None, firma etiketi ilk etikettir. Harf büyüklüğü korunur.
+        """
+        labels = domain.strip().rstrip('.').split('.')
+        suffix = self.suffix_length([label.lower() for label in labels])
+        if len(labels) <= suffix:
+            return None, labels[0]
+        return '.'.join(labels[-suffix - 1:]), labels[-suffix - 1]
+
+def _rule_forms(rule):
+    """Kuralın kendisi ve Unicode ise punycode (xn--) biçimi"""
+    forms = [rule]
+    if not rule.isascii():
+        try:
+            forms.append('.'.join(
+                label if label == '*' else label.encode('idna').decode('ascii') for label in rule.split('.')
+            ))
+        except UnicodeError:
+            pass
+    return forms
+
+@lru_cache(maxsize=None)
+def load_public_suffixes(path=None, include_private=False):
+    """Kural ağacını bir kez kurar; dosya okunamazsa kısa yedek listeyi kullanır"""
+    path = path or PUBLIC_SUFFIX_LIST
+    try:
+        return PublicSuffixTrie.from_file(path, include_private=include_private)
+    except OSError as e:
+        logger.warning(f'Public Suffix List okunamadı ({str(e)}), yedek kural listesi kullanılıyor')
+        return PublicSuffixTrie(FALLBACK_RULES)
+
+@lru_cache(maxsize=DOMAIN_CACHE_SIZE)
+def split_domain(domain):
+    """Alan adını (kayıt edilebilir alan adı, firma etiketi) olarak döndürür"""
+    return load_public_suffixes().split_domain(domain)
+
+def registrable_domain(email):
+    """E-posta adresinin kayıt edilebilir alan adı (mail.firma.com.tr -> firma.com.tr); yoksa ''"""
+    _, _, domain = email.rpartition('@')
+    if not domain:
+        return ''
+    return split_domain(domain)[0] or ''
+
+def company_name(email):
+    """E-posta adresinin firma adı (kayıt edilebilir alan adının ilk etiketi); @ yoksa ''"""
+    if '@' not in email:
+        return ''
+    return split_domain(email.rpartition('@')[2])[1]
+
+def registrable_domains(emails):
+    """E-posta adreslerini toplu olarak işler
+
+    'Alan Adı', 'Kayıt Edilebilir Alan Adı' ve 'Firma Adı' sütunlu bir
+    DataFrame döndürür (dizin emails ile aynı). Alan adları adres başına
+    rpartition ile ayrılır; ağaçta her benzersiz alan adı bir kez aranır ve
+    sonuçlar kodlarla satırlara dağıtılır.
+    """
+    if not isinstance(emails, pd.Series):
+        emails = pd.Series(emails, dtype=object)
+    # pandas .str yöntemleri 1M adreste düz rpartition'dan birkaç kat yavaş
+    domains = np.array([
+        email.rpartition('@')[2] if isinstance(email, str) and '@' in email else '' for email in emails.tolist()
+    ], dtype=object)
+    codes, uniques = pd.factorize(domains)
+    splits = [split_domain(domain) if domain else (None, '') for domain in uniques]
+    registrable = np.array([split[0] or '' for split in splits], dtype=object)
+    companies = np.array([split[1] for split in splits], dtype=object)
+    return pd.DataFrame({
+        'Alan Adı': domains,
+        'Kayıt Edilebilir Alan Adı': registrable[codes],
+        'Firma Adı': companies[codes],
+    }, index=emails.index)
+
+if __name__ == '__main__':
+    # Kullanım: python domains.py <e-posta adresi>...
+    for email in sys.argv[1:]:
+        print(f'{email}: {registrable_domain(email) or "-"} ({company_name(email) or "-"})')
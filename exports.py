@@ -0,0 +1,698 @@
+"""Uç noktaların dışa aktarma işleri: yüklenen girdilerden çıktı dosyası üretir
+
+Fonksiyonlar Flask isteğine bağlı değildir; aynı kod eşzamanlı uç noktalarda
+ve /jobs arka plan işlerinde çalışır. Girdiler alan adı -> [(dosya adı,
+kaynak)] sözlüğüdür; kaynak bir dosya yolu ya da ikili bir akış olabilir.
+Kullanıcıya gösterilecek hatalar ExportError ile bildirilir.
+"""
+import io
+import itertools
+import logging
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+import pandas as pd
+from werkzeug.utils import secure_filename
+
+from archives import compression_type, open_archive_members, DecompressionError, DEFAULT_MAX_BYTES, DEFAULT_MAX_RATIO
+from contact_store import ContactStore
+from contacts import compare_contact_frames, merge_contact_frames, SUMMARY_SHEET
+from domains import company_name, registrable_domains
+from find_emails import (find_categorized_emails_in_file, find_categorized_emails_in_stream, iter_categorized_emails,
+                         iter_unique_emails, DEFAULT_CELL_CACHE_SIZE, PARALLEL_MIN_BYTES)
+from mail_headers import (find_categorized_emails_in_mail, is_mail_file, iter_header_records, iter_mail_header_blocks,
+                          MAIL_EXTENSIONS)
+from metrics import stage, collect_stage_timings, add_stage_timings
+from readers import read_contact_sheet
+from uploads import chunk_path, received_chunks, wait_for_parse
+from writers import dataframe_rows, write_output, write_dataframes
+
+logger = logging.getLogger(__name__)
+
+# /process çıktısının sütunları ve genişlikleri
+EMAIL_LIST_COLUMNS = ['Kategori', 'E-posta Adresi', 'Firma Adı', 'Ad Soyad']
+EMAIL_LIST_WIDTHS = {'Kategori': 20, 'E-posta Adresi': 40, 'Firma Adı': 30, 'Ad Soyad': 30}
+# Airtable CSV'si bu kadar satırlık parçalar halinde okunur (tepe bellek dosya boyutundan bağımsızdır)
+AIRTABLE_CHUNK_ROWS = 5000
+# Kişi dizini kipleri: dizindeki tüm kişiler ya da yalnızca bu dışa aktarımda ilk kez görülenler
+CONTACT_MODES = ('full', 'delta')
+CONTACT_LIST_COLUMNS = EMAIL_LIST_COLUMNS + ['İlk Görülme', 'Son Görülme']
+CONTACT_LIST_WIDTHS = {**EMAIL_LIST_WIDTHS, 'İlk Görülme': 20, 'Son Görülme': 20}
+# /process girdileri: Outlook CSV'si ya da e-posta arşivi (düz ya da sıkıştırılmış)
+OUTLOOK_SUFFIXES = ('.csv',) + MAIL_EXTENSIONS
+# Birden çok dosyalı /process çıktısı: adresin ilk görüldüğü posta kutusu ve dosya başına özet
+BATCH_LIST_COLUMNS = EMAIL_LIST_COLUMNS + ['Kaynak Posta Kutusu']
+BATCH_LIST_WIDTHS = {**EMAIL_LIST_WIDTHS, 'Kaynak Posta Kutusu': 30}
+BATCH_SUMMARY_COLUMNS = ['Dosya', 'Satır', 'Bulunan E-posta', 'Listeye Eklenen', 'Boyut (bayt)', 'Süre (sn)']
+BATCH_SUMMARY_WIDTHS = {'Dosya': 40, 'Satır': 12, 'Bulunan E-posta': 16, 'Listeye Eklenen': 16,
+                        'Boyut (bayt)': 16, 'Süre (sn)': 12}
+
+class ExportError(Exception):
+    """Kullanıcıya gösterilecek dışa aktarma hatası (HTTP durum koduyla)"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+    def __reduce__(self):
+        # Süreç havuzundan durum koduyla birlikte taşınabilmesi için
+        return (ExportError, (self.message, self.status_code))
+
+def extract_company_name(email):
+    # E-posta adresinden firma adını çıkar: kayıt edilebilir alan adının ilk etiketi
+    # (mail.firma.com.tr -> firma); alan adı başına önbellekli Public Suffix List araması
+    try:
+        return company_name(email)
+    except:
+        return ''
+
+def company_names_by_email(categorized_data):
+    """Kategorili kayıtlardaki tüm adreslerin firma adlarını (adres -> firma) toplu olarak hesaplar"""
+    emails = pd.unique(pd.Series(
+        [data['email'] for data_list in categorized_data.values() for data in data_list], dtype=object
+    ))
+    return dict(zip(emails, registrable_domains(emails)['Firma Adı']))
+
+def extract_name_from_text(text):
+    # "Ad Soyad <email@domain.com>" formatından ismi çıkar
+    try:
+        # İsim kısmını bul (< işaretinden önceki kısım)
+        name = text.split('<')[0].strip()
+
+        # Gereksiz ön ekleri temizle
+        unwanted_prefixes = [
+            'To:', 'Cc:', 'From:', 'Gönderen:', 'Gönderen :',
+            'To :', 'Cc :', 'From :', ';', 'Bilgi:', 'Bilgi :'
+        ]
+
+        for prefix in unwanted_prefixes:
+            if name.startswith(prefix):
+                name = name[len(prefix):].strip()
+
+        return name
+    except:
+        return ''
+
+def is_airtable_csv(source):
+    """Airtable CSV dosyası olup olmadığını kontrol et (daha esnek)
+
+    Kaynak dosya yolu ya da ikili akış olabilir; konumlanabilen akışlar okunduğu konuma geri sarılır.
+    """
+    try:
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                first_line = f.readline()
+        elif source.seekable():
+            position = source.tell()
+            first_line = source.readline()
+            source.seek(position)
+        else:
+            first_line = source.readline()
+        return is_airtable_header(first_line)
+    except (UnicodeDecodeError, OSError):
+        return False
+
+def is_airtable_header(first_line):
+    """CSV başlık satırı (bayt) Airtable dışa aktarımına benziyor mu"""
+    first_line = first_line.decode('utf-8-sig').strip().lower()
+    # Farklı başlık varyasyonlarını kontrol et
+    name_headers = ['name', 'ad', 'ad soyad']
+    email_headers = ['email', 'mail', 'e-posta', 'e posta']
+    return any(h in first_line for h in name_headers) and any(h in first_line for h in email_headers)
+
+def source_size(source):
+    """Dosya yolunun ya da akışın boyutunu (akışın konumunu değiştirmeden) döndürür"""
+    if isinstance(source, str):
+        return os.path.getsize(source)
+    position = source.tell()
+    size = source.seek(0, os.SEEK_END)
+    source.seek(position)
+    return size
+
+def peek_source(source, lines=5, limit=8192):
+    """Kaynağın ilk satırlarını döndürür; akışlar başa sarılır"""
+    if isinstance(source, str):
+        with open(source, 'rb') as file:
+            head = file.read(limit)
+    else:
+        head = source.read(limit)
+        source.seek(0)
+    return '\n'.join(head.decode('utf-8-sig', errors='replace').splitlines()[:lines])
+
+def save_uploads(files, directory):
+    """Yüklenen dosyaları (FileStorage) dizine kaydeder; alan adı -> [(dosya adı, yol)] döndürür"""
+    inputs = {}
+    for field, field_files in files.items():
+        for index, file in enumerate(field_files):
+            path = os.path.join(directory, f'{field}_{index}_{secure_filename(file.filename) or "girdi"}')
+            file.save(path)
+            inputs.setdefault(field, []).append((file.filename, path))
+    return inputs
+
+def save_source(source, path):
+    """Akışı diske yazar ve dosya yolunu döndürür; yol verilmişse olduğu gibi döner"""
+    if isinstance(source, str):
+        return source
+    with open(path, 'wb') as file:
+        shutil.copyfileobj(source, file, 1024 * 1024)
+    source.seek(0)
+    return path
+
+def open_compressed_source(filename, source, options, suffixes=('.csv',)):
+    """Sıkıştırılmış yüklemedeki dosyaları [(ad, açıcı)] olarak döndürür (bkz. archives.open_archive_members)"""
+    try:
+        return open_archive_members(filename, source, suffixes,
+                                    max_ratio=options.get('max_inflate_ratio', DEFAULT_MAX_RATIO),
+                                    max_bytes=options.get('max_inflate_bytes', DEFAULT_MAX_BYTES))
+    except DecompressionError as e:
+        raise ExportError(str(e), e.status_code)
+
+def _find_categorized_emails_in_members(members, dedup_key, cache_size, stats):
+    """Arşivdeki Outlook CSV'lerini ve e-posta dosyalarını sırayla ayrıştırır; kayıtlar ortak kategori listelerine eklenir
+
+    Dosyalar arası tekrarlar yazma sırasında iter_unique_emails ile atılır.
+    """
+    categorized_data = {}
+    stats['rows'] = 0
+    for member_name, open_member in members:
+        member_stats = {}
+        with open_member() as stream:
+            if is_mail_file(member_name):
+                records = iter_header_records(iter_mail_header_blocks(stream, member_name), dedup_key=dedup_key,
+                                              stats=member_stats, cache_size=cache_size)
+            else:
+                records = iter_categorized_emails(stream, dedup_key=dedup_key, stats=member_stats,
+                                                  cache_size=cache_size)
+            for category, data in records:
+                categorized_data.setdefault(category, []).append(data)
+        logger.debug(f'{member_name}: {member_stats.get("rows", 0)} satır')
+        stats['rows'] += member_stats.get('rows', 0)
+    return categorized_data
+
+def _iter_member_chunks(members, columns):
+    """Arşivdeki CSV'leri sırayla parça parça okur; parçalar ortak sütunlara getirilir"""
+    for _, open_member in members:
+        with open_member() as stream:
+            for chunk in pd.read_csv(stream, encoding='utf-8-sig', dtype=str, chunksize=AIRTABLE_CHUNK_ROWS):
+                yield chunk.reindex(columns=columns)
+
+@contextmanager
+def _step(name, steps, progress):
+    """Aşamanın süresini ölçer ve başlarken ilerlemeyi (yüzde) bildirir"""
+    if progress:
+        progress(name, int(100 * steps.index(name) / len(steps)))
+    with stage(name):
+        yield
+
+def _prepare_outlook_source(filename, source, work_dir, options, steps, progress=None):
+    """/process girdisini ayrıştırmaya hazırlar; (dosya boyutu, kaynak, arşiv üyeleri) döndürür
+
+    Sıkıştırılmış girdilerin arşiv üyeleri açılır (yoksa None). mbox/.eml
+    girdileri ve dosya yolu isteyen arka uçlar için akış diske yazılır.
+    """
+    backend = options.get('backend', 'python')
+    workers = options.get('workers', 1)
+    members = None
+    try:
+        file_size = source_size(source)
+        logger.debug(f'Dosya alındı: {filename}. Boyut: {file_size} bytes')
+
+        if compression_type(filename):
+            # Sıkıştırılmış yüklemeler açıldıkça satır satır ayrıştırılır; açılmış veri diske yazılmaz
+            members = open_compressed_source(filename, source, options, OUTLOOK_SUFFIXES)
+        elif is_mail_file(filename):
+            # mbox dosyaları mmap ile okunur (ve paralel ayrıştırılabilir); bunun için diske yazılır
+            with _step('save', steps, progress):
+                source = save_source(source, os.path.join(work_dir, f'input{os.path.splitext(filename.lower())[1]}'))
+        else:
+            logger.debug(f'Dosya içeriği (ilk 5 satır):\n{peek_source(source)}')
+
+            # Sütun tabanlı ve paralel arka uçlar dosya yolu ister; diğer
+            # durumda yükleme akışı diske yazılmadan doğrudan ayrıştırılır
+            needs_file = backend != 'python' or (workers != 1 and file_size >= PARALLEL_MIN_BYTES)
+            if needs_file:
+                with _step('save', steps, progress):
+                    source = save_source(source, os.path.join(work_dir, 'input.csv'))
+    except ExportError:
+        raise
+    except Exception as e:
+        logger.error(f'Dosya kaydetme/okuma hatası: {str(e)}')
+        raise ExportError(f'Dosya işlenirken hata oluştu: {str(e)}')
+    return file_size, source, members
+
+def _parse_outlook_source(filename, source, members, options, stats):
+    """Hazırlanan /process girdisindeki e-postaları kategorilere ayırır"""
+    backend = options.get('backend', 'python')
+    workers = options.get('workers', 1)
+    dedup_key = options.get('dedup_key', 'exact')
+    cache_size = options.get('cache_size', DEFAULT_CELL_CACHE_SIZE)
+
+    # E-posta adreslerini bul
+    logger.debug('E-posta adresleri aranıyor...')
+    try:
+        if members is not None:
+            categorized_data = _find_categorized_emails_in_members(members, dedup_key, cache_size, stats)
+        elif is_mail_file(filename):
+            categorized_data = find_categorized_emails_in_mail(
+                [source],
+                dedup_key=dedup_key,
+                workers=workers,
+                cache_size=cache_size,
+                stats=stats
+            )
+        elif isinstance(source, str):
+            categorized_data = find_categorized_emails_in_file(
+                source,
+                dedup_key=dedup_key,
+                workers=workers,
+                backend=backend,
+                cache_size=cache_size,
+                stats=stats
+            )
+        else:
+            categorized_data = find_categorized_emails_in_stream(
+                source,
+                dedup_key=dedup_key,
+                cache_size=cache_size,
+                stats=stats
+            )
+        for category, data in categorized_data.items():
+            logger.debug(f'{category}: {len(data)} adet e-posta bulundu')
+    except DecompressionError as e:
+        logger.error(f'Arşiv açma hatası: {str(e)}')
+        raise ExportError(str(e), e.status_code)
+    except Exception as e:
+        logger.error(f'E-posta arama hatası: {str(e)}')
+        raise ExportError(f'E-posta adresleri işlenirken hata oluştu: {str(e)}')
+    return categorized_data
+
+def export_outlook_csv(inputs, output_path, options, progress=None):
+    """Outlook CSV dışa aktarımındaki (ya da mbox/.eml arşivindeki) e-postaları kategorili kişi listesi olarak yazar"""
+    steps = ('save', 'parse', 'excel')
+
+    if options.get('contact_store'):
+        return export_contact_index(inputs, output_path, options, progress)
+    # Birden çok posta kutusunun dışa aktarımları tek listede birleştirilir
+    if len(inputs['file']) > 1:
+        return export_outlook_batch(inputs, output_path, options, progress)
+
+    (filename, source), = inputs['file']
+    file_size, source, members = _prepare_outlook_source(filename, source, os.path.dirname(output_path), options,
+                                                         steps, progress)
+    parse_stats = {}
+    with _step('parse', steps, progress):
+        categorized_data = _parse_outlook_source(filename, source, members, options, parse_stats)
+
+    with _step('excel', steps, progress):
+        write_email_list(categorized_data, output_path, options)
+    return {'rows': parse_stats.get('rows', 0), 'bytes': file_size}
+
+def _parse_batch_file(filename, path, options):
+    """Toplu /process girdilerinden birini ayrıştırır (süreç havuzunda çalışır)
+
+    (kategorili kayıtlar, {'rows', 'bytes', 'seconds'}) döndürür.
+    """
+    start = time.perf_counter()
+    stats = {}
+    try:
+        file_size, source, members = _prepare_outlook_source(filename, path, os.path.dirname(path), options,
+                                                             ('save', 'parse'))
+        categorized_data = _parse_outlook_source(filename, source, members, options, stats)
+    except ExportError as e:
+        raise ExportError(f'{filename}: {e.message}', e.status_code)
+    return categorized_data, {'rows': stats.get('rows', 0), 'bytes': file_size,
+                              'seconds': time.perf_counter() - start}
+
+def _unique_labels(filenames):
+    """Aynı adlı dosyaları 'outlook.csv (2)' biçiminde ayırt eden etiketler"""
+    labels = []
+    seen = set()
+    for filename in filenames:
+        label = filename
+        copy = 1
+        while label in seen:
+            copy += 1
+            label = f'{filename} ({copy})'
+        seen.add(label)
+        labels.append(label)
+    return labels
+
+def export_outlook_batch(inputs, output_path, options, progress=None):
+    """Birden çok Outlook dışa aktarımını paralel ayrıştırır ve dosyalar arası tekilleştirilmiş tek liste yazar
+
+    Her adres, kategori sırasıyla (Kimden, Kime, Bilgi, Gizli) ve dosya
+    sırasıyla ilk görüldüğü posta kutusuyla yazılır. Özet sayfasında dosya
+    başına satır sayısı, bulunan ve listeye eklenen adres sayısı ve
+    ayrıştırma süresi bulunur.
+    """
+    steps = ('save', 'parse', 'excel')
+    files = inputs['file']
+    work_dir = os.path.dirname(output_path)
+    dedup_key = options.get('dedup_key', 'exact')
+
+    # Alt süreçler girdileri dosya yolundan okur
+    try:
+        with _step('save', steps, progress):
+            paths = [
+                save_source(source, os.path.join(work_dir, f'batch_{index}_{secure_filename(filename) or "girdi"}'))
+                for index, (filename, source) in enumerate(files)
+            ]
+    except Exception as e:
+        logger.error(f'Dosya kaydetme hatası: {str(e)}')
+        raise ExportError(f'Dosya işlenirken hata oluştu: {str(e)}')
+    filenames = [filename for filename, _ in files]
+    labels = _unique_labels(filenames)
+
+    # Dosyalar paralel ayrıştırılır; tek dosya içi paralellik yalnızca havuz kullanılmıyorsa açıktır
+    batch_workers = min(options.get('batch_workers', 1), len(files))
+    parse_start = time.perf_counter()
+    with _step('parse', steps, progress):
+        if batch_workers > 1:
+            file_options = {**options, 'workers': 1}
+            logger.info(f'Toplu ayrıştırma: {len(files)} dosya, {batch_workers} süreç')
+            with ProcessPoolExecutor(max_workers=batch_workers) as executor:
+                results = list(executor.map(_parse_batch_file, filenames, paths, [file_options] * len(files)))
+        else:
+            results = [_parse_batch_file(filename, path, options) for filename, path in zip(filenames, paths)]
+    parse_seconds = time.perf_counter() - parse_start
+
+    # Kayıtlar dosya sırasıyla kategori listelerine eklenir; tekrarlar yazarken atılır
+    categorized_data = {}
+    found = []
+    for index, (file_data, _) in enumerate(results):
+        found.append(sum(1 for _ in iter_unique_emails(file_data, dedup_key=dedup_key)))
+        for category, data_list in file_data.items():
+            for data in data_list:
+                data['source'] = index
+            categorized_data.setdefault(category, []).extend(data_list)
+    if not categorized_data:
+        raise ExportError('Hiç e-posta adresi bulunamadı')
+
+    added = [0] * len(files)
+    companies = company_names_by_email(categorized_data)
+
+    def rows():
+        for category, data in iter_unique_emails(categorized_data, dedup_key=dedup_key):
+            added[data['source']] += 1
+            yield [category, data['email'], companies[data['email']],
+                   extract_name_from_text(data['original_text']), labels[data['source']]]
+
+    def summary_rows():
+        # Liste sayfası önce yazıldığından eklenen sayıları bu noktada tamdır
+        for label, (_, file_stats), file_found, file_added in zip(labels, results, found, added):
+            yield [label, file_stats['rows'], file_found, file_added, file_stats['bytes'],
+                   round(file_stats['seconds'], 3)]
+        yield ['Toplam', sum(file_stats['rows'] for _, file_stats in results), sum(found), sum(added),
+               sum(file_stats['bytes'] for _, file_stats in results), round(parse_seconds, 3)]
+
+    try:
+        with _step('excel', steps, progress):
+            write_output(output_path, options['output_format'], [
+                ('E-posta Listesi', BATCH_LIST_COLUMNS, rows(), BATCH_LIST_WIDTHS),
+                (SUMMARY_SHEET, BATCH_SUMMARY_COLUMNS, summary_rows(), BATCH_SUMMARY_WIDTHS)
+            ])
+    except Exception as e:
+        logger.error(f'Excel oluşturma hatası: {str(e)}')
+        raise ExportError(f'Excel dosyası oluşturulurken hata oluştu: {str(e)}')
+
+    return {'rows': sum(file_stats['rows'] for _, file_stats in results),
+            'bytes': sum(file_stats['bytes'] for _, file_stats in results)}
+
+def write_email_list(categorized_data, output_path, options):
+    """Kategorili e-postaları /process çıktısı (kategori, adres, firma, isim) olarak yazar"""
+    if not categorized_data:
+        raise ExportError('Hiç e-posta adresi bulunamadı')
+
+    # Excel dosyası oluştur
+    logger.debug('Excel dosyası oluşturuluyor...')
+    try:
+        # Tüm kategorilerdeki e-postalar üretildikçe Excel'e yazılır
+        # Kategoriler sırayla (Kimden, Kime, Bilgi, Gizli) ve aynı tekrar anahtarıyla işlenir
+        companies = company_names_by_email(categorized_data)
+        rows = (
+            [category, data['email'], companies[data['email']],
+             extract_name_from_text(data['original_text'])]
+            for category, data in iter_unique_emails(categorized_data, dedup_key=options.get('dedup_key', 'exact'))
+        )
+        write_output(output_path, options['output_format'],
+                     [('E-posta Listesi', EMAIL_LIST_COLUMNS, rows, EMAIL_LIST_WIDTHS)])
+    except Exception as e:
+        logger.error(f'Excel oluşturma hatası: {str(e)}')
+        raise ExportError(f'Excel dosyası oluşturulurken hata oluştu: {str(e)}')
+
+def export_chunked_upload(inputs, output_path, options, progress=None):
+    """Parça parça yüklenen (ve yüklenirken ayrıştırılan) Outlook CSV'sini kategorili kişi listesi olarak yazar
+
+    Girdi yükleme dizinidir; ayrıştırma sonucu hazır değilse beklenir.
+    """
+    steps = ('parse', 'excel')
+    (filename, upload_dir), = inputs['upload']
+    # Bu aşama yalnızca ayrıştırmanın kalan kısmının beklendiği süreyi ölçer
+    try:
+        with _step('parse', steps, progress):
+            categorized_data, parse_stats = wait_for_parse(upload_dir)
+    except Exception as e:
+        logger.error(f'E-posta arama hatası ({filename}): {str(e)}')
+        raise ExportError(f'E-posta adresleri işlenirken hata oluştu: {str(e)}')
+
+    with _step('excel', steps, progress):
+        write_email_list(categorized_data, output_path, options)
+    return {'rows': parse_stats.get('rows', 0), 'bytes': sum(
+        os.path.getsize(chunk_path(upload_dir, index)) for index in received_chunks(upload_dir)
+    )}
+
+def export_contact_index(inputs, output_path, options, progress=None):
+    """Outlook CSV'sini kalıcı kişi dizinine ekler ve dizindeki tüm ya da yalnızca yeni kişileri yazar"""
+    steps = ('parse', 'excel')
+    (filename, source), = inputs['file']
+    file_size = source_size(source)
+    if is_mail_file(filename):
+        raise ExportError('Kişi dizini yalnızca Outlook CSV dosyalarıyla kullanılabilir')
+    store = ContactStore(options['contact_store'])
+    parse_stats = {}
+
+    # Her içe aktarma tek bir CSV'dir; arşivde birden çok CSV varsa hangisinin yeni olduğu belirsizdir
+    members = None
+    if compression_type(filename):
+        members = open_compressed_source(filename, source, options)
+        if len(members) != 1:
+            raise ExportError('Kişi dizini için arşivde tek bir CSV dosyası olmalı')
+
+    # Daha önce içe aktarılmış satırlar ayrıştırılmadan atlanır
+    logger.debug(f'Kişi dizinine ekleniyor: {filename}')
+    try:
+        with _step('parse', steps, progress):
+            if members:
+                with members[0][1]() as stream:
+                    import_id = store.ingest(stream, filename, dedup_key=options.get('dedup_key', 'exact'),
+                                             cache_size=options.get('cache_size', DEFAULT_CELL_CACHE_SIZE),
+                                             stats=parse_stats)
+            elif isinstance(source, str):
+                with open(source, 'rb') as file:
+                    import_id = store.ingest(file, filename, dedup_key=options.get('dedup_key', 'exact'),
+                                             cache_size=options.get('cache_size', DEFAULT_CELL_CACHE_SIZE),
+                                             stats=parse_stats)
+            else:
+                import_id = store.ingest(source, filename, dedup_key=options.get('dedup_key', 'exact'),
+                                         cache_size=options.get('cache_size', DEFAULT_CELL_CACHE_SIZE),
+                                         stats=parse_stats)
+    except Exception as e:
+        logger.error(f'Kişi dizini hatası: {str(e)}')
+        raise ExportError(f'E-posta adresleri işlenirken hata oluştu: {str(e)}')
+
+    try:
+        rows = (
+            [category, email, extract_company_name(email), name, first_seen, last_seen]
+            for category, email, name, first_seen, last_seen in store.iter_contacts(
+                import_id if options['contact_mode'] == 'delta' else None
+            )
+        )
+        with _step('excel', steps, progress):
+            write_output(output_path, options['output_format'],
+                         [('E-posta Listesi', CONTACT_LIST_COLUMNS, rows, CONTACT_LIST_WIDTHS)])
+    except Exception as e:
+        logger.error(f'Excel oluşturma hatası: {str(e)}')
+        raise ExportError(f'Excel dosyası oluşturulurken hata oluştu: {str(e)}')
+
+    return {'rows': parse_stats.get('rows', 0), 'bytes': file_size}
+
+def export_merge_excel(inputs, output_path, options, progress=None):
+    """Birden çok kişi listesini e-posta adresine göre tekilleştirerek birleştirir"""
+    steps = ('read', 'merge', 'excel')
+    # Okunan tablolar (kaynak dosya adı, DataFrame)
+    frames = []
+    input_rows = 0
+    input_bytes = 0
+
+    with _step('read', steps, progress):
+        for filename, source in inputs['files']:
+            input_bytes += source_size(source)
+            try:
+                # E-posta sütunu olmayan dosyalar satırları okunmadan atlanır
+                df = read_contact_sheet(source)
+            except Exception as e:
+                logger.error(f'Excel okuma hatası ({filename}): {str(e)}')
+                continue
+            input_rows += len(df)
+            frames.append((filename, df))
+
+    # Tüm tablolar tek seferde birleştirilir; her adresin ilk görüldüğü satır tutulur
+    with _step('merge', steps, progress):
+        df = merge_contact_frames(frames)
+
+    if df.empty:
+        raise ExportError('Hiç e-posta adresi bulunamadı')
+
+    with _step('excel', steps, progress):
+        write_dataframes(output_path, options['output_format'], {'E-posta Listesi': df})
+    return {'rows': input_rows, 'bytes': input_bytes}
+
+def export_airtable_csv(inputs, output_path, options, progress=None):
+    """Airtable CSV dışa aktarımını tek sayfalık bir tabloya çevirir
+
+    CSV parçalar halinde ve tür çıkarımı yapılmadan (metin olarak) okunur;
+    satırlar okundukça çıktıya yazılır. Sıkıştırılmış yüklemelerde arşivdeki
+    tüm CSV'ler aynı sayfaya yazılır; sütunlar başlıklarının birleşimidir.
+    """
+    steps = ('read', 'excel')
+    (filename, source), = inputs['file']
+    row_count = 0
+    try:
+        file_size = source_size(source)
+        logger.debug(f'Dosya alındı: {filename}. Boyut: {file_size} bytes')
+
+        members = open_compressed_source(filename, source, options) if compression_type(filename) else None
+
+        # Airtable CSV kontrolü; arşivdeki dosyaların başlıkları bir kez okunur ve sütunlar için de kullanılır
+        columns = []
+        if members:
+            for _, open_member in members:
+                with open_member() as stream:
+                    first_line = stream.readline()
+                try:
+                    is_airtable = is_airtable_header(first_line)
+                except UnicodeDecodeError:
+                    is_airtable = False
+                if not is_airtable:
+                    raise ExportError('Lütfen Airtable\'dan export edilmiş bir CSV dosyası yükleyin')
+                header = pd.read_csv(io.BytesIO(first_line), encoding='utf-8-sig', dtype=str, nrows=0).columns
+                columns.extend(column for column in header if column not in columns)
+        elif not is_airtable_csv(source):
+            raise ExportError('Lütfen Airtable\'dan export edilmiş bir CSV dosyası yükleyin')
+
+        # CSV'yi parça parça oku; sütunlar ilk parçadan alınır
+        with _step('read', steps, progress):
+            if members:
+                chunks = _iter_member_chunks(members, columns)
+            else:
+                chunks = pd.read_csv(source, encoding='utf-8-sig', dtype=str, chunksize=AIRTABLE_CHUNK_ROWS)
+            first_chunk = next(chunks)
+
+        def rows():
+            nonlocal row_count
+            for chunk in itertools.chain([first_chunk], chunks):
+                row_count += len(chunk)
+                yield from dataframe_rows(chunk)
+
+        # Excel'e kaydet (kalan parçaların okunması da bu aşamadadır)
+        with _step('excel', steps, progress):
+            write_output(output_path, options['output_format'],
+                         [('Airtable Verileri', list(first_chunk.columns), rows(), None)])
+    except ExportError:
+        raise
+    except DecompressionError as e:
+        logger.error(f'Arşiv açma hatası: {str(e)}')
+        raise ExportError(str(e), e.status_code)
+    except Exception as e:
+        logger.error(f'Dosya işleme hatası: {str(e)}')
+        raise ExportError(f'Dosya işlenirken hata oluştu: {str(e)}')
+
+    return {'rows': row_count, 'bytes': file_size}
+
+def export_compare_merge(inputs, output_path, options, progress=None):
+    """İki kişi listesini e-posta adresine göre karşılaştırır; özet ve fark sayfalarını yazar"""
+    steps = ('read', 'compare', 'excel')
+    (filename1, source1), = inputs['file1']
+    (filename2, source2), = inputs['file2']
+
+    # Dosyaları oku
+    with _step('read', steps, progress):
+        frames = []
+        for filename, source in ((filename1, source1), (filename2, source2)):
+            try:
+                frames.append(read_contact_sheet(source))
+            except ValueError:
+                raise ExportError(f'{filename} dosyasında e-posta sütunu bulunamadı')
+        df1, df2 = frames
+
+    # Sadece birinde olanlar ve her ikisinde olup alanları farklı olanlar
+    with _step('compare', steps, progress):
+        try:
+            sheets = compare_contact_frames((filename1, df1), (filename2, df2))
+        except ValueError as e:
+            raise ExportError(str(e))
+
+    with _step('excel', steps, progress):
+        write_dataframes(output_path, options['output_format'], sheets)
+    return {'rows': len(df1) + len(df2), 'bytes': source_size(source1) + source_size(source2)}
+
+# Dışa aktarma türü -> iş fonksiyonu (türler uç nokta adlarıyla aynıdır)
+EXPORTS = {
+    'process': export_outlook_csv,
+    'merge_excel': export_merge_excel,
+    'process_airtable': export_airtable_csv,
+    'compare_merge': export_compare_merge,
+    'upload': export_chunked_upload
+}
+
+def run_export(export_type, inputs, output_path, options, progress=None):
+    """Dışa aktarma türünün iş fonksiyonunu çalıştırır; girdi satır/bayt sayılarını döndürür
+
+    progress verilirse her aşamanın başında (aşama adı, yüzde) ile çağrılır.
+    """
+    if export_type not in EXPORTS:
+        raise ExportError(f'Geçersiz işlem türü: {export_type}')
+    return EXPORTS[export_type](inputs, output_path, options, progress)
+
+# Dışa aktarmaları istek sürecinin dışında çalıştıran havuz (süreç başına bir tane)
+_pool = None
+_pool_pid = None
+
+def _export_pool(max_workers):
+    global _pool, _pool_pid
+    # gunicorn --preload ile ana süreçte oluşturulan havuz çatallanan işçilerde kullanılamaz
+    if _pool is None or _pool_pid != os.getpid():
+        _pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+        _pool_pid = os.getpid()
+    return _pool
+
+def _run_export_collecting_timings(export_type, inputs, output_path, options):
+    with collect_stage_timings() as timings:
+        summary = run_export(export_type, inputs, output_path, options)
+    return summary, timings
+
+def run_export_in_pool(export_type, inputs, output_path, options, max_workers):
+    """Dışa aktarmayı sınırlı bir süreç havuzunda çalıştırır ve bitmesini bekler
+
+    Girdiler dosya yolu olmalıdır. Bekleme gevent altında işbirlikçidir; CPU
+    yoğun ayrıştırma ve yazma başka süreçte sürerken işçinin olay döngüsü
+    diğer istekleri yanıtlamaya devam eder. Aşama süreleri isteğe eklenir.
+    """
+    global _pool
+    try:
+        future = _export_pool(max_workers).submit(_run_export_collecting_timings, export_type, inputs,
+                                                  output_path, options)
+        summary, timings = future.result()
+    except BrokenProcessPool:
+        # Bir alt süreç öldürüldüyse (örn. bellek yetersizliği) havuz sonraki istekte yeniden kurulur
+        logger.error('Dışa aktarma süreç havuzu bozuldu, yeniden oluşturulacak')
+        _pool = None
+        raise
+    add_stage_timings(timings)
+    return summary
@@ -1,11 +1,34 @@
+import bisect
 import csv
+import io
 import logging
+import mmap
 import re
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import pandas as pd
+
+# Sütun tabanlı arka uç için isteğe bağlı pyarrow CSV motoru
+try:
+    import pyarrow
+    import pyarrow.csv as pyarrow_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Basit e-posta doğrulama deseni
+VALID_EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+# Metin içindeki e-posta adaylarını bulan desen
+EMAIL_FIND_PATTERN = r'[\w\.-]+@[\w\.-]+\.\w+'
+
+_VALID_EMAIL_RE = re.compile(VALID_EMAIL_PATTERN)
+_EMAIL_FIND_RE = re.compile(EMAIL_FIND_PATTERN)
+
 def is_valid_email(email):
     """E-posta adresinin geçerli olup olmadığını kontrol eder"""
     # Exchange/LDAP formatını filtrele
@@ -13,8 +36,7 @@ def is_valid_email(email):
         return False
     
     # Basit e-posta doğrulama
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(email_pattern, email))
+    return bool(_VALID_EMAIL_RE.match(email))
 
 def convert_email_to_name(email):
     """E-posta adresinden ad soyad oluşturur"""
@@ -57,32 +79,170 @@ def format_name(name):
         logger.error(f'İsim formatı hatası: {str(e)}')
         return name
 
+# Sistem bilgisi belirteçleri (is_system_info için)
+SYSTEM_INFO_PATTERNS = [
+    'SMTP:',
+    'EX:',
+    ';EX:',
+    'Exchange',
+    '/O=EXCHANGELABS/',
+    '/OU=',
+    'IMCEAEX-',
+    'outlook_',
+    'SPF',
+    'DKIM',
+    'DMARC',
+    '/CN=',
+    'X-MS-Exchange',
+    'X-Microsoft',
+    'Microsoft Exchange',
+    'AutoDiscover',
+    '/DC=',
+    'smtp.mailfrom'
+]
+
+# Tüm belirteçler tek bir alternasyonda; metin bir kez küçük harfe çevrilip tek geçişte taranır
+_SYSTEM_INFO_RE = re.compile('|'.join(re.escape(p.lower()) for p in SYSTEM_INFO_PATTERNS))
+
+# Adres metninin başından temizlenecek ön ekler (sıra önemlidir)
+EMAIL_PREFIXES = [
+    'From:', 'To:', 'Cc:', 'Bcc:', 
+    'Kimden:', 'Kime:', 'Bilgi:', 'Gizli:',
+    'From :', 'To :', 'Cc :', 'Bcc :',
+    'Kimden :', 'Kime :', 'Bilgi :', 'Gizli :',
+    'Sender:', 'Recipient:', 'Reply-To:',
+    'Gönderen:', 'Alıcı:', 'Yanıtla:',
+    'Sender :', 'Recipient :', 'Reply-To :',
+    'Gönderen :', 'Alıcı :', 'Yanıtla :'
+]
+
+_PREFIX_RE = re.compile('|'.join(re.escape(p) for p in EMAIL_PREFIXES))
+
+# Kelimenin sonuna kadar silinen sistem belirteçleri (sıra önemlidir)
+SYSTEM_TOKENS = [
+    'SMTP:',
+    'EX:',
+    ';EX:',
+    '/O=EXCHANGELABS/',
+    '/OU=',
+    'IMCEAEX-',
+    'outlook_',
+    'SPF=',
+    'DKIM=',
+    'DMARC=',
+    '/CN=',
+    'X-MS-Exchange',
+    'X-Microsoft',
+    '/DC='
+]
+
+_SYSTEM_TOKEN_RE = re.compile('|'.join(re.escape(t) for t in SYSTEM_TOKENS))
+
+# Eski '(.*?)\s*<...' deseniyle aynı eşleşmeler; baştaki tembel grup olmadan başarısız aramalar doğrusal kalır
+_MAILTO_PAIR_RE = re.compile(r'\s*<([^>]+?)\s*<mailto:[^>]+>>')
+_MAILTO_RE = re.compile(r'<mailto:[^>]+>')
+# Yalnızca aynı başlangıçta birden çok aday olan (iç içe) nadir hücrelerde kullanılır; bkz. _remove_repeated_emails
+_REPEATED_EMAIL_RE = re.compile(r'(\S+@\S+\.\S+)\s*<\1>')
+_NESTED_BRACKET_RE = re.compile(r'<([^>]+)\s*<[^>]+>>')
+_WHITESPACE_RE = re.compile(r'\s+')
+_WORD_RE = re.compile(r'\S+')
+
 def is_system_info(text):
     """Metnin sistem bilgisi olup olmadığını kontrol eder"""
     if not text:
         return False
-        
-    system_patterns = [
-        'SMTP:', 
-        'EX:', 
-        ';EX:', 
-        'Exchange',
-        '/O=EXCHANGELABS/',
-        '/OU=',
-        'IMCEAEX-',
-        'outlook_',
-        'SPF',
-        'DKIM',
-        'DMARC',
-        '/CN=',
-        'X-MS-Exchange',
-        'X-Microsoft',
-        'Microsoft Exchange',
-        'AutoDiscover',
-        '/DC=',
-        'smtp.mailfrom'
-    ]
-    return any(pattern.lower() in text.lower() for pattern in system_patterns)
+    return _SYSTEM_INFO_RE.search(text.lower()) is not None
+
+def _strip_prefixes(text):
+    """Ön ekleri listedeki sırayla baştan temizler"""
+    # Hızlı yol: metin hiçbir ön ekle başlamıyorsa dokunma
+    if not _PREFIX_RE.match(text):
+        return text
+    for prefix in EMAIL_PREFIXES:
+        if text.startswith(prefix):
+            text = text[len(prefix):].strip()
+    return text
+
+def _truncate_system_token(word):
+    """Kelimeyi, belirteçleri sırayla uygulayarak ilk sistem belirtecinden itibaren keser"""
+    for token in SYSTEM_TOKENS:
+        index = word.find(token)
+        if index != -1:
+            word = word[:index]
+    return word
+
+def _remove_system_tokens(text):
+    """Sistem belirteçlerini kelime sonuna kadar tek geçişte siler"""
+    # Hızlı yol: hiçbir belirteç yoksa metin aynen döner
+    if not _SYSTEM_TOKEN_RE.search(text):
+        return text
+    # Metin tek boşluklarla ayrılmış kelimelerden oluşur; her belirteç eşleşmesi
+    # bulunduğu kelimenin sonuna kadar uzanır
+    return ' '.join(
+        _truncate_system_token(word) if _SYSTEM_TOKEN_RE.search(word) else word
+        for word in text.split(' ')
+    )
+
+def _is_email_like(word):
+    """Kelime '\\S+@\\S+\\.\\S+' biçiminde mi (kelimede boşluk olmadığı varsayılır)"""
+    at = word.find('@', 1)
+    return at != -1 and word.rfind('.', 0, len(word) - 1) >= at + 2
+
+def _remove_repeated_emails(text):
+    """'adres <adres>' tekrarlarını adresin kendisiyle değiştirir
+
+    _REPEATED_EMAIL_RE.sub(r'\\1', text) ile aynı sonucu verir; ancak geri
+    başvurulu desen ';' ile birleştirilmiş uzun alıcı hücrelerinde her
+    başlangıç konumunda geri izleme yaptığı için süper doğrusaldır. Burada
+    eşleşmeler '<' konumlarından bulunur: '<' öncesindeki boşluksuz kelimenin
+    sonu ile '<' sonrasındaki her '>' öncesi kısım karşılaştırılır.
+    """
+    if '<' not in text or '@' not in text:
+        return text
+    # Boşluksuz kelimelerin (başlangıç, son) konumları; '<' içeren kelime ikili aramayla bulunur
+    spans = [match.span() for match in _WORD_RE.finditer(text)]
+    starts = [span[0] for span in spans]
+
+    # Başlangıç konumu -> [(eşleşmenin sonu, adresin sonu)]
+    candidates = {}
+    bracket = text.find('<')
+    while bracket != -1:
+        word = bisect.bisect_right(starts, bracket) - 1
+        word_start, word_end = spans[word]
+        if word_start == bracket:
+            # '<' kelime başındaysa adres, aradaki boşluklardan önceki kelimenin sonundadır
+            word_start, end = spans[word - 1] if word else (0, 0)
+        else:
+            end = bracket
+        close = text.find('>', bracket + 1, word_end)
+        while close != -1:
+            size = close - bracket - 1
+            begin = end - size
+            if size and begin >= word_start and text[begin:end] == text[bracket + 1:close] \
+                    and _is_email_like(text[begin:end]):
+                candidates.setdefault(begin, []).append((close + 1, end))
+            close = text.find('>', close + 1, word_end)
+        bracket = text.find('<', bracket + 1)
+    if not candidates:
+        return text
+
+    parts = []
+    position = 0
+    for begin in sorted(candidates):
+        if begin < position:
+            continue
+        if len(candidates[begin]) == 1:
+            (match_end, email_end), = candidates[begin]
+            replacement = text[begin:email_end]
+        else:
+            # Aynı başlangıçta birden çok aday: desenin seçtiği eşleşme kullanılır
+            match = _REPEATED_EMAIL_RE.match(text, begin)
+            match_end, replacement = match.end(), match.group(1)
+        parts.append(text[position:begin])
+        parts.append(replacement)
+        position = match_end
+    parts.append(text[position:])
+    return ''.join(parts)
 
 def clean_email_text(text):
     """E-posta metnini temizler ve düzenler"""
@@ -93,60 +253,31 @@ def clean_email_text(text):
         # Fazla boşlukları temizle
         text = ' '.join(text.split())
         
-        # Prefix'leri temizle
-        prefixes = [
-            'From:', 'To:', 'Cc:', 'Bcc:', 
-            'Kimden:', 'Kime:', 'Bilgi:', 'Gizli:',
-            'From :', 'To :', 'Cc :', 'Bcc :',
-            'Kimden :', 'Kime :', 'Bilgi :', 'Gizli :',
-            'Sender:', 'Recipient:', 'Reply-To:',
-            'Gönderen:', 'Alıcı:', 'Yanıtla:',
-            'Sender :', 'Recipient :', 'Reply-To :',
-            'Gönderen :', 'Alıcı :', 'Yanıtla :'
-        ]
-        
         # Prefix'leri baştan temizle
-        for prefix in prefixes:
-            if text.startswith(prefix):
-                text = text[len(prefix):].strip()
+        text = _strip_prefixes(text)
         
         # Sistem bilgilerini temizle
-        system_patterns = [
-            r'SMTP:.*?(?=\s|$)',
-            r'EX:.*?(?=\s|$)',
-            r';EX:.*?(?=\s|$)',
-            r'/O=EXCHANGELABS/.*?(?=\s|$)',
-            r'/OU=.*?(?=\s|$)',
-            r'IMCEAEX-.*?(?=\s|$)',
-            r'outlook_.*?(?=\s|$)',
-            r'SPF=.*?(?=\s|$)',
-            r'DKIM=.*?(?=\s|$)',
-            r'DMARC=.*?(?=\s|$)',
-            r'/CN=.*?(?=\s|$)',
-            r'X-MS-Exchange.*?(?=\s|$)',
-            r'X-Microsoft.*?(?=\s|$)',
-            r'/DC=.*?(?=\s|$)'
-        ]
-        
-        for pattern in system_patterns:
-            text = re.sub(pattern, '', text)
-        
-        # Ad Soyad <email@domain.com <mailto:email@domain.com>> formatını düzelt
-        pattern = r'(.*?)\s*<([^>]+?)\s*<mailto:[^>]+>>'
-        while re.search(pattern, text):
-            text = re.sub(pattern, r'\1 <\2>', text)
+        text = _remove_system_tokens(text)
         
-        # Kalan mailto: etiketlerini temizle
-        text = re.sub(r'<mailto:[^>]+>', '', text)
-        
-        # Aynı e-postanın tekrarını temizle (örn: email@domain.com <email@domain.com>)
-        text = re.sub(r'(\S+@\S+\.\S+)\s*<\1>', r'\1', text)
+        if '<mailto:' in text:
+            # Ad Soyad <email@domain.com <mailto:email@domain.com>> formatını düzelt
+            text, count = _MAILTO_PAIR_RE.subn(r' <\1>', text)
+            while count:
+                text, count = _MAILTO_PAIR_RE.subn(r' <\1>', text)
+            
+            # Kalan mailto: etiketlerini temizle
+            text = _MAILTO_RE.sub('', text)
         
-        # Çift parantezli e-postaları temizle
-        text = re.sub(r'<([^>]+)\s*<[^>]+>>', r'<\1>', text)
+        # Aşağıdaki desenler '<' olmadan eşleşemez; mailto temizliğinden sonra çoğu hücrede kalmaz
+        if '<' in text:
+            # Aynı e-postanın tekrarını temizle (örn: email@domain.com <email@domain.com>)
+            text = _remove_repeated_emails(text)
+            
+            # Çift parantezli e-postaları temizle
+            text = _NESTED_BRACKET_RE.sub(r'<\1>', text)
         
         # Gereksiz boşlukları temizle
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         text = text.strip()
         
         return text
@@ -180,7 +311,7 @@ def extract_emails_from_text(text):
     try:
         emails = []
         # E-posta adreslerini bul
-        for email in re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', text):
+        for email in _EMAIL_FIND_RE.findall(text):
             if is_valid_email(email):
                 emails.append(email)
         
@@ -193,114 +324,563 @@ def extract_emails_from_text(text):
         logger.error(f'E-posta çıkarma hatası: {str(e)}')
         return []
 
-def find_categorized_emails_in_file(file_path):
+# Kategoriler, çıktıda kullanılan sırayla
+CATEGORIES = ['Kimden', 'Kime', 'Bilgi', 'Gizli']
+
+def _plus_tag_key(email):
+    """Adresi küçük harfe çevirir ve yerel kısımdaki +etiketi atar"""
+    local, sep, domain = email.casefold().partition('@')
+    return local.split('+', 1)[0] + sep + domain
+
+# Tekrar kontrolünde kullanılabilecek anahtarlar
+DEDUP_KEYS = {
+    'exact': str,
+    'casefold': str.casefold,
+    'plus': _plus_tag_key
+}
+
+def get_dedup_key(dedup_key='exact'):
+    """Tekrar kontrolü anahtarının fonksiyonunu döndürür"""
+    if callable(dedup_key):
+        return dedup_key
+    try:
+        return DEDUP_KEYS[dedup_key]
+    except KeyError:
+        raise ValueError(f'Geçersiz tekrar anahtarı: {dedup_key}')
+
+def iter_unique_emails(categorized_data, dedup_key='exact'):
+    """Kategorileri sırayla dolaşır ve kategoriler arası tekrarları atarak (kategori, kayıt) döndürür"""
+    key_func = get_dedup_key(dedup_key)
+    seen = set()
+    for category in CATEGORIES:
+        for data in categorized_data.get(category, []):
+            key = key_func(data['email'])
+            if key not in seen:
+                seen.add(key)
+                yield category, data
+
+# Outlook CSV sütun isimleri
+OUTLOOK_COLUMNS = {
+    'Kimden': {
+        'email': 'Kimden: (Adres)',
+        'name': 'Kimden: (Ad)'
+    },
+    'Kime': {
+        'email': 'Kime: (Adres)',
+        'name': 'Kime: (Ad)'
+    },
+    'Bilgi': {
+        'email': 'Bilgi: (Adres)',
+        'name': 'Bilgi: (Ad)'
+    },
+    'Gizli': {
+        'email': 'Gizli: (Adres)',
+        'name': 'Gizli: (Ad)'
+    }
+}
+
+def resolve_outlook_columns(headers):
+    """Başlık satırından her kategori için (kategori, e-posta indeksi, isim indeksi) listesini döndürür
+    
+    Başlıkta bulunmayan sütunların indeksi None olur. Aynı isimde birden fazla
+    sütun varsa sonuncusu kullanılır.
+    """
+    positions = {name: index for index, name in enumerate(headers)}
+    return [
+        (category, positions.get(column_info['email']), positions.get(column_info['name']))
+        for category, column_info in OUTLOOK_COLUMNS.items()
+    ]
+
+def extract_cell_pairs(email_text, name_text):
+    """Bir adres hücresi ve karşılık gelen isim hücresinden (isim, e-posta) çiftlerini çıkarır"""
+    # İsmi formatla
+    name_text = format_name(name_text)
+    
+    if not email_text or is_system_info(email_text):
+        return []
+    
+    # E-posta metnini temizle
+    clean_text = clean_email_text(email_text)
+    logger.debug(f'Temizlenmiş metin: {clean_text}')
+    
+    # E-posta adreslerini bul
+    emails = extract_emails_from_text(clean_text)
+    logger.debug(f'Bulunan e-postalar: {emails}')
+    
+    # İsimleri ayır
+    names = split_names(name_text)
+    logger.debug(f'Ayırılan isimler: {names}')
+    
+    pairs = []
+    for i, email in enumerate(emails):
+        # Eğer e-posta sayısı kadar isim varsa, eşleştir
+        # Yoksa mevcut isimleri tekrar kullan veya e-postadan isim oluştur
+        if i < len(names):
+            name = names[i]
+        elif names:
+            name = names[0]
+        else:
+            name = convert_email_to_name(email)
+        pairs.append((name, email))
+    return pairs
+
+# Dosya başına hücre önbelleğinin varsayılan boyutu (aynı hücre metni binlerce kez tekrarlanır)
+DEFAULT_CELL_CACHE_SIZE = 65536
+
+# iter_categorized_emails'ın row_filter'a tek seferde verdiği en fazla satır sayısı
+ROW_FILTER_BATCH = 500
+
+def _filter_rows(rows, row_filter):
+    """Boş olmayan satırları (satır, ayrıştırılsın mı) olarak döndürür; süzgeç satır gruplarına uygulanır"""
+    # Boş satırlar atlanır ve numaralandırılmaz (DictReader ile aynı)
+    if row_filter is None:
+        for row in rows:
+            if row:
+                yield row, True
+        return
+    batch = []
+    for row in rows:
+        if row:
+            batch.append(row)
+            if len(batch) == ROW_FILTER_BATCH:
+                yield from zip(batch, row_filter(batch))
+                batch = []
+    if batch:
+        yield from zip(batch, row_filter(batch))
+
+def iter_categorized_emails(stream, dedup_key='exact', stats=None, cache_size=DEFAULT_CELL_CACHE_SIZE, row_filter=None):
+    """CSV akışını satır satır okur ve her yeni e-posta için (kategori, kayıt) döndürür
+    
+    Akış metin ya da ikili (örn. Werkzeug yükleme akışı) olabilir; ikili akışlar
+    UTF-8 olarak okunur ve BOM karakteri atlanır. Bellekte yalnızca görülen
+    e-postaların anahtarları tutulur. stats sözlüğü verilirse okunan satır
+    sayısı 'rows', hücre önbelleği sayaçları 'cache_hits', 'cache_misses' ve
+    'cache_evictions' anahtarlarına yazılır.
+    
+    Aynı (adres, isim) hücre çifti için ayrıştırma sonucu cache_size kadar
+    girdi tutan bir LRU önbellekte saklanır; 0 önbelleği kapatır.
+    
+    row_filter verilirse satırlar (hücre listeleri) ona en fazla
+    ROW_FILTER_BATCH satırlık listeler halinde verilir; döndürdüğü bool
+    listesinde True olan satırlar ayrıştırılır, atlananlar yine sayılır ve
+    numaralandırılır.
+    """
+    key_func = get_dedup_key(dedup_key)
+    # Her kategori için görülen anahtarlar
+    seen_keys = {category: set() for category in CATEGORIES}
+    # Akışa özel hücre önbelleği; sayaçlar dosya başına raporlanır
+    cell_pairs = lru_cache(maxsize=cache_size)(extract_cell_pairs) if cache_size else extract_cell_pairs
+    
+    wrapper = None
+    if isinstance(stream.read(0), bytes):
+        wrapper = io.TextIOWrapper(stream, encoding='utf-8-sig')
+        stream = wrapper
+    
     try:
-        categorized_data = {
-            'Kimden': [],
-            'Kime': [],
-            'Bilgi': [],
-            'Gizli': []
-        }
+        reader = csv.reader(stream)
         
-        with open(file_path, 'r', encoding='utf-8-sig') as file:
-            reader = csv.DictReader(file)
-            
-            # CSV başlıklarını kontrol et
-            headers = reader.fieldnames
-            logger.debug(f'CSV başlıkları: {headers}')
-            
-            # Outlook CSV sütun isimleri
-            columns = {
-                'Kimden': {
-                    'email': 'Kimden: (Adres)',
-                    'name': 'Kimden: (Ad)'
-                },
-                'Kime': {
-                    'email': 'Kime: (Adres)',
-                    'name': 'Kime: (Ad)'
-                },
-                'Bilgi': {
-                    'email': 'Bilgi: (Adres)',
-                    'name': 'Bilgi: (Ad)'
-                },
-                'Gizli': {
-                    'email': 'Gizli: (Adres)',
-                    'name': 'Gizli: (Ad)'
-                }
-            }
-            
-            # Her satır için
-            for row_num, row in enumerate(reader, start=1):
-                try:
-                    # Her kategori için
-                    for category, column_info in columns.items():
-                        email_column = column_info['email']
-                        name_column = column_info['name']
-                        
-                        # E-posta ve isim bilgilerini al
-                        email_text = row.get(email_column, '').strip()
-                        name_text = row.get(name_column, '').strip()
-                        
-                        # İsmi formatla
-                        name_text = format_name(name_text)
-                        
-                        if email_text and not is_system_info(email_text):
-                            # E-posta metnini temizle
-                            clean_text = clean_email_text(email_text)
-                            logger.debug(f'Temizlenmiş metin: {clean_text}')
-                            
-                            # E-posta adreslerini bul
-                            emails = extract_emails_from_text(clean_text)
-                            logger.debug(f'Bulunan e-postalar: {emails}')
-                            
-                            # İsimleri ayır
-                            names = split_names(name_text)
-                            logger.debug(f'Ayırılan isimler: {names}')
-                            
-                            # Her e-posta için
-                            for i, email in enumerate(emails):
-                                # Eğer e-posta sayısı kadar isim varsa, eşleştir
-                                # Yoksa mevcut isimleri tekrar kullan veya e-postadan isim oluştur
-                                if i < len(names):
-                                    name = names[i]
-                                elif names:
-                                    name = names[0]
-                                else:
-                                    name = convert_email_to_name(email)
-                                
-                                email_data = {
-                                    'email': email,
-                                    'original_text': f"{name} <{email}>",
-                                    'name': name,
-                                    'row': row_num
-                                }
-                                
-                                # Tekrar kontrolü
-                                if not any(d['email'] == email for d in categorized_data[category]):
-                                    categorized_data[category].append(email_data)
-                except Exception as e:
-                    logger.error(f'Satır {row_num} işlenirken hata: {str(e)}')
-                    continue
+        # CSV başlıklarını kontrol et
+        headers = next(reader, None)
+        if headers is None:
+            return
+        if headers and headers[0].startswith('\ufeff'):
+            # BOM'u ayıklanmamış metin akışları için
+            headers[0] = headers[0][1:]
+        logger.debug(f'CSV başlıkları: {headers}')
         
-        # Boş kategorileri kaldır
-        result = {k: v for k, v in categorized_data.items() if v}
+        # Yalnızca kullanılan sütunlar okunur; indeksler başlıktan bir kez çözülür
+        projection = resolve_outlook_columns(headers)
         
-        if not result:
-            logger.warning('Hiç e-posta adresi bulunamadı')
+        # Her satır için
+        row_num = 0
+        for row, keep in _filter_rows(reader, row_filter):
+            row_num += 1
+            if stats is not None:
+                stats['rows'] = row_num
+            if not keep:
+                continue
+            try:
+                # Her kategori için
+                for category, email_index, name_index in projection:
+                    # E-posta ve isim bilgilerini al (eksik alanlı satırlar hata verir)
+                    email_text = row[email_index].strip() if email_index is not None else ''
+                    name_text = row[name_index].strip() if name_index is not None else ''
+                    
+                    # Her (isim, e-posta) çifti için
+                    for name, email in cell_pairs(email_text, name_text):
+                        # Tekrar kontrolü
+                        key = key_func(email)
+                        if key in seen_keys[category]:
+                            continue
+                        seen_keys[category].add(key)
+                        
+                        yield category, {
+                            'email': email,
+                            'original_text': f"{name} <{email}>",
+                            'name': name,
+                            'row': row_num
+                        }
+            except Exception as e:
+                logger.error(f'Satır {row_num} işlenirken hata: {str(e)}')
+                continue
+    finally:
+        # Çağıranın akışını kapatmadan sarmalayıcıyı ayır
+        if wrapper is not None:
+            wrapper.detach()
+        
+        if cache_size:
+            info = cell_pairs.cache_info()
+            # Her ıskalama bir girdi ekler; önbellek doluysa en eski girdi çıkarılır
+            evictions = info.misses - info.currsize
+            logger.info(
+                f'Hücre önbelleği: {info.hits} isabet, {info.misses} ıskalama, '
+                f'{evictions} çıkarma (boyut {info.currsize}/{cache_size})'
+            )
+            if stats is not None:
+                stats['cache_hits'] = info.hits
+                stats['cache_misses'] = info.misses
+                stats['cache_evictions'] = evictions
+
+# Paralel ayrıştırma için dosya başına en küçük boyut (daha küçük dosyalarda süreç maliyeti kazançtan büyük)
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+def _count_quotes(data, start, end, block_size=4 * 1024 * 1024):
+    """Aralıktaki tırnak işaretlerini sayar (mmap nesnelerinde count olmadığı için bloklar halinde)"""
+    quotes = 0
+    for pos in range(start, end, block_size):
+        quotes += data[pos:min(pos + block_size, end)].count(b'"')
+    return quotes
+
+def find_record_boundaries(data, parts):
+    """CSV verisini, tırnak içindeki çok satırlı alanları bölmeden yaklaşık eşit parçalara ayırır
+    
+    Bir satır sonu, kendisinden önceki tırnak işareti sayısı çift ise kayıt
+    sınırıdır (RFC 4180 tırnaklaması; Outlook dışa aktarımları bu biçimdedir).
+    İlk sınır başlık satırının sonudur. [başlık_sonu, ..., len(data)] döndürür.
+    """
+    size = len(data)
+    counted_to = 0
+    quotes = 0
+    
+    def next_boundary(pos):
+        nonlocal counted_to, quotes
+        while True:
+            newline = data.find(b'\n', pos)
+            if newline == -1:
+                return size
+            quotes += _count_quotes(data, counted_to, newline + 1)
+            counted_to = newline + 1
+            if quotes % 2 == 0:
+                return newline + 1
+            pos = newline + 1
+    
+    header_end = next_boundary(0)
+    boundaries = [header_end]
+    step = max((size - header_end) // max(parts, 1), 1)
+    target = header_end + step
+    while target < size:
+        boundary = next_boundary(max(target, counted_to))
+        if boundary >= size:
+            break
+        boundaries.append(boundary)
+        target = boundary + step
+    boundaries.append(size)
+    return boundaries
+
+def _parse_chunk(file_path, header_end, start, end, dedup_key, cache_size):
+    """Başlık ile birlikte dosyanın bir bayt aralığını ayrıştırır (süreç havuzunda çalışır)"""
+    with open(file_path, 'rb') as file:
+        header = file.read(header_end)
+        file.seek(start)
+        body = file.read(end - start)
+    
+    categorized_data = {category: [] for category in CATEGORIES}
+    stats = {'rows': 0}
+    chunk = io.BytesIO(header + body)
+    for category, email_data in iter_categorized_emails(chunk, dedup_key=dedup_key, stats=stats, cache_size=cache_size):
+        categorized_data[category].append(email_data)
+    return categorized_data, stats['rows']
+
+def _find_categorized_emails_parallel(file_path, dedup_key, workers, cache_size, stats):
+    """Dosyayı kayıt sınırlarından parçalara ayırıp süreç havuzunda ayrıştırır ve sonuçları birleştirir"""
+    with open(file_path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            # Yük dengesi için çekirdek başına birkaç parça
+            boundaries = find_record_boundaries(data, workers * 4)
+    
+    header_end = boundaries[0]
+    ranges = list(zip(boundaries, boundaries[1:]))
+    logger.info(f'Paralel ayrıştırma: {len(ranges)} parça, {workers} süreç')
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            _parse_chunk,
+            [file_path] * len(ranges),
+            [header_end] * len(ranges),
+            [start for start, _ in ranges],
+            [end for _, end in ranges],
+            [dedup_key] * len(ranges),
+            [cache_size] * len(ranges)
+        )
+        categorized_data, stats['rows'] = merge_categorized_chunks(results, dedup_key)
+    return categorized_data
+
+def merge_categorized_chunks(results, dedup_key='exact'):
+    """Sırayla ayrıştırılmış parçaların (kategorili kayıtlar, satır sayısı) sonuçlarını birleştirir
+    
+    Parçalar sırayla birleştirilir; ilk görülme sırası ve satır numaraları
+    sıralı ayrıştırmayla aynıdır. (kategorili kayıtlar, toplam satır) döndürür.
+    """
+    key_func = get_dedup_key(dedup_key)
+    categorized_data = {category: [] for category in CATEGORIES}
+    seen_keys = {category: set() for category in CATEGORIES}
+    row_offset = 0
+    for chunk_data, chunk_rows in results:
+        for category, data_list in chunk_data.items():
+            for email_data in data_list:
+                key = key_func(email_data['email'])
+                if key not in seen_keys[category]:
+                    seen_keys[category].add(key)
+                    email_data['row'] += row_offset
+                    categorized_data[category].append(email_data)
+        row_offset += chunk_rows
+    return categorized_data, row_offset
+
+# Ayrıştırma arka uçları: satır satır Python ('python') veya sütun tabanlı pandas ('pandas')
+BACKENDS = ('python', 'pandas')
+
+def _valid_email_mask(series):
+    """is_valid_email'in sütun üzerindeki vektörel karşılığı"""
+    return (
+        series.str.match(VALID_EMAIL_PATTERN)
+        & ~series.str.contains('/o=ExchangeLabs/', regex=False)
+        & ~series.str.contains('/ou=', regex=False)
+    )
+
+def _dedup_key_series(emails, dedup_key):
+    """Tekrar anahtarlarını sütun olarak hesaplar"""
+    if dedup_key == 'exact':
+        return emails
+    if dedup_key == 'casefold':
+        return emails.str.casefold()
+    key_func = get_dedup_key(dedup_key)
+    return emails.map(key_func)
+
+def _read_outlook_frame(file_path, engine):
+    """Outlook CSV dosyasından yalnızca adres/isim sütunlarını metin olarak okur
+    
+    Dönen DataFrame'in sütunları sütun indeksleridir; projeksiyon
+    resolve_outlook_columns ile aynıdır.
+    """
+    with open(file_path, 'r', encoding='utf-8-sig') as file:
+        headers = next(csv.reader(file), None)
+    if not headers:
+        return pd.DataFrame(), []
+    projection = resolve_outlook_columns(headers)
+    usecols = sorted({index for _, email_index, name_index in projection
+                      for index in (email_index, name_index) if index is not None})
+    if not usecols:
+        # Satır sayısı satır satır arka uçla aynı olsun diye boş olmayan kayıtlar sayılır
+        with open(file_path, 'r', encoding='utf-8-sig') as file:
+            rows = sum(1 for row in csv.reader(file) if row) - 1
+        return pd.DataFrame(index=pd.RangeIndex(rows)), projection
+    
+    if engine == 'pyarrow':
+        # pandas'ın pyarrow motoru çok satırlı tırnaklı alanları (ileti gövdeleri) desteklemediği
+        # için pyarrow.csv doğrudan kullanılır; sütunlara konumlarıyla ad verilir
+        names = [str(index) for index in range(len(headers))]
+        table = pyarrow_csv.read_csv(
+            file_path,
+            read_options=pyarrow_csv.ReadOptions(column_names=names, skip_rows=1, encoding='utf-8'),
+            parse_options=pyarrow_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pyarrow_csv.ConvertOptions(
+                include_columns=[names[index] for index in usecols],
+                column_types={names[index]: pyarrow.string() for index in usecols},
+                strings_can_be_null=False,
+                quoted_strings_can_be_null=False
+            )
+        )
+        df = table.to_pandas()
+        # Metin kipinde açılan dosyalardaki evrensel satır sonu dönüşümü
+        df = df.apply(lambda column: column.str.replace('\r\n', '\n', regex=False).str.replace('\r', '\n', regex=False))
+    else:
+        # Metin kipinde okunur; tırnaklı alanlardaki satır sonları Python yoluyla aynı olur
+        with open(file_path, 'r', encoding='utf-8-sig') as file:
+            df = pd.read_csv(file, engine='c', usecols=usecols, dtype=str, keep_default_na=False, na_filter=False)
+    df.columns = usecols
+    return df, projection
+
+def _categorize_frame(email_texts, name_texts, dedup_key):
+    """Bir kategorinin ham adres ve isim sütunlarından tekrarsız kayıt listesini üretir
+    
+    Satır başına işlemler (boşluk kırpma, sistem bilgisi kontrolü, temizleme)
+    benzersiz hücre değerleri üzerinde bir kez yapılır ve satırlara kodlarla geri eşlenir.
+    """
+    email_codes, email_cells = pd.factorize(email_texts)
+    email_cells = pd.Series(email_cells, dtype=object).str.strip()
+    # Sistem bilgisi içermeyen dolu adres hücreleri
+    usable = (email_cells != '') & ~email_cells.str.lower().str.contains(_SYSTEM_INFO_RE.pattern, regex=True)
+    mask = usable.to_numpy()[email_codes]
+    if not mask.any():
+        return []
+    name_codes, name_cells = pd.factorize(name_texts)
+    name_cells = pd.Series(name_cells, dtype=object).str.strip()
+    rows = pd.DataFrame({
+        'row': email_texts.index[mask] + 1,
+        'email_cell': email_codes[mask],
+        'name_cell': name_codes[mask]
+    })
+    
+    # Temizleme her benzersiz hücre için bir kez yapılır, adresler sütun üzerinde çıkarılır
+    cleaned = email_cells[usable].map(clean_email_text)
+    found = cleaned.str.extractall(f'({EMAIL_FIND_PATTERN})')[0]
+    found = found[_valid_email_mask(found)]
+    cell_emails = pd.DataFrame({
+        'email_cell': found.index.get_level_values(0),
+        'pos': found.groupby(level=0).cumcount().to_numpy(),
+        'email': found.to_numpy()
+    })
+    # Hiç adres bulunamayan hücrelerde metnin tamamı geçerli bir adres olabilir
+    missing = cleaned[~cleaned.index.isin(cell_emails['email_cell'])]
+    missing = missing[_valid_email_mask(missing)]
+    if len(missing):
+        cell_emails = pd.concat([cell_emails, pd.DataFrame({
+            'email_cell': missing.index,
+            'pos': 0,
+            'email': missing.to_numpy()
+        })], ignore_index=True)
+    
+    records = rows.merge(cell_emails, on='email_cell', how='inner')
+    if records.empty:
+        return []
+    records = records.sort_values(['row', 'pos'], kind='stable')
+    
+    # Tekrar kontrolü (ilk görülen kayıt kalır)
+    records = records[~_dedup_key_series(records['email'], dedup_key).duplicated()]
+    
+    # İsim eşleştirme: aynı sıradaki isim, yoksa ilk isim, o da yoksa e-postadan türetilen isim
+    names = name_cells.map(lambda text: split_names(format_name(text))).explode().dropna()
+    names = pd.DataFrame({
+        'name_cell': names.index,
+        'pos': names.groupby(level=0).cumcount().to_numpy(),
+        'name': names.to_numpy()
+    })
+    records = records.merge(names, on=['name_cell', 'pos'], how='left')
+    first_names = names[names['pos'] == 0].set_index('name_cell')['name']
+    name = records['name'].astype(object)
+    name = name.where(name.notna(), records['name_cell'].map(first_names))
+    no_name = name.isna()
+    if no_name.any():
+        derived = {email: convert_email_to_name(email) for email in records.loc[no_name, 'email'].unique()}
+        name = name.where(~no_name, records['email'].map(derived))
+    records['name'] = name
+    
+    records['original_text'] = records['name'] + ' <' + records['email'] + '>'
+    return records[['email', 'original_text', 'name', 'row']].to_dict('records')
+
+def _find_categorized_emails_pandas(file_path, dedup_key, stats, engine=None):
+    """Sütun tabanlı arka uç: yalnızca adres/isim sütunlarını okuyup vektörel işlemlerle kategorize eder
+    
+    Sonuç satır satır arka uçla aynıdır. Bunun için her kaydın başlıktaki tüm
+    alanları içermesi ve yalnızca boşluktan oluşan satır bulunmaması gerekir;
+    Outlook dışa aktarımları bu biçimdedir.
+    
+    Satır satır arka uçtan hızlı değildir: sürenin çoğu benzersiz hücrelerdeki
+    clean_email_text çağrılarıdır ve bu adımlar .str ile vektörleştirilince
+    (object sütunlarda yine eleman başına Python) daha yavaş çalışır;
+    satır satır arka uç da aynı hücreleri önbellekten bir kez temizler.
+    """
+    if engine is None:
+        engine = 'pyarrow' if PYARROW_AVAILABLE else 'c'
+    df, projection = _read_outlook_frame(file_path, engine)
+    logger.debug(f'Sütun tabanlı okuma: {len(df)} satır, motor: {engine}')
+    stats['rows'] = len(df)
+    
+    categorized_data = {category: [] for category in CATEGORIES}
+    if df.empty:
+        return categorized_data
+    empty = pd.Series('', index=df.index)
+    for category, email_index, name_index in projection:
+        email_texts = df[email_index] if email_index is not None else empty
+        name_texts = df[name_index] if name_index is not None else empty
+        categorized_data[category] = _categorize_frame(email_texts, name_texts, dedup_key)
+    return categorized_data
+
+def find_categorized_emails_in_file(file_path, dedup_key='exact', workers=1, backend='python',
+                                    cache_size=DEFAULT_CELL_CACHE_SIZE, stats=None):
+    """Outlook CSV dosyasındaki e-postaları kategorilere ayırarak döndürür
+    
+    workers 1'den büyükse (None ise çekirdek sayısı kadar) büyük dosyalar
+    parçalara ayrılıp süreç havuzunda ayrıştırılır; sonuç sıralı ayrıştırmayla aynıdır.
+    backend='pandas' sütun tabanlı arka ucu seçer. cache_size satır satır
+    arka uçtaki hücre önbelleğinin boyutudur. stats sözlüğü verilirse okunan
+    satır sayısı 'rows' anahtarına yazılır.
+    """
+    key_func = get_dedup_key(dedup_key)
+    if backend not in BACKENDS:
+        raise ValueError(f'Geçersiz arka uç: {backend}')
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if stats is None:
+        stats = {}
+    stats['rows'] = 0
+    try:
+        if backend == 'pandas':
+            categorized_data = _find_categorized_emails_pandas(file_path, dedup_key, stats)
+        elif workers > 1 and os.path.getsize(file_path) >= PARALLEL_MIN_BYTES:
+            categorized_data = _find_categorized_emails_parallel(file_path, dedup_key, workers, cache_size, stats)
         else:
-            logger.info(f'Toplam {sum(len(v) for v in result.values())} e-posta adresi bulundu')
-            for category, data in result.items():
-                logger.info(f'{category}: {len(data)} e-posta')
+            with open(file_path, 'r', encoding='utf-8-sig') as file:
+                categorized_data = _collect_categorized_emails(file, key_func, cache_size, stats)
         
-        return result
+        return _drop_empty_categories(categorized_data)
         
     except Exception as e:
         logger.error(f'Dosya işleme hatası: {str(e)}')
         return {}
 
+def find_categorized_emails_in_stream(stream, dedup_key='exact', cache_size=DEFAULT_CELL_CACHE_SIZE, stats=None):
+    """Outlook CSV akışındaki (örn. yükleme akışı) e-postaları diske yazmadan kategorilere ayırır
+    
+    Sonuç find_categorized_emails_in_file ile aynıdır; ikili akışlar UTF-8
+    olarak çözülür ve BOM karakteri okuma sırasında atlanır.
+    """
+    key_func = get_dedup_key(dedup_key)
+    if stats is None:
+        stats = {}
+    stats['rows'] = 0
+    try:
+        return _drop_empty_categories(_collect_categorized_emails(stream, key_func, cache_size, stats))
+    except Exception as e:
+        logger.error(f'Akış işleme hatası: {str(e)}')
+        return {}
+
+def _collect_categorized_emails(stream, key_func, cache_size, stats):
+    """Akıştaki kayıtları kategori listelerine toplar"""
+    categorized_data = {category: [] for category in CATEGORIES}
+    for category, email_data in iter_categorized_emails(stream, dedup_key=key_func, stats=stats,
+                                                        cache_size=cache_size):
+        categorized_data[category].append(email_data)
+    return categorized_data
+
+def _drop_empty_categories(categorized_data):
+    """Boş kategorileri kaldırır ve bulunan e-posta sayılarını günlüğe yazar"""
+    result = {k: v for k, v in categorized_data.items() if v}
+    
+    if not result:
+        logger.warning('Hiç e-posta adresi bulunamadı')
+    else:
+        logger.info(f'Toplam {sum(len(v) for v in result.values())} e-posta adresi bulundu')
+        for category, data in result.items():
+            logger.info(f'{category}: {len(data)} e-posta')
+    
+    return result
+
 if __name__ == "__main__":
     # Dosya adını komut satırından al veya varsayılan kullan
     file_path = sys.argv[1] if len(sys.argv) > 1 else "outlook111.CSV"
+    # İsteğe bağlı ikinci argüman: ayrıştırma süreç sayısı
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 1
     print(f"Dosya işleniyor: {file_path}")
     
     # Dosyanın varlığını kontrol et
@@ -322,7 +902,7 @@ if __name__ == "__main__":
                 break
                 
     print("\nE-posta adresleri aranıyor...")
-    results = find_categorized_emails_in_file(file_path)
+    results = find_categorized_emails_in_file(file_path, workers=workers)
     
     if results:
         print("\nBulunan e-postalar:")
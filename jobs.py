@@ -0,0 +1,214 @@
+"""Uzun süren dışa aktarmalar için disk tabanlı arka plan işleri
+
+Her iş kök dizin altında kendi dizininde tutulur: status.json (durum ve
+ilerleme), job.json (tür, seçenekler, girdiler), inputs/ (yüklenen dosyalar),
+job.log ve sonuç dosyası. Durum diskte olduğundan işi hangi gunicorn işçisi
+başlatmış olursa olsun tüm işçiler sorgulayabilir.
+
+İşler ayrı bir Python sürecinde (`python jobs.py <iş dizini>`) çalışır; uzun
+bir ayrıştırma işçinin zaman aşımına takılmaz ve bittiğinde belleği geri
+verilir. Süreçleri başlatıp bekleyen iş parçacıkları sınırlı bir havuzdadır.
+Biten işlerin sonuçları belirli bir süre (TTL) sonra silinir.
+"""
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from exports import ExportError, run_export, save_uploads
+from writers import OUTPUT_FORMATS
+
+logger = logging.getLogger(__name__)
+
+JOBS_SCRIPT = os.path.abspath(__file__)
+FINISHED_STATES = ('done', 'failed')
+# Süreç çökerse job.log dosyasının son kaç baytı hata olarak kaydedilir
+LOG_TAIL_BYTES = 2000
+
+_JOB_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+class JobStore:
+    """İşlerin girdilerini, durumlarını ve sonuçlarını disk üzerinde tutar"""
+
+    def __init__(self, root, result_ttl=3600, max_age=86400):
+        self.root = root
+        # Biten işlerin sonuçlarının saklanma süresi (saniye)
+        self.result_ttl = result_ttl
+        # Bitmeyen (örn. süreci öldürülmüş) işlerin en uzun ömrü (saniye)
+        self.max_age = max_age
+        os.makedirs(root, exist_ok=True)
+
+    def job_dir(self, job_id):
+        """İş dizininin yolunu döndürür; geçersiz kimliklerde None döner"""
+        if not job_id or not _JOB_ID_RE.match(job_id):
+            return None
+        return os.path.join(self.root, job_id)
+
+    def create(self, export_type, files, options):
+        """Yüklenen dosyaları iş dizinine kaydeder ve 'queued' durumunda yeni bir iş oluşturur"""
+        job_id = uuid.uuid4().hex
+        inputs_dir = os.path.join(self.job_dir(job_id), 'inputs')
+        os.makedirs(inputs_dir)
+        inputs = save_uploads(files, inputs_dir)
+
+        self._write_json(job_id, 'job.json', {'type': export_type, 'options': options, 'inputs': inputs})
+        now = time.time()
+        status = {
+            'id': job_id,
+            'type': export_type,
+            'state': 'queued',
+            'stage': None,
+            'progress': 0,
+            'error': None,
+            'created_at': now,
+            'updated_at': now,
+            'started_at': None,
+            'finished_at': None
+        }
+        self._write_json(job_id, 'status.json', status)
+        return status
+
+    def load_job(self, job_id):
+        return self._read_json(job_id, 'job.json')
+
+    def load_status(self, job_id):
+        """İşin durumunu döndürür; iş yoksa None döner"""
+        return self._read_json(job_id, 'status.json')
+
+    def update_status(self, job_id, **fields):
+        """Durum alanlarını günceller (dosya atomik olarak değiştirilir)"""
+        status = self.load_status(job_id) or {'id': job_id}
+        status.update(fields)
+        status['updated_at'] = time.time()
+        self._write_json(job_id, 'status.json', status)
+        return status
+
+    def result_path(self, job_id):
+        """Tamamlanmış işin sonuç dosyasının yolunu döndürür"""
+        status = self.load_status(job_id)
+        if not status or status.get('state') != 'done':
+            return None
+        return os.path.join(self.job_dir(job_id), status['result_file'])
+
+    def cleanup_expired(self, now=None):
+        """Süresi dolan işlerin dizinlerini siler; silinen iş sayısını döndürür"""
+        now = now or time.time()
+        removed = 0
+        for job_id in os.listdir(self.root):
+            job_dir = self.job_dir(job_id)
+            if job_dir is None:
+                continue
+            status = self.load_status(job_id)
+            if status and status.get('state') in FINISHED_STATES:
+                expired = (status.get('finished_at') or 0) + self.result_ttl < now
+            elif status:
+                expired = status.get('created_at', 0) + self.max_age < now
+            else:
+                # Durum dosyası olmayan yarım kalmış dizinler
+                expired = os.path.getmtime(job_dir) + self.max_age < now
+            if expired:
+                shutil.rmtree(job_dir, ignore_errors=True)
+                removed += 1
+        if removed:
+            logger.info(f'{removed} süresi dolmuş iş silindi')
+        return removed
+
+    def _read_json(self, job_id, name):
+        job_dir = self.job_dir(job_id)
+        if job_dir is None:
+            return None
+        try:
+            with open(os.path.join(job_dir, name), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_json(self, job_id, name, data):
+        path = os.path.join(self.job_dir(job_id), name)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+class JobRunner:
+    """İşleri sınırlı sayıda ayrı süreçte çalıştırır"""
+
+    def __init__(self, store, max_workers=2):
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+
+    def submit(self, job_id):
+        return self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id):
+        job_dir = self.store.job_dir(job_id)
+        log_path = os.path.join(job_dir, 'job.log')
+        try:
+            with open(log_path, 'ab') as log:
+                returncode = subprocess.call([sys.executable, JOBS_SCRIPT, job_dir], stdout=log, stderr=log)
+        except Exception as e:
+            logger.error(f'İş başlatılamadı ({job_id}): {str(e)}')
+            returncode = None
+
+        # Süreç durumu yazamadan çöktüyse iş başarısız sayılır
+        status = self.store.load_status(job_id)
+        if status and status.get('state') not in FINISHED_STATES:
+            logger.error(f'İş süreci beklenmedik şekilde sonlandı ({job_id}): {returncode}')
+            self.store.update_status(job_id, state='failed', finished_at=time.time(),
+                                     error=f'İş süreci beklenmedik şekilde sonlandı: {_log_tail(log_path)}')
+
+def _log_tail(log_path):
+    try:
+        with open(log_path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(f.tell() - LOG_TAIL_BYTES, 0))
+            return f.read().decode('utf-8', errors='replace').strip()
+    except OSError:
+        return ''
+
+def run_job(job_dir):
+    """İş dizinindeki işi çalıştırır ve sonucunu durum dosyasına yazar (iş sürecinde çağrılır)"""
+    store = JobStore(os.path.dirname(job_dir))
+    job_id = os.path.basename(job_dir)
+    job = store.load_job(job_id)
+    options = job['options']
+    output_format = options['output_format']
+    output_path = os.path.join(job_dir, f"sonuc.{OUTPUT_FORMATS[output_format]['extension']}")
+    inputs = {field: [(name, path) for name, path in items] for field, items in job['inputs'].items()}
+
+    store.update_status(job_id, state='running', started_at=time.time())
+    try:
+        summary = run_export(job['type'], inputs, output_path, options,
+                             progress=lambda stage, percent: store.update_status(job_id, stage=stage, progress=percent))
+        store.update_status(
+            job_id,
+            state='done',
+            stage=None,
+            progress=100,
+            finished_at=time.time(),
+            rows=summary['rows'],
+            result_file=os.path.basename(output_path),
+            download_name=f"{options['excel_name']}.{OUTPUT_FORMATS[output_format]['extension']}",
+            mimetype=OUTPUT_FORMATS[output_format]['mimetype']
+        )
+    except ExportError as e:
+        logger.error(f'İş hatası ({job_id}): {e.message}')
+        store.update_status(job_id, state='failed', finished_at=time.time(), error=e.message)
+    except Exception as e:
+        logger.error(f'İş hatası ({job_id}): {str(e)}')
+        logger.error(traceback.format_exc())
+        store.update_status(job_id, state='failed', finished_at=time.time(), error=f'Hata oluştu: {str(e)}')
+    finally:
+        # Girdiler yalnızca iş süresince gerekir
+        shutil.rmtree(os.path.join(job_dir, 'inputs'), ignore_errors=True)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    run_job(sys.argv[1])
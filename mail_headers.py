@@ -0,0 +1,283 @@
+"""mbox arşivlerinden ve .eml dosyalarından yalnızca adres başlıklarını okuyan ayrıştırıcı
+
+Outlook CSV'si yerine e-posta arşivi olan ekipler için: her iletinin From,
+To, Cc ve Bcc başlıkları standart kütüphanenin e-posta ayrıştırıcısıyla
+okunur ve Outlook CSV'sindeki gibi Kimden, Kime, Bilgi, Gizli kategorili
+kayıtlar üretilir (aynı temizleme, doğrulama ve tekrar kontrolüyle). Satır
+numarası yerine ileti sırası kullanılır.
+
+Başlık bloğu ilk boş satırda biter; ileti gövdeleri ayrıştırılmaz. .eml
+dosyalarında okuma boş satırda durur. mbox dosyaları mmap ile açılır ve
+sonraki iletinin başı ('From ' satırı) bayt aramasıyla bulunur; çok GB'lık
+dosyalar belleğe alınmadan işlenir. Birden çok dosya ve büyük mbox
+dosyalarının parçaları süreç havuzunda paralel ayrıştırılır.
+"""
+import logging
+import math
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from email.header import decode_header, make_header
+from email.parser import HeaderParser
+from email.policy import compat32
+from email.utils import getaddresses
+from functools import lru_cache
+
+from find_emails import (extract_cell_pairs, get_dedup_key, merge_categorized_chunks, CATEGORIES,
+                         DEFAULT_CELL_CACHE_SIZE, PARALLEL_MIN_BYTES)
+
+logger = logging.getLogger(__name__)
+
+MAIL_EXTENSIONS = ('.eml', '.mbox')
+# Kategori -> adres başlığı
+HEADER_CATEGORIES = (('Kimden', 'From'), ('Kime', 'To'), ('Bilgi', 'Cc'), ('Gizli', 'Bcc'))
+
+def is_mail_file(filename):
+    """.eml ya da .mbox dosyası mı"""
+    return filename.lower().endswith(MAIL_EXTENSIONS)
+
+def _decode_name(name):
+    """RFC 2047 kodlu görünen adı (=?utf-8?...?=) çözer"""
+    if '=?' not in name:
+        return name
+    try:
+        return str(make_header(decode_header(name)))
+    except Exception:
+        return name
+
+def read_eml_headers(stream):
+    """.eml akışının başlık bloğunu okur; ilk boş satırda durur"""
+    lines = []
+    for line in stream:
+        if line in (b'\n', b'\r\n'):
+            break
+        lines.append(line)
+    return b''.join(lines)
+
+def iter_mbox_headers_stream(stream):
+    """mbox akışındaki iletilerin başlık bloklarını üretir; gövde satırları ayrıştırılmadan atlanır"""
+    header = None
+    for line in stream:
+        if line.startswith(b'From '):
+            # Boş satırı olmayan (gövdesiz) önceki ileti
+            if header is not None:
+                yield b''.join(header)
+            header = []
+        elif header is not None:
+            if line in (b'\n', b'\r\n'):
+                yield b''.join(header)
+                header = None
+            else:
+                header.append(line)
+    if header is not None:
+        yield b''.join(header)
+
+def _next_message(data, pos, end):
+    """pos'tan sonra satır başındaki ilk 'From ' ayıracının konumu; yoksa end"""
+    index = data.find(b'\nFrom ', max(pos - 1, 0), end)
+    return end if index == -1 else index + 1
+
+def iter_mbox_headers(data, start=0, end=None):
+    """mmap'lenmiş mbox verisinin [start, end) aralığındaki iletilerin başlık bloklarını üretir
+
+    start bir ileti başı ya da dosya başı olmalıdır; ilk 'From ' satırından
+    önceki veri atlanır.
+    """
+    end = len(data) if end is None else end
+    pos = start if data[start:start + 5] == b'From ' else _next_message(data, start, end)
+    while pos < end:
+        # 'From ' zarf satırı başlıklara dahil değildir
+        header_start = data.find(b'\n', pos, end) + 1 or end
+        next_pos = _next_message(data, header_start, end)
+        header_end = next_pos
+        for blank_line in (b'\n\n', b'\n\r\n'):
+            index = data.find(blank_line, header_start - 1, next_pos)
+            if index != -1:
+                header_end = min(header_end, index + 1)
+        yield data[header_start:header_end]
+        pos = next_pos
+
+def find_message_boundaries(data, parts):
+    """mbox verisini ileti sınırlarından yaklaşık eşit parçalara ayırır; [0, ..., len(data)] döndürür"""
+    size = len(data)
+    step = max(size // max(parts, 1), 1)
+    boundaries = [0]
+    target = step
+    while target < size:
+        boundary = _next_message(data, target, size)
+        if boundary >= size:
+            break
+        boundaries.append(boundary)
+        target = boundary + step
+    boundaries.append(size)
+    return boundaries
+
+def iter_mail_header_blocks(stream, filename):
+    """.eml ya da .mbox akışının başlık bloklarını dosya adının uzantısına göre üretir"""
+    if filename.lower().endswith('.mbox'):
+        return iter_mbox_headers_stream(stream)
+    return iter([read_eml_headers(stream)])
+
+def _header_pairs(value):
+    """Adres başlığı değerinden (isim, e-posta) çiftlerini Outlook hücreleriyle aynı kurallarla çıkarır"""
+    pairs = []
+    for display_name, address in getaddresses([value]):
+        pairs.extend(extract_cell_pairs(address, _decode_name(display_name)))
+    return pairs
+
+def iter_header_records(header_blocks, dedup_key='exact', stats=None, cache_size=DEFAULT_CELL_CACHE_SIZE):
+    """Başlık bloklarındaki adreslerden her yeni e-posta için (kategori, kayıt) döndürür
+
+    Kayıtlar iter_categorized_emails ile aynı biçimdedir; 'row' ileti
+    sırasıdır. stats sözlüğü verilirse ileti sayısı 'rows' anahtarına yazılır.
+    """
+    key_func = get_dedup_key(dedup_key)
+    seen_keys = {category: set() for category in CATEGORIES}
+    # Aynı başlık değeri (örn. aynı gönderen) binlerce iletide tekrarlanır
+    header_pairs = lru_cache(maxsize=cache_size)(_header_pairs) if cache_size else _header_pairs
+    parser = HeaderParser(policy=compat32)
+
+    message_num = 0
+    for block in header_blocks:
+        message_num += 1
+        if stats is not None:
+            stats['rows'] = message_num
+        try:
+            headers = parser.parsestr(bytes(block).decode('utf-8', errors='replace'))
+            for category, header_name in HEADER_CATEGORIES:
+                values = headers.get_all(header_name)
+                if not values:
+                    continue
+                for value in values:
+                    for name, email in header_pairs(value):
+                        key = key_func(email)
+                        if key in seen_keys[category]:
+                            continue
+                        seen_keys[category].add(key)
+
+                        yield category, {
+                            'email': email,
+                            'original_text': f"{name} <{email}>",
+                            'name': name,
+                            'row': message_num
+                        }
+        except Exception as e:
+            logger.error(f'İleti {message_num} işlenirken hata: {str(e)}')
+            continue
+
+def find_mail_files(paths):
+    """Yollardaki .eml ve .mbox dosyalarını listeler; dizinler özyinelemeli ve sıralı taranır"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, subdirectories, names in os.walk(path):
+                subdirectories.sort()
+                files.extend(os.path.join(directory, name) for name in sorted(names) if is_mail_file(name))
+        else:
+            files.append(path)
+    return files
+
+def _mail_units(files, workers):
+    """Dosyaları süreçlere dağıtılacak sıralı işlere böler
+
+    Büyük mbox dosyaları ileti sınırlarından parçalara ayrılır; ardışık
+    .eml dosyaları gruplanır. İş: (tür, yollar, başlangıç, bitiş).
+    """
+    eml_count = sum(1 for path in files if not path.lower().endswith('.mbox'))
+    # Yük dengesi için çekirdek başına birkaç iş
+    batch_size = max(math.ceil(eml_count / (workers * 4)), 1)
+    units = []
+    batch = []
+    for path in files:
+        if not path.lower().endswith('.mbox'):
+            batch.append(path)
+            if len(batch) >= batch_size:
+                units.append(('eml', batch, 0, None))
+                batch = []
+            continue
+        if batch:
+            units.append(('eml', batch, 0, None))
+            batch = []
+        size = os.path.getsize(path)
+        if workers > 1 and size >= PARALLEL_MIN_BYTES:
+            with open(path, 'rb') as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    boundaries = find_message_boundaries(data, workers * 4)
+            units.extend(('mbox', [path], start, end) for start, end in zip(boundaries, boundaries[1:]))
+        else:
+            units.append(('mbox', [path], 0, None))
+    if batch:
+        units.append(('eml', batch, 0, None))
+    return units
+
+def _iter_unit_blocks(kind, paths, start, end):
+    if kind == 'eml':
+        for path in paths:
+            with open(path, 'rb') as file:
+                yield read_eml_headers(file)
+        return
+    path, = paths
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for block in iter_mbox_headers(data, start, end):
+                yield block
+
+def _parse_mail_unit(unit, dedup_key, cache_size):
+    """Bir işi (.eml grubu ya da mbox aralığı) ayrıştırır (süreç havuzunda çalışır)"""
+    categorized_data = {category: [] for category in CATEGORIES}
+    stats = {'rows': 0}
+    for category, email_data in iter_header_records(_iter_unit_blocks(*unit), dedup_key=dedup_key, stats=stats,
+                                                    cache_size=cache_size):
+        categorized_data[category].append(email_data)
+    return categorized_data, stats['rows']
+
+def find_categorized_emails_in_mail(paths, dedup_key='exact', workers=1, cache_size=DEFAULT_CELL_CACHE_SIZE,
+                                    stats=None):
+    """mbox ve .eml dosyalarındaki (dizinler dahil) adresleri kategorilere ayırarak döndürür
+
+    Sonuç find_categorized_emails_in_file ile aynı biçimdedir. workers 1'den
+    büyükse (None ise çekirdek sayısı kadar) dosyalar ve büyük mbox
+    parçaları süreç havuzunda ayrıştırılır; sonuç sıralı ayrıştırmayla
+    aynıdır. stats sözlüğü verilirse ileti sayısı 'rows' anahtarına yazılır.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if stats is None:
+        stats = {}
+    stats['rows'] = 0
+    try:
+        units = _mail_units(find_mail_files(paths), workers)
+        if workers > 1 and len(units) > 1:
+            logger.info(f'Paralel başlık ayrıştırma: {len(units)} iş, {workers} süreç')
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(_parse_mail_unit, units, [dedup_key] * len(units),
+                                       [cache_size] * len(units))
+                categorized_data, stats['rows'] = merge_categorized_chunks(results, dedup_key)
+        else:
+            results = (_parse_mail_unit(unit, dedup_key, cache_size) for unit in units)
+            categorized_data, stats['rows'] = merge_categorized_chunks(results, dedup_key)
+
+        result = {category: data for category, data in categorized_data.items() if data}
+        logger.info(f'{stats["rows"]} iletide toplam {sum(len(data) for data in result.values())} e-posta adresi bulundu')
+        return result
+
+    except Exception as e:
+        logger.error(f'E-posta arşivi işleme hatası: {str(e)}')
+        return {}
+
+if __name__ == '__main__':
+    # Kullanım: python mail_headers.py <mbox/.eml dosyası ya da dizin>... [-j süreç_sayısı]
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    arguments = sys.argv[1:]
+    workers = 1
+    if '-j' in arguments:
+        index = arguments.index('-j')
+        workers = int(arguments[index + 1])
+        del arguments[index:index + 2]
+    for category, data in find_categorized_emails_in_mail(arguments, workers=workers).items():
+        print(f'{category}: {len(data)} e-posta')
+        for email_data in data[:5]:
+            print(f'  {email_data["original_text"]}')
@@ -0,0 +1,189 @@
+"""İstek aşama süreleri, Server-Timing başlığı ve Prometheus biçiminde metrikler
+
+Uç noktalar işlerini `stage('ad')` blokları içinde yapar. Aynı isimli
+aşamaların süreleri istek boyunca toplanır; istek sonunda `finish_request`
+bunları Server-Timing başlığına yazar ve histogramlara ekler.
+
+Metrikler süreç başınadır; gunicorn her işçi için ayrı bir kayıt tutar.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, has_app_context
+
+# Süre histogramı sınırları (saniye)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+# Satır/sn ve bayt/sn histogramı sınırları
+ROWS_PER_SECOND_BUCKETS = (100, 1000, 5000, 10000, 50000, 100000, 500000, 1000000)
+BYTES_PER_SECOND_BUCKETS = (1e4, 1e5, 1e6, 5e6, 1e7, 5e7, 1e8, 1e9)
+
+class Histogram:
+    """Etiketli, birikimli (cumulative) Prometheus histogramı"""
+
+    def __init__(self, name, help_text, buckets, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.label_names = tuple(label_names)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[label]) for label in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['counts'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self):
+        """Histogramı Prometheus metin biçiminde döndürür"""
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                labels = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, key))
+                prefix = f'{labels},' if labels else ''
+                for bound, count in zip(self.buckets, series['counts']):
+                    lines.append(f'{self.name}_bucket{{{prefix}le="{_format_number(bound)}"}} {count}')
+                lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {series["count"]}')
+                lines.append(f'{self.name}_sum{{{labels}}} {series["sum"]}')
+                lines.append(f'{self.name}_count{{{labels}}} {series["count"]}')
+        return '\n'.join(lines)
+
+class Counter:
+    """Etiketli Prometheus sayacı"""
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[label]) for label in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        """Sayacı Prometheus metin biçiminde döndürür"""
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                labels = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, key))
+                lines.append(f'{self.name}{{{labels}}} {value}')
+        return '\n'.join(lines)
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_number(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+STAGE_DURATION = Histogram(
+    'outlook_stage_duration_seconds',
+    'Uç nokta işlem aşamalarının süresi (saniye)',
+    DURATION_BUCKETS,
+    ('endpoint', 'stage')
+)
+ROWS_PER_SECOND = Histogram(
+    'outlook_rows_per_second',
+    'İstek başına işlenen girdi satırı hızı',
+    ROWS_PER_SECOND_BUCKETS,
+    ('endpoint',)
+)
+BYTES_PER_SECOND = Histogram(
+    'outlook_bytes_per_second',
+    'İstek başına işlenen yükleme baytı hızı',
+    BYTES_PER_SECOND_BUCKETS,
+    ('endpoint',)
+)
+
+CACHE_REQUESTS = Counter(
+    'outlook_result_cache_requests_total',
+    'Sonuç önbelleği sorguları (result: hit/miss)',
+    ('endpoint', 'result')
+)
+
+REGISTRY = [STAGE_DURATION, ROWS_PER_SECOND, BYTES_PER_SECOND, CACHE_REQUESTS]
+
+# İstek dışında (örn. süreç havuzunda) toplanan aşama süreleri
+_collected_timings = None
+
+def start_request():
+    """İsteğin başlangıç zamanını kaydeder"""
+    g.request_start = time.perf_counter()
+    g.stage_timings = {}
+
+@contextmanager
+def stage(name):
+    """Bloğun süresini isteğin aşama sürelerine ekler
+
+    İstek dışında süreler yalnızca collect_stage_timings bloğu içinde toplanır.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if has_app_context():
+            timings = g.setdefault('stage_timings', {})
+        else:
+            timings = _collected_timings
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+@contextmanager
+def collect_stage_timings():
+    """İstek dışında çalışan koddaki aşama sürelerini bir sözlükte toplar"""
+    global _collected_timings
+    _collected_timings = {}
+    try:
+        yield _collected_timings
+    finally:
+        _collected_timings = None
+
+def add_stage_timings(timings):
+    """Başka bir süreçte toplanan aşama sürelerini isteğin sürelerine ekler"""
+    stage_timings = g.setdefault('stage_timings', {})
+    for name, seconds in timings.items():
+        stage_timings[name] = stage_timings.get(name, 0.0) + seconds
+
+def record_throughput(rows, nbytes):
+    """İsteğin işlediği girdi satırı ve bayt sayısını kaydeder"""
+    g.throughput = (rows, nbytes)
+
+def finish_request(response, endpoint):
+    """Server-Timing başlığını ekler ve isteğin metriklerini histogramlara işler"""
+    timings = g.get('stage_timings')
+    request_start = g.get('request_start')
+    if not timings or request_start is None:
+        return response
+
+    total = time.perf_counter() - request_start
+    entries = [f'{name};dur={seconds * 1000:.1f}' for name, seconds in timings.items()]
+    entries.append(f'total;dur={total * 1000:.1f}')
+    response.headers['Server-Timing'] = ', '.join(entries)
+
+    for name, seconds in timings.items():
+        STAGE_DURATION.observe(seconds, endpoint=endpoint, stage=name)
+    STAGE_DURATION.observe(total, endpoint=endpoint, stage='total')
+
+    throughput = g.get('throughput')
+    if throughput and response.status_code == 200 and total > 0:
+        rows, nbytes = throughput
+        ROWS_PER_SECOND.observe(rows / total, endpoint=endpoint)
+        BYTES_PER_SECOND.observe(nbytes / total, endpoint=endpoint)
+    return response
+
+def record_cache_result(endpoint, hit):
+    """Sonuç önbelleği isabetini ya da ıskasını sayar"""
+    CACHE_REQUESTS.inc(endpoint=endpoint, result='hit' if hit else 'miss')
+
+def render_metrics():
+    """Tüm metrikleri Prometheus metin biçiminde döndürür"""
+    return '\n'.join(metric.render() for metric in REGISTRY) + '\n'
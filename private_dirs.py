@@ -0,0 +1,23 @@
+"""Paylaşılan geçici dizin (/tmp) altındaki uygulama dizinleri
+
+Yüklemeler ve önbellek gibi dizinler varsayılan olarak herkesin yazabildiği
+geçici dizinin altındadır. Başka bir kullanıcının önceden oluşturduğu bir
+dizin kullanılırsa dosyalar okunabilir ya da değiştirilebilir; bu yüzden
+dizinler 0700 izniyle oluşturulur ve sahipleri denetlenir.
+"""
+import os
+import stat
+
+def ensure_private_dir(path):
+    """Dizini yalnızca bu kullanıcının erişebileceği biçimde (0700) oluşturur
+
+    Yol zaten varsa bu kullanıcıya ait bir dizin olmalıdır (sembolik bağlantı
+    kabul edilmez); değilse PermissionError verir. Fazladan izinler kaldırılır.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+        raise PermissionError(f'{path} bu kullanıcıya ait bir dizin değil')
+    if stat.S_IMODE(info.st_mode) & 0o077:
+        os.chmod(path, 0o700)
+    return path
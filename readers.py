@@ -0,0 +1,147 @@
+"""Yüklenen .xlsx çalışma kitaplarını akış halinde okuyan yardımcılar
+
+openpyxl'in salt okunur (read-only) kipi kullanılır: satırlar sayfa XML'i
+okundukça üretilir, hücre nesneleri ve stil bilgisi oluşturulmaz. İsteğe
+bağlı python-calamine paketi kuruluysa (Rust tabanlı okuyucu) o kullanılır.
+
+Yalnızca ilk sayfa okunur (pd.read_excel varsayılanı gibi). İlk satır
+başlıktır; başlığı olmayan sütunlar ve sondaki boş satırlar atlanır, boş
+hücreler None olur. Tam sayı değerli ondalıklar tam sayıya çevrilir.
+"""
+import datetime
+import itertools
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from contacts import find_email_column
+
+try:
+    from python_calamine import CalamineWorkbook
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+def _iter_openpyxl_rows(source):
+    workbook = load_workbook(source, read_only=True, data_only=True, keep_links=False)
+    try:
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+def _iter_calamine_rows(source):
+    if isinstance(source, str):
+        workbook = CalamineWorkbook.from_path(source)
+    else:
+        workbook = CalamineWorkbook.from_filelike(source)
+    yield from workbook.get_sheet_by_index(0).iter_rows()
+
+def _cell_value(value):
+    """Boş metni None'a, tam sayı değerli ondalığı tam sayıya, tarihi tarih-saate çevirir (pd.read_excel ile aynı)"""
+    if value == '':
+        return None
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    # calamine gece yarısı olan tarih-saatleri tarih olarak döndürür
+    if type(value) is datetime.date:
+        return datetime.datetime.combine(value, datetime.time())
+    return value
+
+def _unique_headers(values):
+    """Boş başlıkları 'Unnamed: n', tekrar edenleri 'ad.1' olarak adlandırır (pd.read_excel ile aynı)"""
+    headers = []
+    counts = {}
+    for index, value in enumerate(values):
+        header = f'Unnamed: {index}' if value is None or value == '' else value
+        if header in counts:
+            counts[header] += 1
+            header = f'{header}.{counts[header]}'
+        else:
+            counts[header] = 0
+        headers.append(header)
+    return headers
+
+def _open_sheet(source, engine):
+    """İlk sayfanın başlıklarını ve kalan ham satırların üretecini döndürür"""
+    if engine is None:
+        engine = 'calamine' if CALAMINE_AVAILABLE else 'openpyxl'
+    rows = _iter_calamine_rows(source) if engine == 'calamine' else _iter_openpyxl_rows(source)
+
+    header_row = next(rows, None)
+    if header_row is None:
+        return [], iter(())
+    header_row = list(header_row)
+    # Sondaki boş başlık hücreleri sütun sayılmaz
+    while header_row and (header_row[-1] is None or header_row[-1] == ''):
+        header_row.pop()
+    return _unique_headers(header_row), rows
+
+def _select_rows(headers, rows, columns):
+    """Satırları başlık genişliğine getirir, boş satırları atlar ve istenen sütunları seçer"""
+    if columns is None:
+        indices = None
+        columns = headers
+    else:
+        missing = [column for column in columns if column not in headers]
+        if missing:
+            raise ValueError(f'Sütun bulunamadı: {", ".join(map(str, missing))}')
+        indices = [headers.index(column) for column in columns]
+
+    def generate():
+        width = len(headers)
+        # Boş satırlar ancak arkasından dolu bir satır gelirse üretilir
+        blank_rows = 0
+        for row in rows:
+            values = [_cell_value(value) for value in itertools.islice(row, width)]
+            if all(value is None for value in values):
+                blank_rows += 1
+                continue
+            for _ in range(blank_rows):
+                yield [None] * len(columns)
+            blank_rows = 0
+            values.extend([None] * (width - len(values)))
+            yield values if indices is None else [values[index] for index in indices]
+
+    return list(columns), generate()
+
+def _to_frame(headers, rows):
+    df = pd.DataFrame(list(rows), columns=headers, dtype=object).infer_objects()
+    if not len(df):
+        return df
+    # Metin sütunlarındaki None değerleri ve tamamen boş sütunlar pd.read_excel'deki gibi NaN olur
+    df = df.where(df.notna(), np.nan)
+    empty = [column for column in df.columns if df[column].dtype == object and df[column].isna().all()]
+    if empty:
+        df[empty] = df[empty].astype(float)
+    return df
+
+def iter_sheet_rows(source, columns=None, engine=None):
+    """İlk sayfanın başlığını ve satırlarını akış halinde okur; (başlıklar, satır üreteci) döndürür
+
+    Kaynak dosya yolu ya da ikili akış olabilir. columns verilirse yalnızca
+    bu başlıkların değerleri (verilen sırayla) üretilir; bulunmayan başlık
+    ValueError verir. engine 'openpyxl' ya da 'calamine' olabilir; verilmezse
+    kuruluysa calamine kullanılır.
+    """
+    return _select_rows(*_open_sheet(source, engine), columns)
+
+def read_sheet(source, columns=None, engine=None):
+    """İlk sayfayı DataFrame olarak okur (pd.read_excel yerine); boş hücreler NaN olur"""
+    return _to_frame(*iter_sheet_rows(source, columns=columns, engine=engine))
+
+def read_contact_sheet(source, columns=None, engine=None):
+    """E-posta sütunu olan bir kişi listesini DataFrame olarak okur
+
+    E-posta sütunu başlık satırından bulunur; yoksa satırlar okunmadan
+    ValueError verilir. columns verilirse e-posta sütunu her zaman dahil edilir.
+    """
+    headers, rows = _open_sheet(source, engine)
+    email_column = find_email_column(headers)
+    if email_column is None:
+        if hasattr(rows, 'close'):
+            rows.close()
+        raise ValueError('E-posta sütunu bulunamadı')
+    if columns is not None:
+        columns = [email_column] + [column for column in columns if column != email_column]
+    return _to_frame(*_select_rows(headers, rows, columns))
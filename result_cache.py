@@ -0,0 +1,195 @@
+"""Dışa aktarma sonuçları için içerik adresli disk önbelleği
+
+Anahtar; dışa aktarma türü, çıktıyı etkileyen seçenekler, uygulama sürümü,
+dosya adları ve yüklenen baytların SHA-256 özetidir. Aynı dosyalar aynı
+seçeneklerle tekrar yüklendiğinde önceki çıktı doğrudan gönderilir.
+
+Girdiler kök dizin altında `<anahtarın ilk iki karakteri>/<anahtar>` olarak
+tutulur ve geçici dosyadan os.replace ile atomik olarak yerleştirilir; aynı
+dizini paylaşan gunicorn işçileri yarım yazılmış bir dosya görmez. Toplam
+boyut işçilerin ortak kullandığı bir sayaç dosyasında (.size) tutulur; sayaç
+sınırı aşınca dizin taranır ve en uzun süredir kullanılmayan (mtime) girdiler
+silinir. Silme işlemi bir kilit dosyasıyla tek işçide yapılır ve sayacı
+diskteki gerçek toplamla yeniler. Kök dizin yalnızca bu kullanıcıya açıktır.
+"""
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+
+from private_dirs import ensure_private_dir
+
+logger = logging.getLogger(__name__)
+
+# Yalnızca indirme adını, hızı ya da kaynak sınırlarını etkileyen seçenekler anahtara girmez
+IGNORED_OPTIONS = ('excel_name', 'workers', 'batch_workers', 'cache_size', 'max_inflate_ratio', 'max_inflate_bytes')
+# Çıktıyı üreten modüller; APP_VERSION verilmezse sürüm bunların içeriğinden türetilir
+VERSION_FILES = ('exports.py', 'find_emails.py', 'contacts.py', 'writers.py', 'archives.py', 'mail_headers.py',
+                 'domains.py', 'public_suffix_list.dat')
+# Yarım kalmış geçici dosyalar bu süreden sonra silinir (saniye)
+STALE_TEMP_SECONDS = 3600
+HASH_CHUNK_BYTES = 1024 * 1024
+# Kök dizindeki yardımcı dosyalar; girdi sayılmazlar
+LOCK_FILE = '.lock'
+SIZE_FILE = '.size'
+
+def source_version(base_dir):
+    """Çıktıyı üreten kaynak dosyaların özetini sürüm olarak döndürür"""
+    digest = hashlib.sha256()
+    for name in VERSION_FILES:
+        with open(os.path.join(base_dir, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+def _source_digest(source):
+    """Dosya yolunun ya da akışın SHA-256 özeti; akış başa sarılır"""
+    digest = hashlib.sha256()
+    file = open(source, 'rb') if isinstance(source, str) else source
+    try:
+        file.seek(0)
+        for chunk in iter(lambda: file.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    finally:
+        if isinstance(source, str):
+            file.close()
+        else:
+            source.seek(0)
+    return digest.hexdigest()
+
+def cache_key(export_type, inputs, options, version):
+    """Girdiler (alan adı -> [(dosya adı, kaynak)]) ve seçenekler için önbellek anahtarı"""
+    header = {
+        'type': export_type,
+        'version': version,
+        'options': {key: value for key, value in options.items() if key not in IGNORED_OPTIONS},
+        # Dosya adları birleştirme çıktısındaki kaynak sütununa yazılır
+        'inputs': {
+            field: [[filename, _source_digest(source)] for filename, source in items]
+            for field, items in inputs.items()
+        }
+    }
+    return hashlib.sha256(json.dumps(header, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+class ResultCache:
+    """Dışa aktarma çıktılarını anahtara göre saklayan, boyutu sınırlı LRU disk önbelleği"""
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        # Başka bir kullanıcının önceden oluşturduğu dizin kullanılmaz
+        ensure_private_dir(root)
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key):
+        """Önbellekteki çıktıyı okunmak üzere açar; yoksa None döndürür
+
+        Dosya açıldıktan sonra başka bir işçi onu silse de açık tanıtıcı geçerli kalır.
+        """
+        path = self._path(key)
+        try:
+            file = open(path, 'rb')
+        except FileNotFoundError:
+            return None
+        # Son kullanım zamanı: LRU sırası mtime ile tutulur
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return file
+
+    def put(self, key, output_path):
+        """Çıktı dosyasının bir kopyasını önbelleğe ekler ve gerekirse eski girdileri siler"""
+        if os.path.getsize(output_path) > self.max_bytes:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            previous = os.path.getsize(path)
+        except FileNotFoundError:
+            previous = 0
+        temp_path = f'{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp'
+        try:
+            shutil.copyfile(output_path, temp_path)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        total = self._add_size(os.path.getsize(path) - previous)
+        # Sayaç yoksa (ilk kullanım) dizin bir kez taranır
+        if total is None or total > self.max_bytes:
+            self.evict()
+
+    def _add_size(self, delta):
+        """Ortak boyut sayacına ekler ve yeni toplamı döndürür; sayaç henüz yoksa None döndürür"""
+        with open(os.path.join(self.root, SIZE_FILE), 'a+') as counter:
+            fcntl.flock(counter, fcntl.LOCK_EX)
+            counter.seek(0)
+            try:
+                total = int(counter.read()) + delta
+            except ValueError:
+                return None
+            counter.seek(0)
+            counter.truncate()
+            counter.write(str(total))
+            return total
+
+    def _set_size(self, total):
+        with open(os.path.join(self.root, SIZE_FILE), 'a+') as counter:
+            fcntl.flock(counter, fcntl.LOCK_EX)
+            counter.truncate(0)
+            counter.write(str(total))
+
+    def evict(self):
+        """Toplam boyut sınırın altına inene kadar en eski girdileri siler
+
+        Başka bir işçi zaten siliyorsa beklemeden döner. Tarama sonunda boyut
+        sayacı kalan girdilerin toplamına eşitlenir.
+        """
+        with open(os.path.join(self.root, LOCK_FILE), 'w') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return 0
+
+            now = time.time()
+            entries = []
+            total = 0
+            for directory, _, names in os.walk(self.root):
+                for name in names:
+                    path = os.path.join(directory, name)
+                    try:
+                        info = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    if name.endswith('.tmp'):
+                        if info.st_mtime + STALE_TEMP_SECONDS < now:
+                            _remove(path)
+                    elif name not in (LOCK_FILE, SIZE_FILE):
+                        entries.append((info.st_mtime, info.st_size, path))
+                        total += info.st_size
+
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if _remove(path):
+                    total -= size
+                    removed += 1
+            self._set_size(total)
+            if removed:
+                logger.info(f'Sonuç önbelleğinden {removed} girdi silindi')
+            return removed
+
+def _remove(path):
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
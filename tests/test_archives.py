@@ -0,0 +1,63 @@
+"""Sıkıştırılmış yüklemelerin açılma sınırı testleri"""
+import gzip
+import os
+import zipfile
+
+import pytest
+
+import archives
+from exports import export_airtable_csv, ExportError
+
+def make_airtable_csv(rows, offset=0):
+    lines = ['Name,Email,Notes']
+    for n in range(offset, offset + rows):
+        lines.append(f'Kişi {n},kisi{n}@firma{n % 97}.com.tr,Not {n % 13}')
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+def make_zip(path, members):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members:
+            archive.writestr(name, data)
+
+def test_multi_member_zip_within_ratio_is_accepted(tmp_path, monkeypatch):
+    """Her dosyası birden çok kez açılan arşiv gerçek açılma oranıyla sınırlanır"""
+    monkeypatch.setattr(archives, 'MIN_INFLATE_BYTES', 0)
+    members = [(f'tablo{n}.csv', make_airtable_csv(2000, n * 2000)) for n in range(60)]
+    path = str(tmp_path / 'tablolar.zip')
+    make_zip(path, members)
+    ratio = sum(len(data) for _, data in members) / os.path.getsize(path)
+
+    options = {'output_format': 'csv', 'max_inflate_ratio': ratio * 1.2}
+    summary = export_airtable_csv({'file': [('tablolar.zip', path)]}, str(tmp_path / 'cikti.csv'), options)
+    assert summary['rows'] == 60 * 2000
+
+def test_inflate_limit_is_413(tmp_path):
+    path = str(tmp_path / 'bomba.csv.gz')
+    with gzip.open(path, 'wb') as f:
+        f.write(b'Name,Email\n')
+        f.write(b'\0' * (64 * 1024 * 1024))
+
+    with pytest.raises(ExportError) as error:
+        export_airtable_csv({'file': [('bomba.csv.gz', path)]}, str(tmp_path / 'cikti.csv'), {'output_format': 'csv'})
+    assert error.value.status_code == 413
+
+def test_corrupt_gzip_is_not_reported_as_wrong_csv(tmp_path):
+    path = str(tmp_path / 'bozuk.csv.gz')
+    with open(path, 'wb') as f:
+        f.write(gzip.compress(make_airtable_csv(10))[:-40] + b'x' * 40)
+
+    with pytest.raises(ExportError) as error:
+        export_airtable_csv({'file': [('bozuk.csv.gz', path)]}, str(tmp_path / 'cikti.csv'), {'output_format': 'csv'})
+    assert 'Airtable' not in error.value.message
+
+def test_reopened_member_is_counted_once(monkeypatch):
+    monkeypatch.setattr(archives, 'MIN_INFLATE_BYTES', 0)
+    budget = archives._InflateBudget(1000, max_ratio=1, max_bytes=10 ** 9)
+    budget.consume(0, 400)
+    budget.consume(0, 100)
+    budget.consume(0, 600)
+    assert budget.used == 600
+    budget.consume(1, 400)
+    assert budget.used == 1000
+    with pytest.raises(archives.InflateLimitError):
+        budget.consume(1, 401)
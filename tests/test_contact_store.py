@@ -0,0 +1,25 @@
+"""Kalıcı kişi dizini testleri"""
+import io
+
+import find_emails
+from contact_store import ContactStore
+
+def outlook_csv(count):
+    lines = ['Konu,Kimden: (Ad),Kimden: (Adres)']
+    lines += [f'Konu {n},Kişi {n},kisi{n}@firma.com.tr' for n in range(count)]
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+def test_only_new_rows_are_ingested(tmp_path, monkeypatch):
+    """Parmak izleri gruplar halinde sorgulanır; grup sınırını aşan dosyada da yalnızca yeni satırlar sayılır"""
+    monkeypatch.setattr(find_emails, 'ROW_FILTER_BATCH', 7)
+    store = ContactStore(str(tmp_path / 'kisiler.db'))
+    stats = {}
+    store.ingest(io.BytesIO(outlook_csv(20)), 'ocak.csv', stats=stats)
+    assert (stats['rows'], stats['new_rows'], stats['new_contacts']) == (20, 20, 20)
+
+    # Aynı satırın dosya içindeki tekrarı da bir kez sayılır
+    data = outlook_csv(30) + 'Konu 25,Kişi 25,kisi25@firma.com.tr\n'.encode('utf-8')
+    stats = {}
+    import_id = store.ingest(io.BytesIO(data), 'subat.csv', stats=stats)
+    assert (stats['rows'], stats['new_rows'], stats['new_contacts']) == (31, 10, 10)
+    assert [row[1] for row in store.iter_contacts(import_id)] == [f'kisi{n}@firma.com.tr' for n in range(20, 30)]
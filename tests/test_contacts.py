@@ -0,0 +1,28 @@
+"""Kişi listesi birleştirme ve karşılaştırma testleri"""
+import pandas as pd
+
+from contacts import (DIFFERENCES_COLUMN, IN_BOTH_SHEET, SOURCE_FILE_COLUMN, SOURCE_ROW_COLUMN, compare_contact_frames,
+                      merge_contact_frames)
+
+def test_remerge_keeps_source_columns():
+    """Önceki birleştirme çıktısı yeniden birleştirilince kaynak bilgisi korunur ve sütunlar çoğalmaz"""
+    first = merge_contact_frames([
+        ('a.xlsx', pd.DataFrame({'E-posta': ['ali@firma.com.tr', 'veli@firma.com.tr'], 'Ad': ['Ali', 'Veli']})),
+        ('b.xlsx', pd.DataFrame({'E-posta': ['ayse@ornek.com'], 'Ad': ['Ayşe']})),
+    ])
+    merged = merge_contact_frames([
+        ('birlesik.xlsx', first),
+        ('c.xlsx', pd.DataFrame({'E-posta': ['can@ornek.com'], 'Ad': ['Can']})),
+    ])
+    assert list(merged.columns) == ['E-posta Adresi', 'Ad', SOURCE_FILE_COLUMN, SOURCE_ROW_COLUMN]
+    assert merged[SOURCE_FILE_COLUMN].tolist() == ['a.xlsx', 'a.xlsx', 'b.xlsx', 'c.xlsx']
+    assert merged[SOURCE_ROW_COLUMN].tolist() == [2, 3, 2, 2]
+    assert merged[SOURCE_ROW_COLUMN].dtype == 'int64'
+
+def test_compare_handles_integral_floats_outside_int64():
+    """int64 aralığı dışındaki tam sayı değerli ondalıklar hata vermeden karşılaştırılır"""
+    first = pd.DataFrame({'E-posta': ['ali@firma.com.tr', 'veli@firma.com.tr'], 'Numara': [1e20, None]})
+    second = pd.DataFrame({'E-posta': ['ali@firma.com.tr', 'veli@firma.com.tr'], 'Numara': [2e20, None]})
+    sheets = compare_contact_frames(('a.xlsx', first), ('b.xlsx', second))
+    both = sheets[IN_BOTH_SHEET]
+    assert both[DIFFERENCES_COLUMN].tolist() == ['Numara', '']
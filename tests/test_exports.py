@@ -0,0 +1,36 @@
+"""Toplu Outlook dışa aktarımı testleri"""
+import openpyxl
+
+from exports import BATCH_SUMMARY_COLUMNS, SUMMARY_SHEET, export_outlook_batch
+
+HEADER = 'Konu,Kimden: (Ad),Kimden: (Adres),Kime: (Ad),Kime: (Adres)\n'
+
+def write_outlook_csv(path, senders):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(HEADER)
+        for n, sender in enumerate(senders):
+            f.write(f'Konu {n},,{sender},,ortak@firma.com.tr\n')
+    return str(path)
+
+def test_batch_keeps_same_named_files_apart(tmp_path):
+    """Aynı adlı dosyaların sayıları ve kaynak etiketleri birbirine karışmaz"""
+    first = tmp_path / 'a'
+    second = tmp_path / 'b'
+    first.mkdir()
+    second.mkdir()
+    files = [
+        ('outlook.csv', write_outlook_csv(first / 'outlook.csv', ['ali@firma.com.tr', 'veli@firma.com.tr'])),
+        ('outlook.csv', write_outlook_csv(second / 'outlook.csv', ['ayse@ornek.com'])),
+    ]
+    output = str(tmp_path / 'cikti.xlsx')
+    export_outlook_batch({'file': files}, output, {'output_format': 'xlsx'})
+
+    workbook = openpyxl.load_workbook(output, read_only=True)
+    sources = [row[-1] for row in workbook['E-posta Listesi'].iter_rows(min_row=2, values_only=True)]
+    summary = {row[0]: dict(zip(BATCH_SUMMARY_COLUMNS, row))
+               for row in workbook[SUMMARY_SHEET].iter_rows(min_row=2, values_only=True)}
+    assert sources.count('outlook.csv') == 3
+    assert sources.count('outlook.csv (2)') == 1
+    assert summary['outlook.csv']['Listeye Eklenen'] == 3
+    assert summary['outlook.csv (2)']['Listeye Eklenen'] == 1
+    assert summary['outlook.csv (2)']['Satır'] == 1
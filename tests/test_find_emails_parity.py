@@ -0,0 +1,75 @@
+"""clean_email_text ve is_system_info için eşlik (parity) testleri
+
+Beklenen çıktılar tests/data/find_emails_parity.json dosyasında donmuştur;
+derlenmiş tek geçişli temizleyiciden önceki (ilk sürüm) fonksiyonlarla
+üretilmiştir. Dosyada sistem bilgisi satırları, ön ekli metinler, Türkçe
+adres başlıkları, mailto çiftleri (iç içe, boşluk varyasyonlu ve
+kapanmamış parantezli), sabit tohumlu rastgele belirteç dizileri ve
+tekrarlanan adres kalıbında geri izlemeyi patlatan ';' ile birleşik uzun
+hücreler (pathological) vardır; son gruptaki her hücre süre sınırıyla
+da denetlenir.
+
+outlook_parity.csv derlemdeki hücrelerden kurulmuş bir Outlook CSV'sidir;
+satır satır ve sütun tabanlı arka uçların sonucu, ilk sürümün
+find_categorized_emails_in_file çıktısıyla (outlook_parity_expected.json)
+karşılaştırılır.
+"""
+import json
+import os
+import time
+
+import pytest
+
+import find_emails
+from find_emails import clean_email_text, find_categorized_emails_in_file, is_system_info
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+OUTLOOK_CSV = os.path.join(DATA_DIR, 'outlook_parity.csv')
+
+with open(os.path.join(DATA_DIR, 'find_emails_parity.json'), 'r', encoding='utf-8') as f:
+    CASES = json.load(f)['cases']
+# Eski desenle 80 adresli hücre ~70 saniye sürüyordu; doğrusal taramada milisaniyeler
+PATHOLOGICAL_SECONDS = 0.5
+
+with open(os.path.join(DATA_DIR, 'outlook_parity_expected.json'), 'r', encoding='utf-8') as f:
+    EXPECTED = json.load(f)
+
+def case_id(case):
+    return f"{case['group']}:{case['text'][:40]!r}"
+
+@pytest.mark.parametrize('case', CASES, ids=case_id)
+def test_clean_email_text_matches_baseline(case):
+    assert clean_email_text(case['text']) == case['clean']
+
+@pytest.mark.parametrize('case', CASES, ids=case_id)
+def test_is_system_info_matches_baseline(case):
+    assert is_system_info(case['text']) == case['system_info']
+
+@pytest.mark.parametrize('case', [case for case in CASES if case['group'] == 'pathological'], ids=case_id)
+def test_clean_email_text_is_linear(case):
+    start = time.perf_counter()
+    clean_email_text(case['text'])
+    assert time.perf_counter() - start < PATHOLOGICAL_SECONDS
+
+def test_python_backend_matches_baseline():
+    assert find_categorized_emails_in_file(OUTLOOK_CSV, backend='python') == EXPECTED
+
+@pytest.mark.parametrize('engine', ['c', 'pyarrow'])
+def test_pandas_backend_matches_baseline(engine):
+    if engine == 'pyarrow' and not find_emails.PYARROW_AVAILABLE:
+        pytest.skip('pyarrow kurulu değil')
+    stats = {}
+    result = find_emails._drop_empty_categories(find_emails._find_categorized_emails_pandas(
+        OUTLOOK_CSV, 'exact', stats, engine=engine))
+    assert result == EXPECTED
+
+def test_backends_count_rows_without_outlook_columns(tmp_path):
+    path = tmp_path / 'baska.csv'
+    path.write_text('a,b\n1,2\n\n3,4\n" ",\n', encoding='utf-8')
+    counts = []
+    for backend in find_emails.BACKENDS:
+        stats = {}
+        assert find_categorized_emails_in_file(str(path), backend=backend, stats=stats) == {}
+        counts.append(stats['rows'])
+    assert counts == [3, 3]
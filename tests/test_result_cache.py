@@ -0,0 +1,36 @@
+"""Sonuç önbelleği testleri"""
+import os
+
+import pytest
+
+from result_cache import ResultCache, SIZE_FILE
+
+def write_output(path, size):
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+    return str(path)
+
+def test_evicts_only_when_counter_crosses_limit(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path / 'cache'), max_bytes=250)
+    output = write_output(tmp_path / 'cikti.xlsx', 100)
+    evictions = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, 'evict', lambda: evictions.append(evict()))
+
+    # İlk girdide sayaç yoktur; dizin bir kez taranır
+    cache.put('a' * 64, output)
+    cache.put('b' * 64, output)
+    cache.put('b' * 64, output)
+    assert evictions == [0]
+    with open(os.path.join(cache.root, SIZE_FILE)) as f:
+        assert f.read() == '200'
+
+    cache.put('c' * 64, output)
+    assert evictions == [0, 1]
+    with open(os.path.join(cache.root, SIZE_FILE)) as f:
+        assert f.read() == '200'
+
+def test_symlinked_cache_root_is_rejected(tmp_path):
+    os.symlink(tmp_path, tmp_path / 'cache')
+    with pytest.raises(PermissionError):
+        ResultCache(str(tmp_path / 'cache'), max_bytes=1)
@@ -0,0 +1,52 @@
+"""Parçalı yükleme ve yüklenirken ayrıştırma testleri"""
+import io
+import os
+
+import pytest
+
+from uploads import ParserPool, UploadStore, wait_for_parse
+
+CSV = 'Konu,Kimden: (Ad),Kimden: (Adres)\nKonu 1,Ali Veli,ali@firma.com.tr\nKonu 2,,ayse@ornek.com\n'.encode('utf-8')
+
+def upload(store, pool, data):
+    state = store.create('outlook.csv', len(data), {})
+    upload_dir = store.upload_dir(state['id'])
+    for index in range(state['total_chunks']):
+        pool.ensure_parser(upload_dir)
+        chunk = data[index * store.chunk_size:(index + 1) * store.chunk_size]
+        store.write_chunk(state['id'], index, io.BytesIO(chunk))
+    return upload_dir
+
+def test_full_pool_stores_chunks_and_parses_on_finalize(tmp_path):
+    """Sınır doluyken parçalar reddedilmez; ayrıştırma tamamlama adımında yapılır"""
+    store = UploadStore(str(tmp_path / 'uploads'), chunk_size=16)
+    pool = ParserPool(max_parsers=1, idle_timeout=1)
+    busy = store.create('bekleyen.csv', 100, {})
+    assert pool.ensure_parser(store.upload_dir(busy['id'])) is not None
+
+    upload_dir = upload(store, pool, CSV)
+    assert not os.path.exists(os.path.join(upload_dir, 'parser.lock'))
+    categorized_data, stats = wait_for_parse(upload_dir)
+    assert [data['email'] for data in categorized_data['Kimden']] == ['ali@firma.com.tr', 'ayse@ornek.com']
+    assert stats['rows'] == 2
+
+def test_parser_result_is_json(tmp_path):
+    store = UploadStore(str(tmp_path / 'uploads'), chunk_size=16)
+    upload_dir = upload(store, ParserPool(max_parsers=1, idle_timeout=5), CSV)
+    categorized_data, stats = wait_for_parse(upload_dir, timeout=30)
+    assert os.path.exists(os.path.join(upload_dir, 'result.json'))
+    assert len(categorized_data['Kimden']) == 2
+    assert stats['rows'] == 2
+
+def test_upload_root_is_private(tmp_path):
+    root = tmp_path / 'uploads'
+    root.mkdir(mode=0o777)
+    os.chmod(root, 0o777)
+    UploadStore(str(root))
+    assert os.stat(root).st_mode & 0o777 == 0o700
+
+def test_symlinked_upload_root_is_rejected(tmp_path):
+    (tmp_path / 'baska').mkdir()
+    os.symlink(tmp_path / 'baska', tmp_path / 'uploads')
+    with pytest.raises(PermissionError):
+        UploadStore(str(tmp_path / 'uploads'))
@@ -0,0 +1,351 @@
+"""Parça parça, kaldığı yerden sürdürülebilen yüklemeler ve yüklenirken ayrıştırma
+
+Protokol: yükleme dosya adı ve toplam boyutla başlatılır; sunucu parça
+boyutunu belirler. Parçalar (0'dan başlayan sırayla numaralı) herhangi bir
+sırada ve herhangi bir gunicorn işçisine PUT ile gönderilebilir; her parça
+diske atomik olarak yazılır. Bağlantı koparsa istemci durumu sorgulayıp
+yalnızca eksik parçaları yeniden gönderir. Son adımda çıktı üretilir.
+
+İlk parça gelince ayrı bir süreç (`python uploads.py <yükleme dizini>`)
+Outlook CSV ayrıştırıcısını parçaları sırayla okuyan bir akış üzerinde
+çalıştırır; sıradaki parça henüz gelmediyse bekler. Böylece son parça
+geldiğinde dosyanın büyük kısmı zaten ayrıştırılmış olur. İşçi süreci
+başına aynı anda çalışan ayrıştırıcı sayısı sınırlıdır; sınır doluyken
+parçalar yine kaydedilir ve ayrıştırıcı, yer açılınca gelen bir sonraki
+parçayla başlar. Ayrıştırıcı hiç başlamadıysa ya da sonuçlanmadan ölmüşse
+(veya boşta kalıp vazgeçmişse) tamamlama adımı ayrıştırmayı diskteki
+parçalardan kendisi yapar.
+"""
+import io
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+from find_emails import find_categorized_emails_in_stream, DEFAULT_CELL_CACHE_SIZE
+from private_dirs import ensure_private_dir
+
+logger = logging.getLogger(__name__)
+
+UPLOADS_SCRIPT = os.path.abspath(__file__)
+# Ayrıştırıcı sıradaki parçayı bu aralıklarla yoklar (saniye)
+CHUNK_POLL_SECONDS = 0.05
+# Tamamlama adımı ayrıştırmanın bitmesini bu aralıklarla yoklar (saniye)
+RESULT_POLL_SECONDS = 0.1
+# Bu süre boyunca yeni parça gelmezse ayrıştırıcı süreç vazgeçer (saniye)
+PARSER_IDLE_TIMEOUT = 300
+
+_UPLOAD_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+class UploadError(Exception):
+    """Yükleme protokolü hatası (HTTP durum koduyla)"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+class UploadStore:
+    """Parçalı yüklemelerin durumunu ve parçalarını disk üzerinde tutar"""
+
+    def __init__(self, root, chunk_size=5 * 1024 * 1024, max_bytes=2 * 1024 * 1024 * 1024, max_age=86400):
+        self.root = root
+        self.chunk_size = chunk_size
+        # Tek bir yüklemenin en büyük toplam boyutu
+        self.max_bytes = max_bytes
+        # Tamamlanmayan yüklemelerin en uzun ömrü (saniye)
+        self.max_age = max_age
+        # Parçalar ve ayrıştırma sonuçları başka kullanıcılara kapalı dizinde tutulur
+        ensure_private_dir(root)
+
+    def upload_dir(self, upload_id):
+        """Yükleme dizininin yolunu döndürür; geçersiz kimliklerde None döner"""
+        if not upload_id or not _UPLOAD_ID_RE.match(upload_id):
+            return None
+        return os.path.join(self.root, upload_id)
+
+    def create(self, filename, size, options):
+        """Yeni bir yükleme başlatır ve durumunu döndürür"""
+        if size <= 0:
+            raise UploadError('Dosya boyutu geçersiz')
+        if size > self.max_bytes:
+            raise UploadError(f'Dosya çok büyük (en fazla {self.max_bytes // (1024 * 1024)} MB)', 413)
+
+        upload_id = uuid.uuid4().hex
+        upload_dir = self.upload_dir(upload_id)
+        os.makedirs(os.path.join(upload_dir, 'chunks'))
+        state = {
+            'id': upload_id,
+            'filename': filename,
+            'size': size,
+            'chunk_size': self.chunk_size,
+            'total_chunks': math.ceil(size / self.chunk_size),
+            'options': options,
+            'created_at': time.time()
+        }
+        _write_json(os.path.join(upload_dir, 'upload.json'), state)
+        return state
+
+    def load_state(self, upload_id):
+        """Yüklemenin durumunu alınan parçalarla birlikte döndürür; yükleme yoksa None döner"""
+        upload_dir = self.upload_dir(upload_id)
+        if upload_dir is None:
+            return None
+        state = _read_json(os.path.join(upload_dir, 'upload.json'))
+        if state is None:
+            return None
+        received = received_chunks(upload_dir)
+        received_set = set(received)
+        state['received'] = received
+        state['missing'] = [index for index in range(state['total_chunks']) if index not in received_set]
+        state['parse'] = _read_json(os.path.join(upload_dir, 'parse.json')) or {'state': 'waiting'}
+        return state
+
+    def write_chunk(self, upload_id, index, stream):
+        """Parçayı akıştan okuyup atomik olarak kaydeder; aynı parça tekrar gönderilebilir"""
+        state = self.load_state(upload_id)
+        if state is None:
+            raise UploadError('Yükleme bulunamadı', 404)
+        if not 0 <= index < state['total_chunks']:
+            raise UploadError(f'Geçersiz parça numarası: {index}')
+        expected = min(state['chunk_size'], state['size'] - index * state['chunk_size'])
+
+        path = chunk_path(self.upload_dir(upload_id), index)
+        temp_path = f'{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp'
+        try:
+            with open(temp_path, 'wb') as f:
+                shutil.copyfileobj(stream, f, 1024 * 1024)
+                written = f.tell()
+            if written != expected:
+                raise UploadError(f'Parça {index} boyutu {written}, beklenen {expected}')
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def remove(self, upload_id):
+        shutil.rmtree(self.upload_dir(upload_id), ignore_errors=True)
+
+    def cleanup_expired(self, now=None):
+        """Süresi dolan yüklemelerin dizinlerini siler; silinen yükleme sayısını döndürür"""
+        now = now or time.time()
+        removed = 0
+        for upload_id in os.listdir(self.root):
+            upload_dir = self.upload_dir(upload_id)
+            if upload_dir is None:
+                continue
+            state = _read_json(os.path.join(upload_dir, 'upload.json'))
+            created_at = state['created_at'] if state else os.path.getmtime(upload_dir)
+            if created_at + self.max_age < now:
+                shutil.rmtree(upload_dir, ignore_errors=True)
+                removed += 1
+        if removed:
+            logger.info(f'{removed} süresi dolmuş yükleme silindi')
+        return removed
+
+def chunk_path(upload_dir, index):
+    return os.path.join(upload_dir, 'chunks', f'{index:06d}')
+
+def received_chunks(upload_dir):
+    """Diskte tamamlanmış parçaların numaraları (sıralı)"""
+    return sorted(int(name) for name in os.listdir(os.path.join(upload_dir, 'chunks')) if name.isdigit())
+
+class ChunkStream(io.RawIOBase):
+    """Parçaları sırayla okuyan ikili akış; sıradaki parça henüz yoksa gelmesini bekler
+
+    idle_timeout saniye boyunca yeni parça gelmezse TimeoutError verir.
+    on_chunk verilirse her parça bitince okunan parça sayısıyla çağrılır.
+    """
+
+    def __init__(self, upload_dir, total_chunks, idle_timeout=PARSER_IDLE_TIMEOUT, on_chunk=None):
+        self.upload_dir = upload_dir
+        self.total_chunks = total_chunks
+        self.idle_timeout = idle_timeout
+        self.on_chunk = on_chunk
+        self._index = 0
+        self._file = None
+
+    def readable(self):
+        return True
+
+    @property
+    def finished(self):
+        """Tüm parçalar sonuna kadar okundu mu"""
+        return self._index >= self.total_chunks
+
+    def readinto(self, buffer):
+        while self._index < self.total_chunks:
+            if self._file is None:
+                self._file = self._wait_for_chunk(self._index)
+            count = self._file.readinto(buffer)
+            if count:
+                return count
+            self._file.close()
+            self._file = None
+            self._index += 1
+            if self.on_chunk:
+                self.on_chunk(self._index)
+        return 0
+
+    def _wait_for_chunk(self, index):
+        path = chunk_path(self.upload_dir, index)
+        deadline = time.time() + self.idle_timeout
+        while True:
+            try:
+                return open(path, 'rb')
+            except FileNotFoundError:
+                if time.time() > deadline:
+                    raise TimeoutError(f'Parça {index} zamanında gelmedi')
+                time.sleep(CHUNK_POLL_SECONDS)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        super().close()
+
+class ParserPool:
+    """Yüklemeleri parçalar geldikçe ayrıştıran süreçleri sınırlı sayıda çalıştırır
+
+    Sınır işçi süreci başınadır (JobRunner gibi). Her yükleme için tek bir
+    ayrıştırıcı başlatılır; hangi işçinin başlatacağı yükleme dizinindeki
+    kilit dosyasıyla belirlenir.
+    """
+
+    def __init__(self, max_parsers=2, idle_timeout=PARSER_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._slots = threading.BoundedSemaphore(max_parsers)
+
+    def ensure_parser(self, upload_dir):
+        """Yüklemenin ayrıştırıcısı yoksa başlatır
+
+        Başka bir istek zaten başlatmışsa ya da sınır doluysa bir şey
+        yapmaz; ikinci durumda ayrıştırma sonraki parçaya ya da tamamlama
+        adımına kalır. Başlatılan süreci, yoksa None döndürür.
+        """
+        lock_path = os.path.join(upload_dir, 'parser.lock')
+        if os.path.exists(lock_path):
+            return None
+        if not self._slots.acquire(blocking=False):
+            logger.info(f'Ayrıştırıcı sınırı dolu, parça ayrıştırılmadan kaydediliyor ({upload_dir})')
+            return None
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            self._slots.release()
+            return None
+        os.close(fd)
+        try:
+            return start_parser(upload_dir, self.idle_timeout, on_exit=self._slots.release)
+        except Exception:
+            self._slots.release()
+            os.remove(lock_path)
+            raise
+
+def start_parser(upload_dir, idle_timeout=PARSER_IDLE_TIMEOUT, on_exit=None):
+    """Yüklemeyi parçalar geldikçe ayrıştıran süreci başlatır; on_exit süreç bitince çağrılır"""
+    log = open(os.path.join(upload_dir, 'parse.log'), 'ab')
+    process = subprocess.Popen([sys.executable, UPLOADS_SCRIPT, upload_dir, str(idle_timeout)],
+                               stdout=log, stderr=log)
+    log.close()
+    _write_json(os.path.join(upload_dir, 'parser.json'), {'pid': process.pid})
+
+    def wait():
+        # Süreç bitince zombi kalmaması için beklenir
+        process.wait()
+        if on_exit:
+            on_exit()
+
+    threading.Thread(target=wait, daemon=True).start()
+    return process
+
+def parse_upload(upload_dir, idle_timeout=PARSER_IDLE_TIMEOUT):
+    """Yüklemeyi ayrıştırır ve sonucu (kategorili e-postalar, istatistikler) diske yazar"""
+    state = _read_json(os.path.join(upload_dir, 'upload.json'))
+    options = state['options']
+    parse_path = os.path.join(upload_dir, 'parse.json')
+    _write_json(parse_path, {'state': 'parsing', 'parsed_chunks': 0})
+
+    def on_chunk(parsed_chunks):
+        _write_json(parse_path, {'state': 'parsing', 'parsed_chunks': parsed_chunks})
+
+    stats = {}
+    chunks = ChunkStream(upload_dir, state['total_chunks'], idle_timeout, on_chunk)
+    try:
+        with io.BufferedReader(chunks, 1024 * 1024) as stream:
+            categorized_data = find_categorized_emails_in_stream(
+                stream,
+                dedup_key=options.get('dedup_key', 'exact'),
+                cache_size=options.get('cache_size', DEFAULT_CELL_CACHE_SIZE),
+                stats=stats
+            )
+            # Ayrıştırıcı akış hatalarını boş sonuç olarak döndürür; eksik okuma hata sayılır
+            if not chunks.finished:
+                raise TimeoutError('Yükleme parçaları zamanında gelmedi')
+    except Exception as e:
+        logger.error(f'Yükleme ayrıştırma hatası ({upload_dir}): {str(e)}')
+        _write_json(parse_path, {'state': 'failed', 'error': str(e)})
+        raise
+
+    # Sonuç JSON olarak yazılır; diskten okunan veri kod çalıştıramaz
+    _write_json(os.path.join(upload_dir, 'result.json'), {'categorized_data': categorized_data, 'stats': stats})
+    _write_json(parse_path, {'state': 'done', 'parsed_chunks': state['total_chunks'], 'rows': stats.get('rows', 0)})
+    return categorized_data, stats
+
+def wait_for_parse(upload_dir, timeout=300):
+    """Ayrıştırma sonucunu döndürür; ayrıştırıcı çalışıyorsa bitmesini bekler
+
+    Ayrıştırıcı süreç sonuç yazmadan sonlanmışsa (ya da hiç başlamamışsa)
+    tüm parçalar diskte olduğundan ayrıştırma burada yapılır.
+    """
+    result_path = os.path.join(upload_dir, 'result.json')
+    deadline = time.time() + timeout
+    while not os.path.exists(result_path):
+        parse = _read_json(os.path.join(upload_dir, 'parse.json')) or {}
+        if parse.get('state') == 'failed' or not _parser_alive(upload_dir):
+            logger.warning(f'Ayrıştırıcı sonuç üretmedi, ayrıştırma yeniden yapılıyor ({upload_dir})')
+            return parse_upload(upload_dir, idle_timeout=0)
+        if time.time() > deadline:
+            raise TimeoutError('Ayrıştırma zamanında tamamlanmadı')
+        time.sleep(RESULT_POLL_SECONDS)
+    result = _read_json(result_path)
+    return result['categorized_data'], result['stats']
+
+def _parser_alive(upload_dir):
+    parser = _read_json(os.path.join(upload_dir, 'parser.json'))
+    if not parser:
+        return False
+    try:
+        os.kill(parser['pid'], 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def _write_json(path, data):
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    try:
+        parse_upload(sys.argv[1], idle_timeout=float(sys.argv[2]) if len(sys.argv) > 2 else PARSER_IDLE_TIMEOUT)
+    except Exception:
+        sys.exit(1)
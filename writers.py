@@ -0,0 +1,210 @@
+"""Sabit bellekli, akış tabanlı çıktı yazıcıları (.xlsx, .csv, .parquet, .jsonl)
+
+Excel için openpyxl'in yalnızca yazma (write-only) kipi kullanılır: satırlar
+üretildikçe geçici bir XML dosyasına yazılır, hücre nesneleri bellekte
+tutulmaz. Hücre başına yazı tipi atanmaz; çalışma kitabının varsayılan yazı
+tipi zaten Calibri'dir ve tüm hücrelerde Türkçe karakterler bununla görüntülenir.
+
+Düz biçimler (CSV, Parquet, JSON Lines) tek tablodur; birden çok sayfa
+yazıldığında satırlar başa eklenen 'Sayfa' sütunuyla ayrılır. Parquet için
+isteğe bağlı pyarrow paketi gerekir.
+"""
+import csv
+import datetime
+import json
+import math
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Genişliği belirtilmeyen sütunlar için varsayılan genişlik
+DEFAULT_COLUMN_WIDTH = 30
+
+# Desteklenen çıktı biçimleri: dosya uzantısı ve MIME türü
+OUTPUT_FORMATS = {
+    'xlsx': {
+        'extension': 'xlsx',
+        'mimetype': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    },
+    'csv': {
+        'extension': 'csv',
+        'mimetype': 'text/csv'
+    },
+    'parquet': {
+        'extension': 'parquet',
+        'mimetype': 'application/vnd.apache.parquet'
+    },
+    'jsonl': {
+        'extension': 'jsonl',
+        'mimetype': 'application/x-ndjson'
+    }
+}
+
+# Düz biçimlerde birden çok sayfa yazılırken eklenen sütun
+SHEET_COLUMN = 'Sayfa'
+# Parquet satır grubu başına satır sayısı
+PARQUET_CHUNK_ROWS = 65536
+
+def _cell_value(value):
+    """Boş değerleri (None, NaN, NaT, pd.NA) boş hücreye çevirir (pandas to_excel ile aynı)"""
+    if value is None or value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+def dataframe_rows(df):
+    """DataFrame satırlarını Excel'e yazılacak değer listeleri olarak üretir"""
+    for row in df.itertuples(index=False, name=None):
+        yield [_cell_value(value) for value in row]
+
+def write_sheet(workbook, title, columns, rows, widths=None):
+    """Yalnızca yazma kipindeki çalışma kitabına başlık satırı ve satırlarla bir sayfa ekler
+
+    widths sütun adı -> genişlik sözlüğüdür. Yazılan veri satırı sayısını döndürür.
+    """
+    worksheet = workbook.create_sheet(title=title)
+    # Yalnızca yazma kipinde sütun genişlikleri satırlardan önce ayarlanmalıdır
+    for index, column in enumerate(columns, start=1):
+        width = (widths or {}).get(column, DEFAULT_COLUMN_WIDTH)
+        worksheet.column_dimensions[get_column_letter(index)].width = width
+
+    worksheet.append(list(columns))
+    count = 0
+    for row in rows:
+        worksheet.append(row)
+        count += 1
+    return count
+
+def write_xlsx(path, sheets):
+    """(sayfa adı, sütunlar, satırlar, genişlikler) dörtlülerini tek bir .xlsx dosyasına yazar
+
+    Satırlar herhangi bir yineleyici olabilir; tümü belleğe alınmadan yazılır.
+    Sayfa başına yazılan satır sayılarını döndürür.
+    """
+    workbook = Workbook(write_only=True)
+    counts = {}
+    for title, columns, rows, widths in sheets:
+        counts[title] = write_sheet(workbook, title, columns, rows, widths)
+    workbook.save(path)
+    return counts
+
+def _flatten_sheets(sheets):
+    """Sayfaları tek bir tabloya çevirir: (sütunlar, satır yineleyicisi)
+
+    Tek sayfada sütunlar aynen kalır. Birden çok sayfada sütunlar 'Sayfa' ve
+    tüm sayfaların sütunlarının (ilk görülme sırasıyla) birleşimidir.
+    """
+    sheets = list(sheets)
+    if len(sheets) == 1:
+        _, columns, rows, _ = sheets[0]
+        return list(columns), rows
+
+    columns = [SHEET_COLUMN]
+    for _, sheet_columns, _, _ in sheets:
+        for column in sheet_columns:
+            if column not in columns:
+                columns.append(column)
+    positions = {column: index for index, column in enumerate(columns)}
+
+    def rows():
+        for title, sheet_columns, sheet_rows, _ in sheets:
+            indexes = [positions[column] for column in sheet_columns]
+            for row in sheet_rows:
+                flat = [None] * len(columns)
+                flat[0] = title
+                for index, value in zip(indexes, row):
+                    flat[index] = value
+                yield flat
+    return columns, rows()
+
+def write_csv(path, sheets):
+    """Sayfaları UTF-8 (BOM'lu, Excel uyumlu) CSV olarak satır satır yazar"""
+    columns, rows = _flatten_sheets(sheets)
+    count = 0
+    with open(path, 'w', encoding='utf-8-sig', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+def _json_default(value):
+    """json modülünün tanımadığı değerleri (numpy sayıları, tarihler) çevirir"""
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+def write_jsonl(path, sheets):
+    """Sayfaları her satırı bir JSON nesnesi olan JSON Lines dosyası olarak yazar"""
+    columns, rows = _flatten_sheets(sheets)
+    keys = [str(column) for column in columns]
+    count = 0
+    with open(path, 'w', encoding='utf-8') as file:
+        for row in rows:
+            file.write(json.dumps(dict(zip(keys, row)), ensure_ascii=False, default=_json_default))
+            file.write('\n')
+            count += 1
+    return count
+
+def _parquet_value(value):
+    """Parquet sütunları metin türündedir; değerler CSV çıktısındaki gibi yazılır"""
+    return None if value is None else str(value)
+
+def write_parquet(path, sheets, chunk_rows=PARQUET_CHUNK_ROWS):
+    """Sayfaları chunk_rows satırlık satır gruplarıyla Parquet dosyasına yazar"""
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError('Parquet çıktısı için pyarrow paketi gerekli')
+    columns, rows = _flatten_sheets(sheets)
+    schema = pa.schema([(str(column), pa.string()) for column in columns])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                writer.write_table(_parquet_table(chunk, schema))
+                count += len(chunk)
+                chunk = []
+        if chunk or not count:
+            writer.write_table(_parquet_table(chunk, schema))
+            count += len(chunk)
+    return count
+
+def _parquet_table(chunk, schema):
+    """Satır listesini sütun dizilerinden oluşan bir Arrow tablosuna çevirir"""
+    arrays = [
+        pa.array([_parquet_value(row[index]) for row in chunk], type=pa.string())
+        for index in range(len(schema))
+    ]
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+def write_output(path, output_format, sheets):
+    """Sayfaları istenen biçimde yazar (bkz. OUTPUT_FORMATS)"""
+    if output_format == 'xlsx':
+        return write_xlsx(path, sheets)
+    if output_format == 'csv':
+        return write_csv(path, sheets)
+    if output_format == 'parquet':
+        return write_parquet(path, sheets)
+    if output_format == 'jsonl':
+        return write_jsonl(path, sheets)
+    raise ValueError(f'Geçersiz çıktı biçimi: {output_format}')
+
+def write_dataframes(path, output_format, sheets, widths=None):
+    """Sayfa adı -> DataFrame sözlüğünü istenen biçimde yazar"""
+    return write_output(path, output_format, [
+        (title, list(df.columns), dataframe_rows(df), widths)
+        for title, df in sheets.items()
+    ])